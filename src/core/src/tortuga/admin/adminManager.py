@@ -43,12 +43,13 @@ class AdminManager(TortugaObjectManager):
 
         self._adminDbApi.addAdmin(name, password, realname, description)
 
-        AuthManager().reloadPrincipals()
+        # Discard cached failed logins for the new admin
+        AuthManager().invalidatePrincipals()
 
     def deleteAdmin(self, admin):
         self._adminDbApi.deleteAdmin(admin)
 
-        AuthManager().reloadPrincipals()
+        AuthManager().invalidatePrincipals()
 
     def updateAdmin(self, adminObject, isCrypted):
         if adminObject.getPassword() is not None:
@@ -60,9 +61,9 @@ class AdminManager(TortugaObjectManager):
 
         self._adminDbApi.updateAdmin(adminObject)
 
-        AuthManager().reloadPrincipals()
+        AuthManager().invalidatePrincipals()
 
     def authenticate(self, adminUsername, adminPassword): \
             # pylint: disable=no-self-use
-        return AuthManager().getPrincipal(
+        return AuthManager().verifyCredentials(
             adminUsername, adminPassword) is not None
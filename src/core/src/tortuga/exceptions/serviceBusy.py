@@ -0,0 +1,28 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from tortuga.exceptions.tortugaException import TortugaException
+from tortuga.utility import tortugaStatus
+
+
+class ServiceBusy(TortugaException):
+    """
+    Service busy error class (request rejected due to load). It can be
+    used in the same way as the base TortugaException class.
+    """
+
+    def __init__(self, error="", **kwargs):
+        TortugaException.__init__(
+            self, error, tortugaStatus.TORTUGA_SERVICE_BUSY_ERROR,
+            **kwargs)
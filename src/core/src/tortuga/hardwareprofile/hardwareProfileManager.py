@@ -45,14 +45,16 @@ class HardwareProfileManager(TortugaObjectManager, Singleton):
         self._globalParameterDbApi = GlobalParameterDbApi()
         self._nodeDbApi = NodeDbApi()
 
-    def getHardwareProfileList(self, optionDict=None, tags=None):
+    def getHardwareProfileList(self, optionDict=None, tags=None,
+                               fields=None):
         """
         Return all of the hardwareprofiles with referenced components
         in this hardwareprofile
         """
 
         return self._hpDbApi.getHardwareProfileList(optionDict=optionDict,
-                                                    tags=tags)
+                                                    tags=tags,
+                                                    fields=fields)
 
     def setIdleSoftwareProfile(self, hardwareProfileName,
                                softwareProfileName=None):
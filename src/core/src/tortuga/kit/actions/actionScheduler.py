@@ -0,0 +1,168 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''
+Run an action of several component installers, running the actions of
+independent components concurrently.
+
+Component installers declare whether their actions may run concurrently
+with those of other components ('parallel_safe') and the names of
+components whose actions must complete first ('run_after'). Components
+that are not parallel-safe run alone, after all components preceding
+them and before all components following them, as if all actions were
+run sequentially.
+'''
+
+import concurrent.futures
+from logging import getLogger
+import time
+
+
+logger = getLogger(__name__)
+
+
+def get_dependencies(component_installers):
+    """
+    Return list containing, for each component installer, the set of
+    indexes of the component installers that must complete first
+    """
+
+    index = {}
+
+    for i, component_installer in enumerate(component_installers):
+        index.setdefault(component_installer.name, i)
+
+    dependencies = []
+
+    # Most recent component installer that is not parallel-safe
+    barrier = None
+
+    for i, component_installer in enumerate(component_installers):
+        parallel_safe = getattr(component_installer, 'parallel_safe', False)
+
+        if not parallel_safe:
+            deps = set(range(i))
+        elif barrier is not None:
+            deps = {barrier}
+        else:
+            deps = set()
+
+        for name in getattr(component_installer, 'run_after', []):
+            if name in index and index[name] != i:
+                deps.add(index[name])
+
+        dependencies.append(deps)
+
+        if not parallel_safe:
+            barrier = i
+
+    if _has_cycle(dependencies):
+        logger.warning(
+            'Conflicting component action dependencies; running'
+            ' actions sequentially')
+
+        dependencies = [{i - 1} if i else set()
+                        for i in range(len(component_installers))]
+
+    return dependencies
+
+
+def _has_cycle(dependencies):
+    completed = set()
+
+    while len(completed) < len(dependencies):
+        ready = {i for i, deps in enumerate(dependencies)
+                 if i not in completed and deps <= completed}
+
+        if not ready:
+            return True
+
+        completed |= ready
+
+    return False
+
+
+def _run_action(component_installer, action_name, *args, **kwargs):
+    start = time.monotonic()
+
+    try:
+        return component_installer.run_action(action_name, *args, **kwargs)
+    finally:
+        logger.info(
+            'Component [{}] action [{}] completed in {:.3f}s'.format(
+                component_installer.name, action_name,
+                time.monotonic() - start))
+
+
+def run_component_actions(component_installers, action_name, *args,
+                          max_workers=1, **kwargs):
+    """
+    Run action 'action_name' of all component installers, running up to
+    'max_workers' actions concurrently.
+
+    If an action raises an exception, no further actions are started and
+    the first exception is raised once running actions complete.
+    """
+
+    component_installers = list(component_installers)
+
+    if max_workers <= 1 or len(component_installers) <= 1:
+        for component_installer in component_installers:
+            _run_action(component_installer, action_name, *args, **kwargs)
+
+        return
+
+    dependencies = get_dependencies(component_installers)
+
+    pending = list(range(len(component_installers)))
+    completed = set()
+    running = {}
+    error = None
+
+    start = time.monotonic()
+
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers) as executor:
+        while True:
+            if error is None:
+                for i in [i for i in pending if dependencies[i] <= completed]:
+                    pending.remove(i)
+
+                    future = executor.submit(
+                        _run_action, component_installers[i], action_name,
+                        *args, **kwargs)
+
+                    running[future] = i
+
+            if not running:
+                break
+
+            finished, _ = concurrent.futures.wait(
+                running, return_when=concurrent.futures.FIRST_COMPLETED)
+
+            for future in finished:
+                completed.add(running.pop(future))
+
+                exc = future.exception()
+
+                if exc is not None and error is None:
+                    error = exc
+
+    logger.debug(
+        'Action [{}] of {} components completed in {:.3f}s'.format(
+            action_name, len(component_installers),
+            time.monotonic() - start))
+
+    if error is not None:
+        raise error
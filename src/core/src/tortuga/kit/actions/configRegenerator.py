@@ -0,0 +1,219 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''
+Coalesce configuration regeneration requested by component installers.
+
+Rather than rewriting configuration files and restarting services in
+every node action, component installers call mark_dirty() and implement
+regenerate(). Dirty components are regenerated once no further changes
+were requested for 'quiet_period' seconds, no later than 'max_delay'
+seconds after the first pending request, or when flush() is called
+(ie. at the end of an add or delete host operation). Components whose
+regeneration failed remain pending and are retried with exponential
+backoff until regenerated successfully.
+'''
+
+import atexit
+from logging import getLogger
+import threading
+import time
+
+
+logger = getLogger(__name__)
+
+
+class ConfigRegenerator(object):
+    QUIET_PERIOD = 2
+
+    MAX_DELAY = 10
+
+    # Delay (in seconds) before retrying a failed regeneration; doubled
+    # for each subsequent failure up to RETRY_MAX
+    RETRY_BASE = 5
+    RETRY_MAX = 300
+
+    def __init__(self, quiet_period=QUIET_PERIOD, max_delay=MAX_DELAY,
+                 retry_base=RETRY_BASE, retry_max=RETRY_MAX):
+        self.quiet_period = quiet_period
+        self.max_delay = max_delay
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+
+        self._cond = threading.Condition()
+
+        # Serializes regeneration by the worker thread and flush()
+        self._run_lock = threading.Lock()
+
+        # Dirty component installers, in the order first marked
+        self._dirty = {}
+
+        self._first_marked = None
+        self._last_marked = None
+
+        # Component installers whose regeneration failed, mapped to
+        # tuple (time of next retry, number of failures)
+        self._failed = {}
+
+        self._thread = None
+
+    def mark_dirty(self, component_installer):
+        """
+        Request regeneration of the configuration of 'component_installer'
+        """
+
+        with self._cond:
+            now = time.monotonic()
+
+            if not self._dirty:
+                self._first_marked = now
+
+            self._last_marked = now
+
+            self._dirty[component_installer] = True
+
+            self.__start()
+
+            self._cond.notify()
+
+    def flush(self):
+        """
+        Regenerate the configuration of all dirty component installers,
+        including those whose regeneration previously failed, now. The
+        first exception raised by a component installer is raised once
+        all have been regenerated; failed components remain pending.
+        """
+
+        error = self.__regenerate(retry_all=True)
+
+        if error is not None:
+            raise error
+
+    def __start(self):
+        # Called with '_cond' held
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self.__run, name='ConfigRegenerator', daemon=True)
+
+            self._thread.start()
+
+    def __get_deadline(self):
+        deadlines = [retry_at for retry_at, _ in self._failed.values()]
+
+        if self._dirty:
+            deadlines.append(min(self._last_marked + self.quiet_period,
+                                 self._first_marked + self.max_delay))
+
+        return min(deadlines) if deadlines else None
+
+    def __run(self):
+        while True:
+            with self._cond:
+                while True:
+                    deadline = self.__get_deadline()
+
+                    if deadline is None:
+                        self._cond.wait()
+
+                        continue
+
+                    remaining = deadline - time.monotonic()
+
+                    if remaining <= 0:
+                        break
+
+                    self._cond.wait(remaining)
+
+            # Errors are logged; failed components are retried
+            self.__regenerate()
+
+    def __regenerate(self, retry_all=False):
+        with self._run_lock:
+            with self._cond:
+                component_installers = list(self._dirty)
+
+                self._dirty = {}
+
+                now = time.monotonic()
+
+                component_installers.extend(
+                    component_installer
+                    for component_installer, (retry_at, _) in
+                    self._failed.items()
+                    if (retry_all or retry_at <= now) and
+                    component_installer not in component_installers)
+
+            error = None
+
+            for component_installer in component_installers:
+                start = time.monotonic()
+
+                try:
+                    component_installer.regenerate()
+                except Exception as exc:  # pylint: disable=broad-except
+                    logger.exception(
+                        'Error regenerating configuration of component'
+                        ' [{}]'.format(component_installer.name))
+
+                    self.__retry_later(component_installer)
+
+                    if error is None:
+                        error = exc
+
+                    continue
+
+                with self._cond:
+                    self._failed.pop(component_installer, None)
+
+                logger.info(
+                    'Component [{}] configuration regenerated in'
+                    ' {:.3f}s'.format(component_installer.name,
+                                      time.monotonic() - start))
+
+            return error
+
+    def __retry_later(self, component_installer):
+        with self._cond:
+            _, failures = self._failed.get(component_installer, (None, 0))
+
+            failures += 1
+
+            delay = min(self.retry_base * 2 ** (failures - 1),
+                        self.retry_max)
+
+            self._failed[component_installer] = (
+                time.monotonic() + delay, failures)
+
+            # Changes requested while regenerating (ie. by the failed
+            # component itself) are retried with the failed component
+            self._dirty.pop(component_installer, None)
+
+            self.__start()
+
+            self._cond.notify()
+
+
+configRegenerator = ConfigRegenerator()
+
+
+def _flush_at_exit():
+    # Regeneration requested by short-lived processes (ie. pre-add-host)
+    # must not be lost
+    try:
+        configRegenerator.flush()
+    except Exception:  # pylint: disable=broad-except
+        pass
+
+
+atexit.register(_flush_at_exit)
@@ -27,21 +27,183 @@ Module "x" is dynamically imported through functions in this module, e.g.:
     kit = mgr.load_kit('ganglia')
 '''
 from logging import getLogger
+import os
+import threading
+import uuid
 
+from tortuga.config.configManager import ConfigManager
 from tortuga.kit.loader import load_kits
 from tortuga.kit.registry import get_all_kit_installers
 from tortuga.objects.tortugaObjectManager import TortugaObjectManager
 from tortuga.types import Singleton
+from .actionScheduler import run_component_actions
+from .configRegenerator import configRegenerator
 
 
 logger = getLogger(__name__)
 
 
+# Replaced whenever kits are installed or deleted, or components are
+# enabled or disabled, so all processes reload component installers
+COMPONENT_INSTALLERS_MARKER = 'var/tmp/kit-components.generation'
+
+
+def _get_marker_path():
+    return os.path.join(
+        ConfigManager().getRoot(), COMPONENT_INSTALLERS_MARKER)
+
+
+# Incremented when invalidated by this process
+_local_generation = 0
+
+
+def _get_generation():
+    try:
+        st = os.stat(_get_marker_path())
+    except FileNotFoundError:
+        return _local_generation, None
+
+    return _local_generation, st.st_ino, st.st_mtime_ns
+
+
+def invalidate_component_installers():
+    """
+    Discard component installers cached by KitActionsManager in all
+    processes. Call after installing or deleting kits and enabling or
+    disabling components.
+    """
+
+    global _local_generation  # pylint: disable=global-statement
+
+    _local_generation += 1
+
+    path = _get_marker_path()
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Replace the marker (new inode) so changes within the timestamp
+        # resolution are detected
+        tmp_path = '{}.{}'.format(path, uuid.uuid4().hex)
+
+        with open(tmp_path, 'w'):
+            pass
+
+        os.replace(tmp_path, path)
+    except OSError:
+        logger.exception('Unable to update [{}]'.format(path))
+
+
+class _ComponentInstallers(object):
+    """
+    Component installers of all kits, loaded once per generation
+    """
+
+    def __init__(self, generation, kit_installers, enabled_names):
+        self.generation = generation
+
+        # Component installers in kit order, keyed on base kit order
+        self.all = {}
+
+        for base_kit_order in ('first', 'last'):
+            self.all[base_kit_order] = [
+                component_installer
+                for kit_installer in _order_kit_installers(
+                    kit_installers, base_kit_order)
+                for component_installer in
+                kit_installer.get_all_component_installers()
+            ]
+
+        self.enabled = {
+            base_kit_order: [
+                component_installer
+                for component_installer in component_installers
+                if component_installer.name in enabled_names
+            ]
+            for base_kit_order, component_installers in self.all.items()
+        }
+
+        # First component installer with each name
+        self.by_name = {}
+
+        for component_installer in self.all['first']:
+            self.by_name.setdefault(
+                component_installer.name, component_installer)
+
+
+def _order_kit_installers(kit_installers, base_kit_order='any'):
+    """
+    Return kit installers with the base kit moved to the start ('first')
+    or end ('last') of the list
+    """
+
+    kit_installers = list(kit_installers)
+
+    if base_kit_order in ['first', 'last']:
+        base_kit_installer = None
+        for kit in kit_installers:
+            if kit.name == 'base':
+                base_kit_installer = kit
+        if base_kit_installer:
+            kit_installers.remove(base_kit_installer)
+            if base_kit_order == 'first':
+                kit_installers.insert(0, base_kit_installer)
+            else:
+                kit_installers.append(base_kit_installer)
+
+    return kit_installers
+
+
 class KitActionsManager(TortugaObjectManager, Singleton):
+    # Maximum number of component actions run concurrently for add and
+    # delete host actions (see ComponentInstallerBase.parallel_safe)
+    MAX_PARALLEL_ACTIONS = 4
+
     def __init__(self):
         super(KitActionsManager, self).__init__()
         load_kits()
 
+        self._lock = threading.Lock()
+
+        self._component_installers = None
+
+    def _get_component_installers(self):
+        """
+        Return component installers, reloading them if kits or enabled
+        components changed since they were loaded
+        """
+
+        generation = _get_generation()
+
+        with self._lock:
+            cached = self._component_installers
+
+            if cached is not None and cached.generation == generation:
+                return cached
+
+            # Discover kits installed since last loaded
+            load_kits()
+
+            kit_installers = [
+                kit_installer_class()
+                for kit_installer_class in get_all_kit_installers()
+            ]
+
+            self._component_installers = _ComponentInstallers(
+                generation, kit_installers,
+                self._get_enabled_component_names())
+
+            return self._component_installers
+
+    def _get_enabled_component_names(self): \
+            # pylint: disable=no-self-use
+        from tortuga.db.softwareProfileDbApi import SoftwareProfileDbApi
+
+        return {
+            db_component.getName() for db_component in
+            SoftwareProfileDbApi().getAllEnabledComponentList()
+        }
+
     def get_cloud_config(self, node, hardware_profile, software_profile,
                          user_data, *args, **kwargs):
         logger.debug(
@@ -51,8 +213,8 @@ class KitActionsManager(TortugaObjectManager, Singleton):
             )
         )
 
-        for component_installer in self._get_enabled_component_installers(
-                self._get_all_component_installers()):
+        for component_installer in \
+                self._get_component_installers().enabled['first']:
             component_installer.run_action(
                 'get_cloud_config',
                 node,
@@ -74,8 +236,8 @@ class KitActionsManager(TortugaObjectManager, Singleton):
             )
         )
 
-        for component_installer in self._get_enabled_component_installers(
-                self._get_all_component_installers()):
+        for component_installer in \
+                self._get_component_installers().enabled['first']:
             component_installer.run_action(
                 'pre_add_host',
                 hardware_profile_name,
@@ -106,8 +268,8 @@ class KitActionsManager(TortugaObjectManager, Singleton):
             )
         )
 
-        component_installers = self._get_enabled_component_installers(
-            self._get_all_component_installers())
+        component_installers = \
+            self._get_component_installers().enabled['first']
 
         #
         # This needs to be here because of circular imports :(
@@ -120,12 +282,15 @@ class KitActionsManager(TortugaObjectManager, Singleton):
                                         software_profile_name, nodes,
                                         'add_host', *args, **kwargs)
 
+        # Nodes are started once this returns
+        self.regenerate_config()
+
     def refresh(self, software_profile_list, *args, **kwargs):
         logger.debug('refresh: {} {} kargs {}'.format(software_profile_list,
                                                       args, kwargs))
 
-        component_installers = self._get_enabled_component_installers(
-            self._get_all_component_installers())
+        component_installers = \
+            self._get_component_installers().enabled['first']
         for component_installer in component_installers:
             component_installer.run_action(
                 'refresh',
@@ -164,8 +329,8 @@ class KitActionsManager(TortugaObjectManager, Singleton):
             )
         )
 
-        component_installers = self._get_enabled_component_installers(
-            self._get_all_component_installers(base_kit_order='last'))
+        component_installers = \
+            self._get_component_installers().enabled['last']
 
         from tortuga.db.dbManager import DbManager
         session = DbManager().openSession()
@@ -205,62 +370,48 @@ class KitActionsManager(TortugaObjectManager, Singleton):
                                         aggregated_nodes, action_name,
                                         *args, **kwargs)
 
+    def regenerate_config(self): \
+            # pylint: disable=no-self-use
+        """
+        Regenerate configuration of components marked dirty by previous
+        actions without waiting for pending changes to be coalesced
+
+        """
+        configRegenerator.flush()
+
     def _get_all_component_installers(self, base_kit_order='first'):
-        all_components = []
-        for kit_installer_class in self._load_kits(base_kit_order):
-            kit_installer = kit_installer_class()
-            all_components.extend(
-                kit_installer.get_all_component_installers())
-        return all_components
+        return list(self._get_component_installers().all[base_kit_order])
 
     def _get_enabled_component_installers(self, component_list):
-        from tortuga.db.softwareProfileDbApi import SoftwareProfileDbApi
+        enabled_components = set(
+            self._get_component_installers().enabled['first'])
 
-        enabled_components = []
-        api = SoftwareProfileDbApi()
-
-        db_enabled_components = api.getAllEnabledComponentList()
-        for component in component_list:
-            for db_component in db_enabled_components:
-                if component.name == db_component.getName():
-                    enabled_components.append(component)
-                    break
-        return enabled_components
+        return [component for component in component_list
+                if component in enabled_components]
 
     def _run_action_with_node_list(self, component_installer_list,
                                    hardware_profile_name,
                                    software_profile_name, nodes, action_name,
                                    *args, **kwargs):
-        for component_installer in component_installer_list:
-            component_installer.run_action(
-                action_name,
-                hardware_profile_name,
-                software_profile_name,
-                nodes,
-                *args,
-                **kwargs
-            )
+        run_component_actions(
+            component_installer_list,
+            action_name,
+            hardware_profile_name,
+            software_profile_name,
+            nodes,
+            *args,
+            max_workers=self.MAX_PARALLEL_ACTIONS,
+            **kwargs
+        )
 
-    def _load_kits(self, base_kit_order='any'):
+    def _load_kits(self, base_kit_order='any'): \
+            # pylint: disable=no-self-use
         """
         Return a list of all KitInstaller objects in the system
 
         """
-        all_kit_installers = get_all_kit_installers()
-
-        if base_kit_order in ['first', 'last']:
-            base_kit_installer = None
-            for kit in all_kit_installers:
-                if kit.name == 'base':
-                    base_kit_installer = kit
-            if base_kit_installer:
-                all_kit_installers.remove(base_kit_installer)
-            if base_kit_order == 'first':
-                all_kit_installers.insert(0, base_kit_installer)
-            else:
-                all_kit_installers.append(base_kit_installer)
-
-        return all_kit_installers
+        return _order_kit_installers(
+            get_all_kit_installers(), base_kit_order)
 
     def load_component(self, component_name):
         """
@@ -270,8 +421,4 @@ class KitActionsManager(TortugaObjectManager, Singleton):
         :return:
 
         """
-        component_installers = self._get_all_component_installers()
-        for component_installer in component_installers:
-            if component_installer.name == component_name:
-                return component_installer
-        return None
+        return self._get_component_installers().by_name.get(component_name)
@@ -495,6 +495,15 @@ class ComponentInstallerBase(ConfigurableMixin):
     installer_only = False
     compute_only = False
 
+    #
+    # Node actions (add_host, pre_delete_host, delete_host) of
+    # parallel-safe components may run concurrently with those of other
+    # parallel-safe components. Actions of components named in
+    # 'run_after' complete first.
+    #
+    parallel_safe = False
+    run_after = []
+
     def __init__(self, kit_installer):
         self.kit_installer = kit_installer
         self.spec = (self.kit_installer.spec, self.name, self.version)
@@ -558,6 +567,25 @@ class ComponentInstallerBase(ConfigurableMixin):
         except KeyError:
             raise Exception('Unknown action: {}'.format(action_name))
 
+    def mark_dirty(self):
+        """
+        Requests regeneration of the configuration managed by this
+        component. Multiple requests made in quick succession result in a
+        single call to regenerate().
+
+        """
+        from .actions.configRegenerator import configRegenerator
+        configRegenerator.mark_dirty(self)
+
+    def regenerate(self):
+        """
+        Regenerates the configuration managed by this component after
+        mark_dirty() was called. Override this in your implementations
+        as necessary.
+
+        """
+        pass
+
     def get_component(self):
         """
         Gets a Component instance for this component.
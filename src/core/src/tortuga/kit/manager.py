@@ -47,6 +47,7 @@ from tortuga.softwareprofile import softwareProfileFactory
 from tortuga.types import Singleton
 from typing import List
 from tortuga.utility.actionManager import ActionManager
+from .actions.kitActionsManager import invalidate_component_installers
 from .eula import BaseEulaValidator
 from .loader import load_kits
 from .registry import get_kit_installer
@@ -207,6 +208,8 @@ class KitManager(TortugaObjectManager, Singleton):
         #
         installer.run_action('post_install')
 
+        invalidate_component_installers()
+
         if eula:
             ActionManager().logAction(
                 'Kit [{}] installed and EULA accepted at [{}]'
@@ -626,6 +629,8 @@ class KitManager(TortugaObjectManager, Singleton):
         else:
             self._delete_kit(kit, force)
 
+        invalidate_component_installers()
+
         self.getLogger().info('Deleted kit: {}'.format(kit))
 
     def _delete_kit(self, kit, force):
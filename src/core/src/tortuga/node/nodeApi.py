@@ -38,13 +38,14 @@ class NodeApi(TortugaApi):
                       dbHardwareProfile: HardwareProfiles,
                       dbSoftwareProfile: Optional[SoftwareProfiles] = None,
                       validateIp: bool = True, bGenerateIp: bool = True,
-                      dns_zone: Optional[str] = None) -> Nodes:
+                      dns_zone: Optional[str] = None,
+                      generated_name: Optional[str] = None) -> Nodes:
         try:
             return self._nodeManager.createNewNode(
                 session, addNodeRequest, dbHardwareProfile,
                 dbSoftwareProfile=dbSoftwareProfile,
                 validateIp=validateIp, bGenerateIp=bGenerateIp,
-                dns_zone=dns_zone)
+                dns_zone=dns_zone, generated_name=generated_name)
         except TortugaException:
             raise
         except Exception as ex:
@@ -52,7 +53,10 @@ class NodeApi(TortugaApi):
 
             raise TortugaException(exception=ex)
 
-    def getNodeList(self, tags: Optional[dict] = None):
+    def getNodeList(self, tags: Optional[dict] = None,
+                    limit: Optional[int] = None,
+                    after: Optional[str] = None,
+                    fields: Optional[list] = None):
         """
         Get node list..
 
@@ -62,7 +66,8 @@ class NodeApi(TortugaApi):
                 TortugaException
         """
         try:
-            return self._nodeManager.getNodeList(tags=tags)
+            return self._nodeManager.getNodeList(
+                tags=tags, limit=limit, after=after, fields=fields)
         except TortugaException:
             raise
         except Exception as ex:
@@ -119,6 +124,18 @@ class NodeApi(TortugaApi):
 
             raise TortugaException(exception=ex)
 
+    def getNodesByIps(self, ips: list):
+        """Get nodes by ip, keyed on ip"""
+        try:
+            return self._nodeManager.getNodesByIps(ips)
+        except TortugaException:
+            raise
+        except Exception as ex:
+            self.getLogger().exception(
+                'Fatal error retrieving nodes by ip')
+
+            raise TortugaException(exception=ex)
+
     def deleteNode(self, nodespec: str):
         try:
             return self._nodeManager.deleteNode(nodespec)
@@ -22,10 +22,13 @@ class NodeApiInterface(object): \
     Node API interface.
     """
 
-    def getNodeList(self, tags=None): \
+    def getNodeList(self, tags=None, limit=None, after=None,
+                    fields=None): \
             # pylint: disable=no-self-use,unused-argument
         """
-        Get the list of nodes
+        Get the list of nodes, optionally paged by node name ('limit'
+        nodes with name following 'after') and restricted to the node
+        attributes named in 'fields'
 
             Returns:
                 List of nodes.
@@ -45,6 +48,12 @@ class NodeApiInterface(object): \
         """Get node by IP address"""
         raise AbstractMethod('getNodeByIp must be implemented in API class')
 
+    def getNodesByIps(self, ips): \
+            # pylint: disable=unused-argument,no-self-use
+        """Get nodes by IP address, keyed on IP address"""
+        raise AbstractMethod(
+            'getNodesByIps must be implemented in API class')
+
     def deleteNode(self, nodespec): \
             # pylint: disable=unused-argument,no-self-use
         """delete node by name"""
@@ -45,6 +45,23 @@ from tortuga.db.hardwareProfiles import HardwareProfiles
 from tortuga.db.softwareProfiles import SoftwareProfiles
 
 
+def _group_by_profile(nodes):
+    """
+    Group (hardware profile name, software profile name, node name)
+    tuples by profile. Returns list of ((hardware profile name, software
+    profile name), [node name, ...]) tuples in order of first occurrence.
+    """
+
+    groups = {}
+
+    for hardwareprofile_name, softwareprofile_name, node_name in nodes:
+        groups.setdefault(
+            (hardwareprofile_name, softwareprofile_name), []).append(
+                node_name)
+
+    return list(groups.items())
+
+
 class NodeManager(TortugaObjectManager): \
         # pylint: disable=too-many-public-methods
 
@@ -79,10 +96,15 @@ class NodeManager(TortugaObjectManager): \
                       dbHardwareProfile: HardwareProfiles,
                       dbSoftwareProfile: Optional[SoftwareProfiles] = None,
                       validateIp: bool = True, bGenerateIp: bool = True,
-                      dns_zone: Optional[str] = None) -> Nodes:
+                      dns_zone: Optional[str] = None,
+                      generated_name: Optional[str] = None) -> Nodes:
         """
         Convert the addNodeRequest into a Nodes object
 
+        'generated_name' is a node name previously reserved using
+        AddHostServerLocal.generate_node_names(); it is used when the
+        request does not specify a host name.
+
         Raises:
             NicNotFound
         """
@@ -115,7 +137,7 @@ class NodeManager(TortugaObjectManager): \
         # hardware profile in which host names are generated)
         self.__validateHostName(hostname, dbHardwareProfile.nameFormat)
 
-        node.name = hostname
+        node.name = hostname or generated_name
 
         # Complete initialization of new node record
         nic_defs = addNodeRequest['nics'] \
@@ -185,9 +207,20 @@ class NodeManager(TortugaObjectManager): \
 
         return self._nodeDbApi.getNodeByIp(ip)
 
-    def getNodeList(self, tags=None):
+    def getNodesByIps(self, ips):
+        """
+        Get nodes by IP addresses
+
+        Returns dict of nodes keyed on IP address; addresses not assigned
+        to any node are omitted.
+        """
+
+        return self._nodeDbApi.getNodesByIps(ips)
+
+    def getNodeList(self, tags=None, limit=None, after=None, fields=None):
         """Return all nodes"""
-        return self._nodeDbApi.getNodeList(tags=tags)
+        return self._nodeDbApi.getNodeList(
+            tags=tags, limit=limit, after=after, fields=fields)
 
     def updateNode(self, nodeName, updateNodeRequest):
         self.getLogger().debug('updateNode(): name=[{0}]'.format(nodeName))
@@ -425,11 +458,17 @@ class NodeManager(TortugaObjectManager): \
 
         kitmgr = KitActionsManager()
 
-        for node in nodes:
+        for (hardwareprofile_name, softwareprofile_name), node_names in \
+                _group_by_profile(
+                    (node.hardwareprofile.name,
+                     node.softwareprofile.name
+                     if node.softwareprofile else None,
+                     node.name) for node in nodes):
             kitmgr.pre_delete_host(
-                node.hardwareprofile.name,
-                node.softwareprofile.name if node.softwareprofile else None,
-                nodes=[node.name])
+                hardwareprofile_name, softwareprofile_name,
+                nodes=node_names)
+
+        kitmgr.regenerate_config()
 
     def __postDeleteHost(self, nodes_deleted):
         # 'nodes_deleted' is a list of dicts of the following format:
@@ -453,12 +492,16 @@ class NodeManager(TortugaObjectManager): \
 
         kitmgr = KitActionsManager()
 
-        for node_dict in nodes_deleted:
+        for (hardwareprofile_name, softwareprofile_name), node_names in \
+                _group_by_profile(
+                    (node_dict['hardwareprofile'],
+                     node_dict.get('softwareprofile'),
+                     node_dict['name']) for node_dict in nodes_deleted):
             kitmgr.post_delete_host(
-                node_dict['hardwareprofile'],
-                node_dict['softwareprofile']
-                if 'softwareprofile' in node_dict else None,
-                nodes=[node_dict['name']])
+                hardwareprofile_name, softwareprofile_name,
+                nodes=node_names)
+
+        kitmgr.regenerate_config()
 
     def __scheduleUpdate(self):
         tortugaSubprocess.executeCommand(
@@ -29,7 +29,10 @@ class AddHostStatus(TortugaObject): \
         TortugaObject.__init__(self, {
             'nodes': TortugaObjectList(),
             'strings': TortugaObjectList(),
-            'running': False
+            'running': False,
+            'completed': False,
+            'nextMessage': 0,
+            'nodeCursor': None,
         }, [], AddHostStatus.ROOT_TAG)
 
     def setNodeList(self, val):
@@ -50,9 +53,29 @@ class AddHostStatus(TortugaObject): \
     def getIsRunning(self):
         return toBool(self.get('running'))
 
+    def setIsCompleted(self, val):
+        self['completed'] = toBool(val)
+
+    def getIsCompleted(self):
+        return toBool(self.get('completed'))
+
+    def setNextMessage(self, val):
+        self['nextMessage'] = val
+
+    def getNextMessage(self):
+        """ Index of first message not yet returned """
+        return self.get('nextMessage')
+
+    def setNodeCursor(self, val):
+        self['nodeCursor'] = val
+
+    def getNodeCursor(self):
+        """ Greatest id of nodes returned """
+        return self.get('nodeCursor')
+
     @staticmethod
     def getKeys():
-        return ['running']
+        return ['running', 'completed', 'nextMessage', 'nodeCursor']
 
     @classmethod
     def getFromDict(cls, dict_):
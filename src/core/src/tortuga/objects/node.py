@@ -235,7 +235,16 @@ class Node(TortugaObject): \
         return node
 
     @classmethod
-    def getFromDbDict(cls, _dict, ignore=None):
+    def getFromDbDict(cls, _dict, ignore=None, profile_cache=None):
+        """
+        Get node from database object dict.
+
+        'profile_cache' is an optional dict shared by all nodes converted
+        within the same request. Hardware and software profiles are
+        converted once and the resulting objects are shared by all nodes
+        referencing the same profile.
+        """
+
         node = super(Node, cls).getFromDict(_dict, ignore=ignore)
 
         # nics (relation)
@@ -247,8 +256,9 @@ class Node(TortugaObject): \
 
         if hardwareProfileDict:
             node.setHardwareProfile(
-                tortuga.objects.hardwareProfile.HardwareProfile.
-                getFromDbDict(hardwareProfileDict.__dict__))
+                _get_profile_from_db_object(
+                    tortuga.objects.hardwareProfile.HardwareProfile,
+                    hardwareProfileDict, profile_cache))
 
             if hardwareProfileDict.resourceadapter:
                 node.setResourceAdapter(
@@ -261,8 +271,9 @@ class Node(TortugaObject): \
 
             if softwareProfileDict:
                 node.setSoftwareProfile(
-                    tortuga.objects.softwareProfile.SoftwareProfile.
-                    getFromDbDict(softwareProfileDict.__dict__))
+                    _get_profile_from_db_object(
+                        tortuga.objects.softwareProfile.SoftwareProfile,
+                        softwareProfileDict, profile_cache))
 
         # parentnode (relation)
         parentNodeDict = _dict.get('parentnode')
@@ -287,3 +298,21 @@ class Node(TortugaObject): \
         node.setTags(tags)
 
         return node
+
+
+def _get_profile_from_db_object(cls, dbProfile, profile_cache):
+    """
+    Convert hardware/software profile database object 'dbProfile' to
+    instance of 'cls', reusing previously converted instance from
+    'profile_cache' (if provided).
+    """
+
+    if profile_cache is None:
+        return cls.getFromDbDict(dbProfile.__dict__)
+
+    key = (cls.ROOT_TAG, dbProfile.id)
+
+    if key not in profile_cache:
+        profile_cache[key] = cls.getFromDbDict(dbProfile.__dict__)
+
+    return profile_cache[key]
@@ -215,17 +215,28 @@ class TortugaObject(dict): \
 
         return domRoot
 
-    def getCleanDict(self):
+    def getCleanDict(self, cache=None):
+        """
+        'cache' is an optional dict used to serialize objects shared by
+        multiple parents (ie. profiles shared by nodes) only once.
+        """
+
+        if cache is not None and id(self) in cache:
+            return cache[id(self)]
+
         dataDict = {}
 
         for key, value in self.items():
             if isinstance(value, TortugaObject) or \
                isinstance(value, TortugaObjectList):
-                dataDict[key] = value.getCleanDict()
+                dataDict[key] = value.getCleanDict(cache=cache)
                 continue
 
             dataDict[key] = self.get(key)
 
+        if cache is not None:
+            cache[id(self)] = dataDict
+
         return dataDict
 
     def getJsonRep(self):
@@ -310,12 +321,15 @@ class TortugaObjectList(list):
         indent(element)
         return ET.tostring(element)
 
-    def getCleanDict(self):
+    def getCleanDict(self, cache=None):
         dataDict = []
 
+        if cache is None:
+            cache = {}
+
         for obj in self:
             if isinstance(obj, TortugaObject):
-                dataDict.append(obj.getCleanDict())
+                dataDict.append(obj.getCleanDict(cache=cache))
                 continue
 
             dataDict.append(obj)
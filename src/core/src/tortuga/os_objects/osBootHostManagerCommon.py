@@ -132,12 +132,28 @@ class OsBootHostManagerCommon(OsObjectManager):
         # Add DHCP lease to DHCP server
         pass
 
+    def addDhcpLeases(self, leases):
+        # Add DHCP leases for list of (node, nic) tuples. Returns dict of
+        # node name to error message for leases that could not be added.
+        for node, nic in leases:
+            self.addDhcpLease(node, nic)
+
+        return {}
+
     def removeDhcpLease(self, nodeName):
         # Remove the DHCP lease from the DHCP server.  This will be
         # a no-op on any platform that doesn't support the operation
         # (ie. any platform not running ISC DHCPD)
         pass
 
+    def removeDhcpLeases(self, nodes):
+        # Remove DHCP leases for list of nodes. Returns dict of node name
+        # to error message for leases that could not be removed.
+        for node in nodes:
+            self.removeDhcpLease(node)
+
+        return {}
+
     def setNodeForNetworkBoot(self, dbNode):
         # Update node status to "Expired" and boot from network
         dbNode.state = 'Expired'
@@ -62,6 +62,20 @@ class OsServiceManagerInterface(object):
         raise AbstractMethod('stopService() has to be implemented in the'
                              ' concrete API class.')
 
+    def sendSignal(self, serviceName, signalName): \
+            # pylint: disable=no-self-use,unused-argument
+        """
+        Send signal (ie. 'HUP') to main process of service.
+
+            Returns:
+                None
+            Throws:
+                CommandFailed
+                TortugaException
+        """
+        raise AbstractMethod('sendSignal() has to be implemented in the'
+                             ' concrete API class.')
+
     def scheduleStartOnBoot(self, serviceName): \
             # pylint: disable=no-self-use,unused-argument
         """
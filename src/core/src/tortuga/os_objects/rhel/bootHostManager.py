@@ -15,15 +15,14 @@
 # pylint: disable=no-member
 
 import os
-import subprocess
 import platform
 from typing import NoReturn
-from textwrap import dedent
 
 from tortuga.os_objects.osBootHostManagerCommon \
     import OsBootHostManagerCommon
 from tortuga.os_objects.bootHostManagerInterface \
     import BootHostManagerInterface
+from tortuga.os_objects.rhel.omshell import OmshellBatch
 from tortuga.exceptions.osNotSupported import OsNotSupported
 from tortuga.exceptions.nicNotFound import NicNotFound
 from tortuga.utility.bootParameters import getBootParameters
@@ -244,71 +243,92 @@ label Reinstall
         return node.name
 
     def addDhcpLease(self, node, nic) -> NoReturn:
-        self.getLogger().debug(
-            'Adding DHCP lease for node [%s] MAC [%s]' % (node.name, nic.mac))
+        self.addDhcpLeases([(node, nic)])
+
+    def addDhcpLeases(self, leases):
+        """
+        Add DHCP leases for list of (node, nic) tuples using a single
+        omshell process.
+
+        Returns dict of node name to error message for leases that could
+        not be added.
+        """
+
+        batch = OmshellBatch()
+
+        # DHCP host name to node name
+        nodeNames = {}
 
-        dhcpName = self._getDhcpNodeName(node, nic)
+        for node, nic in leases:
+            self.getLogger().debug(
+                'Adding DHCP lease for node [%s] MAC [%s]' % (
+                    node.name, nic.mac))
 
-        cmds = dedent("""\
-            connect
-            new host
-            set name = "{name}"
-            set hardware-address = {mac}
-            set hardware-type = 1
-            set ip-address = {ip}
-            create
-            """)
+            dhcpName = self._getDhcpNodeName(node, nic)
 
-        cmds = cmds.format(name=dhcpName, mac=nic.mac, ip=nic.ip)
+            nodeNames[dhcpName] = node.name
 
-        p = subprocess.Popen(['/usr/bin/omshell'],
-                             stdin=subprocess.PIPE,
-                             stdout=subprocess.PIPE, encoding='utf-8')
+            batch.create_host(dhcpName, nic.mac, nic.ip)
 
-        stdout, stderr = p.communicate(cmds)
+        failures = {}
 
-        if p.poll() != 0:
+        for dhcpName, errmsg in batch.run().items():
             self.getLogger().error(
-                'Error adding DHCP lease for node [%s] (retval=%d): %s' % (
-                    node.name, p.returncode, stdout))
+                'Error adding DHCP lease for node [%s]: %s' % (
+                    nodeNames[dhcpName], errmsg))
+
+            failures[nodeNames[dhcpName]] = errmsg
+
+        return failures
 
     def removeDhcpLease(self, node) -> NoReturn:
-        # Find first provisioning NIC
-        try:
-            nic = get_provisioning_nic(node)
-        except NicNotFound:
-            return
+        self.removeDhcpLeases([node])
 
-        self.getLogger().debug(
-            'Removing DHCP lease for node [%s] MAC [%s]' % (
-                node.name, nic.mac))
-
-        dhcpName = self._getDhcpNodeName(node, nic)
-
-        cmds = dedent("""\
-            connect
-            new host
-            set name = "{name}"
-            set hardware-address = {mac}
-            set hardware-type = 1
-            set ip-address = {ip}
-            open
-            remove
+    def removeDhcpLeases(self, nodes):
+        """
+        Remove DHCP leases of list of nodes using a single omshell
+        process. Nodes without a provisioning NIC are ignored.
+
+        Returns dict of node name to error message for leases that could
+        not be removed.
         """
-        )
 
-        cmds = cmds.format(name=dhcpName, mac=nic.mac, ip=nic.ip)
+        batch = OmshellBatch()
+
+        # DHCP host name to node name
+        nodeNames = {}
 
-        p = subprocess.Popen(['/usr/bin/omshell'],
-                             stdin=subprocess.PIPE,
-                             stdout=subprocess.PIPE, encoding='utf-8')
+        for node in nodes:
+            # Find first provisioning NIC
+            try:
+                nic = get_provisioning_nic(node)
+            except NicNotFound:
+                continue
+
+            self.getLogger().debug(
+                'Removing DHCP lease for node [%s] MAC [%s]' % (
+                    node.name, nic.mac))
 
-        stdout, stderr = p.communicate(cmds)
+            dhcpName = self._getDhcpNodeName(node, nic)
+
+            nodeNames[dhcpName] = node.name
+
+            batch.remove_host(dhcpName, nic.mac, nic.ip)
+
+        failures = {}
+
+        for dhcpName, errmsg in batch.run().items():
+            # Lease already removed (or never added)
+            if 'not found' in errmsg:
+                continue
 
-        if p.poll() != 0:
             self.getLogger().error(
-                'Error removing DHCP lease for node [%s] (retval=%d): %s' % (
-                    node.name, p.returncode, stdout))
+                'Error removing DHCP lease for node [%s]: %s' % (
+                    nodeNames[dhcpName], errmsg))
+
+            failures[nodeNames[dhcpName]] = errmsg
+
+        return failures
 
     def getTftproot(self): \
             # pylint: disable=no-self-use
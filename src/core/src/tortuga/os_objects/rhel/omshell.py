@@ -0,0 +1,130 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+import subprocess
+from textwrap import dedent
+
+
+OMSHELL_PATH = '/usr/bin/omshell'
+
+# Messages printed by omshell when a command fails
+OMSHELL_ERRORS = (
+    "can't ",
+    'dhcpctl_connect',
+    'not connected',
+    'no open object',
+    'an object is already open',
+)
+
+HOST_NAME_RE = re.compile(r'^name = "(.*)"$')
+
+
+class OmshellBatch(object):
+    """
+    Batch of OMAPI host object operations applied using a single omshell
+    process and connection to the DHCP server
+    """
+
+    def __init__(self):
+        # List of (host name, commands) tuples
+        self._hosts = []
+
+    def create_host(self, name, mac, ip):
+        self._hosts.append((name, dedent("""\
+            new host
+            set name = "{name}"
+            set hardware-address = {mac}
+            set hardware-type = 1
+            set ip-address = {ip}
+            create
+            close
+            """).format(name=name, mac=mac, ip=ip)))
+
+    def remove_host(self, name, mac, ip):
+        self._hosts.append((name, dedent("""\
+            new host
+            set name = "{name}"
+            set hardware-address = {mac}
+            set hardware-type = 1
+            set ip-address = {ip}
+            open
+            remove
+            close
+            """).format(name=name, mac=mac, ip=ip)))
+
+    def get_script(self):
+        return 'connect\n' + ''.join(commands for _, commands in self._hosts)
+
+    def run(self):
+        """
+        Apply all operations. Returns dict of host name to error message
+        for hosts whose operation failed.
+        """
+
+        if not self._hosts:
+            return {}
+
+        p = subprocess.Popen([OMSHELL_PATH],
+                             stdin=subprocess.PIPE,
+                             stdout=subprocess.PIPE,
+                             stderr=subprocess.STDOUT, encoding='utf-8')
+
+        stdout, _ = p.communicate(self.get_script())
+
+        errors = self.parse_output(stdout)
+
+        if p.returncode != 0:
+            for name, _ in self._hosts:
+                errors.setdefault(
+                    name, 'omshell exited with status %d' % (p.returncode))
+
+        return errors
+
+    def parse_output(self, output):
+        """
+        Returns dict of host name to the first error reported by omshell
+        for that host.
+
+        omshell prints the host object after each command, so errors are
+        attributed to the host named in the most recently printed object.
+        Errors printed before any host object (ie. failure to connect)
+        apply to all hosts.
+        """
+
+        names = [name for name, _ in self._hosts]
+
+        errors = {}
+
+        index = None
+
+        for line in output.splitlines():
+            line = line.strip()
+
+            m = HOST_NAME_RE.match(line)
+            if m:
+                try:
+                    index = names.index(m.group(1), index or 0)
+                except ValueError:
+                    pass
+
+                continue
+
+            if not line.startswith(OMSHELL_ERRORS):
+                continue
+
+            for name in names if index is None else [names[index]]:
+                errors.setdefault(name, line)
+
+        return errors
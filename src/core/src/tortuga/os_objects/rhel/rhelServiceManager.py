@@ -91,6 +91,24 @@ class RhelServiceManager(OsObjectManager, OsServiceManagerInterface):
 
         self.execute(cmd, echo)
 
+    def sendSignal(self, serviceName, signalName, echo=False):
+        """
+        Send signal (ie. 'HUP') to main process of service. Without
+        systemd, the process ID is read from /var/run/<serviceName>.pid
+
+            Returns:
+                None
+            Throws:
+                CommandFailed
+        """
+
+        cmd = '%s kill --kill-who=main --signal=%s %s' % (
+            self.SYSTEMCTL_PATH, signalName, serviceName) \
+            if self._use_systemctl else \
+            'kill -s %s $(cat /var/run/%s.pid)' % (signalName, serviceName)
+
+        self.execute(cmd, echo)
+
     def scheduleStartOnBoot(self, serviceName):
         """
         Schedule service start on boot.
@@ -29,6 +29,8 @@ from tortuga.exceptions.kitNotFound import KitNotFound
 from tortuga.exceptions.tortugaException import TortugaException
 from tortuga.helper import osHelper
 from tortuga.kit import kitApiFactory
+from tortuga.kit.actions.kitActionsManager import \
+    invalidate_component_installers
 from tortuga.kit.loader import load_kits
 from tortuga.kit.registry import get_kit_installer
 from tortuga.objects.tortugaObject import TortugaObjectList
@@ -56,12 +58,13 @@ class SoftwareProfileManager(TortugaObjectManager, Singleton):
         self._kit_db_api = KitDbApi()
         self._config_manager = ConfigManager()
 
-    def getSoftwareProfileList(self, tags=None):
+    def getSoftwareProfileList(self, tags=None, fields=None):
         """Return all of the softwareprofiles with referenced components
         in this softwareprofile
         """
 
-        return self._sp_db_api.getSoftwareProfileList(tags=tags)
+        return self._sp_db_api.getSoftwareProfileList(
+            tags=tags, fields=fields)
 
     def getIdleSoftwareProfileList(self):
         """ Return all of the idle softwareprofiles """
@@ -456,6 +459,8 @@ class SoftwareProfileManager(TortugaObjectManager, Singleton):
             self.getLogger().info(
                 'Component not enabled: {}'.format(comp_name))
         else:
+            invalidate_component_installers()
+
             self.getLogger().info(
                 'Enabled component on software profile: {} -> {}'.format(
                     best_match_component, software_profile
@@ -626,6 +631,8 @@ class SoftwareProfileManager(TortugaObjectManager, Singleton):
             best_match_component = self._disable_kit_component(
                 kit, comp_name, comp_version, software_profile)
 
+        invalidate_component_installers()
+
         self.getLogger().info(
             'Disabled component on software profile: {} -> {}'.format(
                 best_match_component, software_profile
@@ -722,6 +729,9 @@ class SoftwareProfileManager(TortugaObjectManager, Singleton):
 
         self._sp_db_api.deleteSoftwareProfile(name)
 
+        # Components may no longer be enabled on any software profile
+        invalidate_component_installers()
+
         # Remove all flags for software profile
         swProfileFlagPath = os.path.join(
             self._config_manager.getRoot(), 'var/run/actions/%s' % (name))
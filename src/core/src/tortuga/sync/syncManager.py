@@ -44,12 +44,19 @@ class SyncManager(TortugaObjectManager, Singleton):
     def __init__(self):
         super(SyncManager, self).__init__()
 
+        # Update timer started in this process but not yet running
         self._isUpdateScheduled = False
         self._isUpdateRunning = False
         self._sudoCmd = \
             osUtility.getOsObjectFactory().getOsSysManager().getSudoCommand()
         self._cm = ConfigManager()
 
+        # Pending update requests are recorded in this file rather than
+        # in memory, so requests received by all web service processes
+        # are coalesced into one update
+        self._updateRequestFile = os.path.join(
+            self._cm.getRoot(), 'var/tmp/cluster-update.requested')
+
     def __runClusterUpdate(self):
         """ Run cluster update. """
         self.getLogger().debug('Update timer running')
@@ -58,11 +65,13 @@ class SyncManager(TortugaObjectManager, Singleton):
             self._sudoCmd,
             os.path.join(self._cm.getRoot(), 'bin/run_cluster_update.sh'))
 
+        with SyncManager.__instanceLock:
+            self._isUpdateScheduled = False
+            self._isUpdateRunning = True
+
         delay = 0
         updateCnt = 0
         while self.__resetIsUpdateScheduled():
-            self._isUpdateRunning = True
-
             self.getLogger().debug(
                 'New cluster update delay: %s seconds' % (delay))
 
@@ -102,7 +111,8 @@ class SyncManager(TortugaObjectManager, Singleton):
                         'Another cluster update is already running, will'
                         ' try to reschedule it')
 
-                    self._isUpdateRunning = False
+                    with SyncManager.__instanceLock:
+                        self._isUpdateRunning = False
 
                     self.scheduleClusterUpdate(
                         updateReason='another update already running',
@@ -117,7 +127,14 @@ class SyncManager(TortugaObjectManager, Singleton):
 
             self.getLogger().debug('Done with cluster update')
 
-        self._isUpdateRunning = False
+        with SyncManager.__instanceLock:
+            self._isUpdateRunning = False
+
+            # Update requested after the last check
+            if not self._isUpdateScheduled and \
+                    os.path.exists(self._updateRequestFile):
+                self.__startUpdateTimer(
+                    SyncManager.CLUSTER_UPDATE_DELAY_INCREASE)
 
         self.getLogger().debug('Update timer exiting')
 
@@ -125,30 +142,46 @@ class SyncManager(TortugaObjectManager, Singleton):
         """ Reset cluster update flag, return old flag value. """
         SyncManager.__instanceLock.acquire()
         try:
-            flag = self._isUpdateScheduled
-            self._isUpdateScheduled = False
-            return flag
+            # Only one process consumes each update request
+            os.unlink(self._updateRequestFile)
+
+            return True
+        except FileNotFoundError:
+            return False
         finally:
             SyncManager.__instanceLock.release()
 
+    def __setIsUpdateScheduled(self):
+        """ Record update request for any process to run. """
+        os.makedirs(os.path.dirname(self._updateRequestFile), exist_ok=True)
+
+        with open(self._updateRequestFile, 'w'):
+            pass
+
+    def __startUpdateTimer(self, delay):
+        self._isUpdateScheduled = True
+
+        t = threading.Timer(delay, self.__runClusterUpdate)
+
+        t.start()
+
     def scheduleClusterUpdate(self, updateReason=None, delay=5):
         """ Schedule cluster update. """
         SyncManager.__instanceLock.acquire()
         try:
+            self.__setIsUpdateScheduled()
+
             if self._isUpdateScheduled:
                 # Already scheduled.
                 return
 
             # Start update timer if needed.
-            self._isUpdateScheduled = True
             if not self._isUpdateRunning:
                 self.getLogger().debug(
                     'Scheduling cluster update in %s seconds,'
                     ' reason: %s' % (delay, updateReason))
 
-                t = threading.Timer(delay, self.__runClusterUpdate)
-
-                t.start()
+                self.__startUpdateTimer(delay)
             else:
                 self.getLogger().debug(
                     'Will not schedule new update timer while the old'
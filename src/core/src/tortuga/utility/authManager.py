@@ -12,30 +12,53 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from logging import getLogger
 import os
 import crypt
+import threading
+import time
+import uuid
 from tortuga.exceptions.userNotAuthorized import UserNotAuthorized
 from tortuga.objects.tortugaObjectManager import TortugaObjectManager
 from tortuga.config.configManager import ConfigManager
 from tortuga.utility.authPrincipal import AuthPrincipal
+from tortuga.utility.credentialCache import CredentialCache
 from tortuga.admin.adminApiFactory import getAdminApi
 from tortuga.types import Singleton
 
 
+logger = getLogger(__name__)
+
+
+# Replaced whenever admins are added, deleted or modified, so all
+# processes reload principals and discard cached credentials
+PRINCIPALS_MARKER = 'var/tmp/admins.generation'
+
+
 def authorizeRoot():
     if os.getuid() != 0:
         raise UserNotAuthorized('Command must be run as \'root\' user.')
 
 
 class AuthManager(TortugaObjectManager, Singleton):
+    # Minimum number of seconds between principal reloads caused by
+    # failed credential verification
+    RELOAD_INTERVAL = 5
+
     def __init__(self):
         super(AuthManager, self).__init__()
 
         self._configManager = ConfigManager()
 
-        self.__principals = {}
+        self.__credentialCache = CredentialCache()
+
+        self.__reloadLock = threading.Lock()
 
-        self.__loadPrincipals()
+        self.__lastReload = None
+
+        self.__generation = self.__getGeneration()
+
+        self.__principals = self.__loadPrincipals()
 
     def cryptPassword(self, cleartext, salt="$1$"): \
             # pylint: disable=no-self-use
@@ -44,12 +67,89 @@ class AuthManager(TortugaObjectManager, Singleton):
 
     def reloadPrincipals(self):
         """ This is used to reload the principals in auth manager """
-        self.__principals.clear()
+        oldPrincipals = self.__principals
+
+        # Replaced rather than updated in place so concurrent
+        # verification never sees a partially loaded set of principals
+        self.__principals = self.__loadPrincipals()
+
+        # Discard cached credentials for removed or modified principals
+        for name, principal in oldPrincipals.items():
+            newPrincipal = self.__principals.get(name)
+
+            if newPrincipal is None or \
+                    newPrincipal.getPassword() != principal.getPassword():
+                self.__credentialCache.invalidate(name)
+
+    def invalidatePrincipals(self):
+        """
+        Reload principals and discard cached credentials in all processes.
+        Call after adding, deleting or modifying admins.
+        """
+
+        path = self.__getMarkerPath()
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            # Replace the marker (new inode) so changes within the
+            # timestamp resolution are detected
+            tmp_path = '{}.{}'.format(path, uuid.uuid4().hex)
+
+            with open(tmp_path, 'w'):
+                pass
+
+            os.replace(tmp_path, path)
+        except OSError:
+            logger.exception('Unable to update [{}]'.format(path))
+
+        with self.__reloadLock:
+            self.__generation = self.__getGeneration()
+
+        self.reloadPrincipals()
+
+        self.__credentialCache.invalidate()
+
+    def __getMarkerPath(self):
+        return os.path.join(self._configManager.getRoot(), PRINCIPALS_MARKER)
+
+    def __getGeneration(self):
+        try:
+            st = os.stat(self.__getMarkerPath())
+        except FileNotFoundError:
+            return None
+
+        return st.st_ino, st.st_mtime_ns
 
-        self.__loadPrincipals()
+    def __checkGeneration(self):
+        """
+        Reload principals and discard cached credentials if admins were
+        changed by another process
+        """
+
+        generation = self.__getGeneration()
+
+        with self.__reloadLock:
+            if generation == self.__generation:
+                return
+
+            self.__generation = generation
+
+        self.reloadPrincipals()
+
+        self.__credentialCache.invalidate()
+
+    def invalidateCredentials(self, username=None):
+        """
+        Discard cached credentials for 'username' (or all users, if
+        'username' is None)
+        """
+        self.__credentialCache.invalidate(username)
 
     def __loadPrincipals(self):
         """ Load principals for config manager and datastore """
+        principals = {}
+
         # Create builtin cfm principal
         cfmUser = AuthPrincipal(
             self._configManager.getCfmUser(),
@@ -57,15 +157,65 @@ class AuthManager(TortugaObjectManager, Singleton):
             {'roles': 'cfm'})
 
         # Add cfm user
-        self.__principals[cfmUser.getName()] = cfmUser
+        principals[cfmUser.getName()] = cfmUser
 
         # Add users from DB
         if self._configManager.isInstaller():
             for admin in getAdminApi().getAdminList():
-                self.__principals[admin.getUsername()] = AuthPrincipal(
+                principals[admin.getUsername()] = AuthPrincipal(
                     admin.getUsername(), admin.getPassword(),
                     attributeDict={'id': admin.getId()})
 
+        return principals
+
+    def verifyCredentials(self, username, password):
+        """
+        Get a principal based on a username and password, consulting the
+        credential cache first. Principals are reloaded at most once every
+        RELOAD_INTERVAL seconds to pick up new admins.
+        """
+        self.__checkGeneration()
+
+        hit, principal = self.__credentialCache.get(username, password)
+
+        if hit:
+            return principal
+
+        principal = self.getPrincipal(username, password)
+
+        if principal is None and self.__acquireReload():
+            # See if there is a new admin available
+            self.reloadPrincipals()
+
+            principal = self.getPrincipal(username, password)
+
+        self.__credentialCache.put(username, password, principal)
+
+        return principal
+
+    def __acquireReload(self):
+        """ Return True if principals may be reloaded now """
+        with self.__reloadLock:
+            now = time.monotonic()
+
+            if self.__lastReload is not None and \
+                    now - self.__lastReload < self.RELOAD_INTERVAL:
+                return False
+
+            self.__lastReload = now
+
+            return True
+
+    def getCurrentPrincipal(self, username):
+        """
+        Get principal 'username', reloading principals first if admins
+        were changed by any process. Returns None if there is no such
+        principal.
+        """
+        self.__checkGeneration()
+
+        return self.__principals.get(username)
+
     def getPrincipal(self, username, password):
         """ Get a principal based on a username and password """
         principal = self.__principals.get(username)
@@ -0,0 +1,115 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import hashlib
+import hmac
+import os
+import threading
+import time
+from typing import Optional, Tuple
+
+from tortuga.utility.authPrincipal import AuthPrincipal
+
+
+class CredentialCache(object):
+    """
+    Bounded cache of verified credentials.
+
+    Entries are keyed on a keyed hash (HMAC with a per-process random
+    key) of the username and password, so cleartext passwords are never
+    retained. Successful and failed verifications are both cached, each
+    with its own time-to-live. The least recently used entry is evicted
+    when the cache is full.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 300,
+                 negative_ttl: float = 30, clock=time.monotonic):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._clock = clock
+
+        self._key = os.urandom(32)
+
+        self._lock = threading.Lock()
+
+        # hash -> (expiry, username, principal or None)
+        self._entries = collections.OrderedDict()
+
+    def __hash(self, username: str, password: str) -> bytes:
+        return hmac.new(
+            self._key,
+            ('%s\0%s' % (username, password)).encode('utf-8'),
+            hashlib.sha256).digest()
+
+    def get(self, username: str, password: str) \
+            -> Tuple[bool, Optional[AuthPrincipal]]:
+        """
+        Returns tuple (hit, principal). 'principal' is None for cached
+        failed verifications.
+        """
+
+        key = self.__hash(username, password)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return False, None
+
+            if entry[0] <= self._clock():
+                del self._entries[key]
+
+                return False, None
+
+            self._entries.move_to_end(key)
+
+            return True, entry[2]
+
+    def put(self, username: str, password: str,
+            principal: Optional[AuthPrincipal]) -> None:
+        """Cache result of verifying credentials"""
+
+        key = self.__hash(username, password)
+
+        expiry = self._clock() + (
+            self._ttl if principal is not None else self._negative_ttl)
+
+        with self._lock:
+            self._entries[key] = (expiry, username, principal)
+
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, username: Optional[str] = None) -> None:
+        """
+        Remove cached entries for 'username' or all entries if
+        'username' is None
+        """
+
+        with self._lock:
+            if username is None:
+                self._entries.clear()
+
+                return
+
+            for key in [key for key, entry in self._entries.items()
+                        if entry[1] == username]:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
@@ -127,6 +127,7 @@ TORTUGA_NOT_FOUND_ERROR = 120
 TORTUGA_UGE_CLUSTER_NOT_FOUND_ERROR = 121
 TORTUGA_UGE_CLUSTER_ALREADY_EXISTS_ERROR = 122
 TORTUGA_KIT_BUILD_ERROR = 123
+TORTUGA_SERVICE_BUSY_ERROR = 124
 
 exceptionMap = {
     TORTUGA_ERROR: 'exceptions.tortugaException.TortugaException',
@@ -351,8 +352,16 @@ exceptionMap = {
         'exceptions.notFound.NotFound',
     TORTUGA_KIT_BUILD_ERROR:
         'exceptions.kitBuildError.KitBuildError',
+    TORTUGA_SERVICE_BUSY_ERROR:
+        'exceptions.serviceBusy.ServiceBusy',
     TORTUGA_UGE_CLUSTER_NOT_FOUND_ERROR:
         'tortuga_kits.uge_8_5_4.exceptions.ugeClusterNotFound.UgeClusterNotFound',
     TORTUGA_UGE_CLUSTER_ALREADY_EXISTS_ERROR:
         'tortuga_kits.uge_8_5_4.exceptions.ugeClusterAlreadyExists.UgeClusterAlreadyExists',
 }
+
+# Status codes keyed on exception class name ('z' in 'x.y.z'). Built once
+# to map exceptions raised by the web service to status codes.
+exceptionCodeMap = {
+    exStr.rsplit('.', 1)[-1]: code for code, exStr in exceptionMap.items()
+}
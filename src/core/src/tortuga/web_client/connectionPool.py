@@ -0,0 +1,269 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import http.client
+import io
+import logging
+import select
+import ssl
+import threading
+import time
+from typing import Optional
+
+from tortuga.exceptions.invalidArgument import InvalidArgument
+
+
+logger = logging.getLogger('tortuga.web_client.connectionpool')
+logger.addHandler(logging.NullHandler())
+
+# Maximum number of idle connections kept per host
+DEFAULT_MAXSIZE = 4
+
+# Socket timeout (seconds) for connect and read; None blocks indefinitely
+DEFAULT_TIMEOUT = None
+
+# Idle connections older than this (seconds) are closed rather than
+# reused. This should be less than the server keep-alive timeout.
+DEFAULT_IDLE_TIMEOUT = 5
+
+# Requests using these methods may be sent again if the connection fails
+# after the request was sent
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'PUT')
+
+_pools_lock = threading.Lock()
+
+# Connection pools keyed on (scheme, netloc)
+_pools = {}
+
+_pool_options = {
+    'maxsize': DEFAULT_MAXSIZE,
+    'timeout': DEFAULT_TIMEOUT,
+    'idle_timeout': DEFAULT_IDLE_TIMEOUT,
+}
+
+
+class PooledResponse(object):
+    """
+    Fully read HTTP response. The body is buffered so the underlying
+    connection can be returned to the pool immediately.
+    """
+
+    def __init__(self, response: http.client.HTTPResponse, body: bytes):
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+
+        self._body = io.BytesIO(body)
+
+    @property
+    def code(self):
+        return self.status
+
+    def read(self, *args):
+        return self._body.read(*args)
+
+
+class ConnectionPool(object):
+    """
+    Pool of persistent (keep-alive) HTTP/HTTPS connections to one host.
+
+    At most 'maxsize' idle connections are retained; additional
+    connections are created on demand and closed after use.
+    """
+
+    def __init__(self, scheme: str, netloc: str,
+                 maxsize: int = DEFAULT_MAXSIZE,
+                 timeout: Optional[float] = DEFAULT_TIMEOUT,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.scheme = scheme
+        self.netloc = netloc
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+
+        self._lock = threading.Lock()
+
+        # List of (connection, time returned to pool)
+        self._idle = []
+
+        self._ssl_context = None
+
+        if scheme == 'https':
+            self._ssl_context = ssl.create_default_context()
+            self._ssl_context.check_hostname = False
+            self._ssl_context.verify_mode = ssl.CERT_NONE
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(
+                self.netloc, timeout=self.timeout,
+                context=self._ssl_context)
+
+        return http.client.HTTPConnection(self.netloc, timeout=self.timeout)
+
+    def _get_connection(self):
+        """
+        Returns tuple (connection, reused)
+        """
+
+        now = time.monotonic()
+
+        with self._lock:
+            while self._idle:
+                conn, returned = self._idle.pop()
+
+                if now - returned < self.idle_timeout and \
+                        not _is_dropped(conn):
+                    return conn, True
+
+                conn.close()
+
+        return self._new_connection(), False
+
+    def _put_connection(self, conn) -> None:
+        with self._lock:
+            if len(self._idle) < self.maxsize:
+                self._idle.append((conn, time.monotonic()))
+
+                return
+
+        conn.close()
+
+    def request(self, method: str, selector: str, body: bytes = None,
+                headers: Optional[dict] = None) -> PooledResponse:
+        """
+        Send request and return buffered response.
+
+        A request failing on a reused connection (ie. closed by the
+        server while idle) is retried on another connection if it was not
+        sent or its method is idempotent. Otherwise, and for failures on
+        a new connection, the error is raised, since the server may have
+        processed the request.
+
+        Raises:
+            OSError
+            http.client.HTTPException
+        """
+
+        while True:
+            conn, reused = self._get_connection()
+
+            sent = False
+
+            try:
+                conn.request(method, selector, body=body,
+                             headers=headers or {})
+
+                sent = True
+
+                response = conn.getresponse()
+
+                result = PooledResponse(response, response.read())
+            except (OSError, http.client.HTTPException):
+                conn.close()
+
+                if reused and (not sent or
+                               method.upper() in IDEMPOTENT_METHODS):
+                    logger.debug(
+                        'Retrying request on new connection to [%s]' % (
+                            self.netloc))
+
+                    continue
+
+                raise
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._put_connection(conn)
+
+            return result
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+
+        for conn, _ in idle:
+            conn.close()
+
+
+def _is_dropped(conn) -> bool:
+    """
+    Returns True if idle connection was closed by the server. An idle
+    connection is readable only if it was closed (or unexpected data was
+    received).
+    """
+
+    if conn.sock is None:
+        return True
+
+    try:
+        return bool(select.select([conn.sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
+
+
+def configure_pools(**options) -> None:
+    """
+    Set options ('maxsize', 'timeout', 'idle_timeout') for connection
+    pools. Existing pools are closed and recreated with the new options
+    on next use.
+
+    Raises:
+        InvalidArgument
+    """
+
+    for name in options:
+        if name not in _pool_options:
+            raise InvalidArgument(
+                'Invalid connection pool option [%s]' % (name))
+
+    with _pools_lock:
+        _pool_options.update(options)
+
+        pools = list(_pools.values())
+
+        _pools.clear()
+
+    for pool in pools:
+        pool.close()
+
+
+def reserve_pool_size(maxsize: int) -> None:
+    """
+    Ensure connection pools retain at least 'maxsize' idle connections,
+    for callers issuing that many concurrent requests
+    """
+
+    with _pools_lock:
+        _pool_options['maxsize'] = max(_pool_options['maxsize'], maxsize)
+
+        for pool in _pools.values():
+            pool.maxsize = max(pool.maxsize, maxsize)
+
+
+def get_connection_pool(scheme: str, netloc: str) -> ConnectionPool:
+    """
+    Return the process-wide connection pool for the specified host
+    """
+
+    with _pools_lock:
+        pool = _pools.get((scheme, netloc))
+
+        if pool is None:
+            pool = ConnectionPool(scheme, netloc, **_pool_options)
+
+            _pools[(scheme, netloc)] = pool
+
+        return pool
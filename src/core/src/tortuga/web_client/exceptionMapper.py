@@ -12,10 +12,61 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import importlib
+
 from tortuga.utility import tortugaStatus
 from tortuga.exceptions.tortugaException import TortugaException
 
 
+def _get_module_name(exStr):
+    # Exception string is value of the form 'x.y.z' where 'x.y' is
+    # tortuga module (or kit module), and 'z' class in that module
+    exModule, exClass = exStr.rsplit('.', 1)
+
+    if not exModule.startswith('tortuga_kits.'):
+        exModule = 'tortuga.{0}'.format(exModule)
+
+    return exModule, exClass
+
+
+# Module and class names of exceptions keyed on status code
+_exceptionNames = {
+    code: _get_module_name(exStr)
+    for code, exStr in tortugaStatus.exceptionMap.items()
+}
+
+# Exception classes keyed on status code; each module is imported once
+_exceptionClasses = {}
+
+
+def getExceptionClass(code):
+    """
+    Return exception class for tortuga status code. TortugaException is
+    returned for unknown codes and exceptions that cannot be imported
+    (ie. exceptions of kits not installed).
+    """
+
+    _Exception = _exceptionClasses.get(code)
+
+    if _Exception is not None:
+        return _Exception
+
+    _Exception = TortugaException
+
+    if code in _exceptionNames:
+        exModule, exClass = _exceptionNames[code]
+
+        try:
+            _Exception = getattr(
+                importlib.import_module(exModule), exClass)
+        except (ImportError, AttributeError):
+            pass
+
+    _exceptionClasses[code] = _Exception
+
+    return _Exception
+
+
 def checkStatus(httpHeaders):
     """ Map tortuga status code into appropriate exception. """
 
@@ -26,20 +77,9 @@ def checkStatus(httpHeaders):
     if code is None or code == str(tortugaStatus.TORTUGA_OK):
         return
 
-    if int(code) in tortugaStatus.exceptionMap:
-        # Exception string is value of the form 'x.y.z'
-        # where 'x.y' is tortuga module, and 'z' class in that module
-
-        exStr = tortugaStatus.exceptionMap.get(int(code))
-        exClass = exStr.split('.')[-1]  # 'z' in 'x.y.z'
-        exModule = '.'.join(exStr.split('.')[:-1])  # 'x.y' in 'x.y.z'
-
-        temp_ = __import__(
-            'tortuga.{0}'.format(exModule), globals(), locals(),
-            [exClass], 0)
-
-        _Exception = getattr(temp_, exClass)
-
-        raise _Exception(msg)
+    try:
+        code = int(code)
+    except ValueError:
+        raise TortugaException(msg)
 
-    raise TortugaException(msg)
+    raise getExceptionClass(code)(msg)
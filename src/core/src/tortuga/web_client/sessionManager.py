@@ -15,14 +15,14 @@
 # pylint: disable=no-member,maybe-no-member
 
 import logging
-import urllib.request, urllib.error, urllib.parse
 import json
+import threading
 import urllib.parse
 import http.client
-import ssl
 
 from tortuga.exceptions.urlErrorException import UrlErrorException
 from tortuga.exceptions.httpErrorException import HttpErrorException
+from tortuga.web_client import connectionPool
 from tortuga.web_client import exceptionMapper
 
 
@@ -34,6 +34,8 @@ class SessionManager(object):
     def __init__(self):
         """ Initialize session manager instance. """
         self._sessionCookie = None
+        self._token = None
+        self._tokenExpires = None
         self._host = None
         self._logger = logging.getLogger(
             'tortuga.web_client.%s' % (self.__class__.__name__))
@@ -41,13 +43,32 @@ class SessionManager(object):
         self._username = ""
         self._password = ""
 
+        # Serializes re-authentication by threads sharing this session
+        self._lock = threading.Lock()
+
     def setHost(self, host):
         """ Set host. """
         self._host = host
 
     def hasSession(self):
         """ Return true if we have session established. """
-        return self._sessionCookie is not None
+        return self._sessionCookie is not None or self._token is not None
+
+    def getToken(self):
+        """ Return tuple (token, expiry time) for established session """
+        return self._token, self._tokenExpires
+
+    def resumeSession(self, url, username, password, token):
+        """
+        Use previously issued authentication token. Credentials are
+        retained to establish a new session if the token is rejected.
+        """
+
+        self._host = url
+        self._username = username
+        self._password = password
+        self._token = token
+        self._tokenExpires = None
 
     def establishSession(self, url, username, password,
                          selector='/v1/auth/login'):
@@ -58,6 +79,11 @@ class SessionManager(object):
             UrlErrorException
         """
 
+        with self._lock:
+            self.__login(url, username, password, selector)
+
+    def __login(self, url, username, password,
+                selector='/v1/auth/login'):
         self._host = url
         self._username = username
         self._password = password
@@ -71,20 +97,35 @@ class SessionManager(object):
             'password': password,
         }
 
+        # Do not send stale credentials with the login request. The
+        # current credentials remain in use by other threads until the
+        # new session is established.
         try:
-            response, _ = self.sendRequest(
-                url='%s%s' % (url, selector),
-                method='POST',
-                data=json.dumps(data))
-        except urllib.error.URLError as ex:
+            response = self.__send(
+                '%s%s' % (url, selector), 'POST', 'application/json',
+                json.dumps(data), 'application/json', (None, None))
+        except UrlErrorException:
             self._logger.exception('Establish session raised exception')
 
-            raise UrlErrorException(exception=ex)
+            raise
+
+        response, responseDict = self.__handle_response(response)
 
-        self._sessionCookie = response.headers['Set-Cookie']
+        if isinstance(responseDict, dict) and 'token' in responseDict:
+            # Use bearer token in favour of session cookie
+            self._token = responseDict['token']
+            self._tokenExpires = responseDict.get('expires')
+            self._sessionCookie = None
+        else:
+            self._sessionCookie = response.headers['Set-Cookie']
+            self._token = None
+            self._tokenExpires = None
 
         exceptionMapper.checkStatus(response.headers)
 
+    def __get_credentials(self):
+        return self._token, self._sessionCookie
+
     def _response_handler(self, response): \
             # pylint: disable=no-self-use
         # 'checkStatus()' raises TortugaException-derived exception if API
@@ -114,60 +155,79 @@ class SessionManager(object):
         if not u.scheme and not u.netloc:
             url = '%s/%s' % (self._host, url)
 
-        self._logger.debug('sendRequest(): url=[%s]' % (url))
+        credentials = self.__get_credentials()
 
-        request = urllib.request.Request(url, data=data.encode())
-        request.get_method = lambda: method
+        response = self.__send(
+            url, method, contentType, data, acceptType, credentials)
 
-        contentLength = len(data) if data else 0
+        if response.status == http.client.UNAUTHORIZED and \
+                self._host is not None:
+            with self._lock:
+                # Only the first thread to see the rejected credentials
+                # logs in again; others retry with the new session
+                if self.__get_credentials() == credentials:
+                    self.__login(self._host, self._username, self._password)
 
-        request.add_header('Content-Length', str(contentLength))
+                credentials = self.__get_credentials()
 
-        if method != 'GET':
-            request.add_header('Content-Type', contentType)
+            response = self.__send(
+                url, method, contentType, data, acceptType, credentials)
 
-        if acceptType:
-            request.add_header('Accept', acceptType)
+        return self.__handle_response(response)
 
-        if self._sessionCookie is not None:
-            request.add_header('Cookie', self._sessionCookie)
+    def __send(self, url, method, contentType, data, acceptType,
+               credentials):
+        self._logger.debug('sendRequest(): url=[%s]' % (url))
 
-        # Check if SSL certificate verification is available
-        if not hasattr(ssl, 'create_default_context'):
-            ssl_handler = urllib.request.HTTPSHandler()
-        else:
-            ctx = ssl.create_default_context()
-            ctx.check_hostname = False
-            ctx.verify_mode = ssl.CERT_NONE
+        body = data.encode() if data else b''
 
-            ssl_handler = urllib.request.HTTPSHandler(context=ctx)
+        headers = {
+            'Content-Length': str(len(body)),
+        }
 
-        try:
-            opener = urllib.request.build_opener(ssl_handler)
+        if method != 'GET':
+            headers['Content-Type'] = contentType
 
-            response = opener.open(request)
+        if acceptType:
+            headers['Accept'] = acceptType
 
-            return self._response_handler(response)
-        except urllib.error.HTTPError as ex:
-            if ex.code == http.client.UNAUTHORIZED and self._host is not None:
-                self.establishSession(
-                    self._host, self._username, self._password)
+        token, sessionCookie = credentials
 
-                return self.sendRequest(url, method, contentType, data)
+        if token is not None:
+            headers['Authorization'] = 'Bearer %s' % (token)
+        elif sessionCookie is not None:
+            headers['Cookie'] = sessionCookie
 
-            if ex.code == http.client.INTERNAL_SERVER_ERROR:
-                raise HttpErrorException('Internal server error')
+        u = urllib.parse.urlparse(url)
 
-            if ex.code == http.client.BAD_REQUEST:
-                self._response_handler(ex)
+        selector = u.path or '/'
 
-                raise HttpErrorException('Invalid request (bad arguments?)')
+        if u.query:
+            selector += '?' + u.query
 
-            return self._response_handler(ex)
-        except urllib.error.URLError as ex:
+        try:
+            # Connections are kept alive and shared by all session
+            # managers in this process
+            return connectionPool.get_connection_pool(
+                u.scheme, u.netloc).request(
+                    method, selector, body=body, headers=headers)
+        except (OSError, http.client.HTTPException) as ex:
             # For example, "connection refused", et al.
             raise UrlErrorException(exception=ex)
 
+    def __handle_response(self, response):
+        if response.status < 400:
+            return self._response_handler(response)
+
+        if response.status == http.client.INTERNAL_SERVER_ERROR:
+            raise HttpErrorException('Internal server error')
+
+        if response.status == http.client.BAD_REQUEST:
+            self._response_handler(response)
+
+            raise HttpErrorException('Invalid request (bad arguments?)')
+
+        return self._response_handler(response)
 
 def createSession():
     return SessionManager()
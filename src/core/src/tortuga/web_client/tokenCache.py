@@ -0,0 +1,113 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Optional
+
+
+class TokenCache(object):
+    """
+    Persistent cache of web service authentication tokens, shared by
+    CLI invocations of the same user.
+
+    Tokens are keyed on the web service URL and username; the file is
+    only readable by its owner. No function of the password is stored.
+    A token rejected by the web service (ie. after the password was
+    changed) is replaced by logging in again.
+    """
+
+    # Tokens expiring within this number of seconds are not reused
+    EXPIRY_MARGIN = 60
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path or os.path.join(
+            os.path.expanduser('~'), '.tortuga', 'token_cache.json')
+
+        self._logger = logging.getLogger(
+            'tortuga.web_client.%s' % (self.__class__.__name__))
+        self._logger.addHandler(logging.NullHandler())
+
+    @staticmethod
+    def __get_key(url: str, username: str) -> str:
+        return json.dumps([url, username])
+
+    def __load(self) -> dict:
+        try:
+            with open(self._path) as fp:
+                tokens = json.load(fp)
+        except (OSError, ValueError):
+            return {}
+
+        return tokens if isinstance(tokens, dict) else {}
+
+    def __save(self, tokens: dict) -> None:
+        dirname = os.path.dirname(self._path)
+
+        try:
+            os.makedirs(dirname, mode=0o700, exist_ok=True)
+
+            fd, tmpfile = tempfile.mkstemp(dir=dirname)
+
+            try:
+                with os.fdopen(fd, 'w') as fp:
+                    json.dump(tokens, fp)
+
+                os.rename(tmpfile, self._path)
+            except Exception:
+                os.unlink(tmpfile)
+
+                raise
+        except OSError as exc:
+            # Caching is optional; ignore unwritable home directory
+            self._logger.debug(
+                'Unable to write token cache [%s]: %s' % (self._path, exc))
+
+    def get(self, url: str, username: str) -> Optional[str]:
+        """
+        Return cached token or None if no valid token is cached
+        """
+
+        entry = self.__load().get(self.__get_key(url, username))
+
+        if not isinstance(entry, dict) or \
+                entry.get('expires', 0) - self.EXPIRY_MARGIN <= time.time():
+            return None
+
+        return entry.get('token')
+
+    def put(self, url: str, username: str, token: str,
+            expires: int) -> None:
+        now = time.time()
+
+        # Drop expired entries while updating the cache
+        tokens = {key: entry for key, entry in self.__load().items()
+                  if isinstance(entry, dict) and
+                  entry.get('expires', 0) > now}
+
+        tokens[self.__get_key(url, username)] = {
+            'token': token,
+            'expires': expires,
+        }
+
+        self.__save(tokens)
+
+    def remove(self, url: str, username: str) -> None:
+        tokens = self.__load()
+
+        if tokens.pop(self.__get_key(url, username), None):
+            self.__save(tokens)
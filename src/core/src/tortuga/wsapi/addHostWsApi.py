@@ -62,13 +62,18 @@ class AddHostWsApi(TortugaWsApi):
         except Exception as ex:
             raise TortugaException(exception=ex)
 
-    def getStatus(self, session=None, startMessage=0, getNodes=False):
+    def getStatus(self, session=None, startMessage=0, getNodes=False,
+                  wait=None, nodeCursor=None):
         """
         Get the status of addhost...if session is non-none get info for that
         session only.  Startmessage controls the number of removed from
         the start of the server side message list.  If getNodes is true
         also include the nodes for this session.
 
+        If wait is specified, the server waits up to 'wait' seconds for
+        new messages. If nodeCursor (the node cursor of the previous
+        status) is specified, only nodes added since are returned.
+
         Returns:
             AddHostStatus object
         Throws:
@@ -81,6 +86,12 @@ class AddHostWsApi(TortugaWsApi):
         url += '?startMessage={0}&getNodes={1}'.format(
             startMessage, str(getNodes))
 
+        if wait:
+            url += '&wait={0}'.format(wait)
+
+        if nodeCursor is not None:
+            url += '&nodeCursor={0}'.format(nodeCursor)
+
         try:
             _, responseDict = self.sendSessionRequest(url)
 
@@ -0,0 +1,175 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+asyncio variants of the Tortuga web service APIs.
+
+Each Async*WsApi exposes the public methods of the corresponding
+synchronous *WsApi class as coroutines. Requests run on a thread pool
+shared by all instances and use the process-wide keep-alive connection
+pool, so many requests may be issued concurrently from one event loop:
+
+    api = AsyncNodeWsApi(concurrency=64)
+
+    nodes = await asyncio.gather(
+        *[api.getNode(name) for name in names])
+
+'concurrency' bounds the number of requests an instance has in flight;
+additional calls wait for a free slot.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import threading
+
+from tortuga.web_client import connectionPool
+from tortuga.wsapi.addHostWsApi import AddHostWsApi
+from tortuga.wsapi.hardwareProfileWsApi import HardwareProfileWsApi
+from tortuga.wsapi.nodeWsApi import NodeWsApi
+from tortuga.wsapi.softwareProfileWsApi import SoftwareProfileWsApi
+
+
+# Default maximum number of concurrent requests for each API instance
+DEFAULT_CONCURRENCY = 32
+
+# Maximum number of threads in the shared executor
+MAX_WORKERS = 256
+
+_executor_lock = threading.Lock()
+
+_executor = None
+
+
+def get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """
+    Return thread pool shared by all asynchronous API instances
+    """
+
+    global _executor  # pylint: disable=global-statement
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=MAX_WORKERS)
+
+        return _executor
+
+
+class AsyncTortugaWsApi(object):
+    """
+    Base class for asynchronous web service APIs. Subclasses set
+    'api_class' to the synchronous API being wrapped.
+    """
+
+    api_class = None
+
+    def __init__(self, username=None, password=None,
+                 concurrency=DEFAULT_CONCURRENCY, executor=None):
+        self._api = self.api_class(username=username, password=password)
+
+        self._concurrency = concurrency
+
+        self._executor = executor
+
+        # Created on first use so they are bound to the running loop
+        self._semaphore = None
+        self._session_lock = None
+        self._session_established = False
+
+        # Keep a connection per concurrent request
+        connectionPool.reserve_pool_size(concurrency)
+
+    def __get_semaphore(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+            self._session_lock = asyncio.Lock()
+
+        return self._semaphore
+
+    async def _run(self, func, *args, **kwargs):
+        """
+        Call 'func' on the executor once a concurrency slot is available
+        """
+
+        loop = asyncio.get_event_loop()
+
+        executor = self._executor or get_executor()
+
+        semaphore = self.__get_semaphore()
+
+        if not self._session_established:
+            async with self._session_lock:
+                # Authenticate once rather than in every concurrent request
+                if not self._session_established:
+                    await loop.run_in_executor(
+                        executor, self._api.establishSession)
+
+                    self._session_established = True
+
+        async with semaphore:
+            return await loop.run_in_executor(
+                executor, functools.partial(func, *args, **kwargs))
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        func = getattr(self._api, name)
+
+        if not callable(func):
+            raise AttributeError(name)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await self._run(func, *args, **kwargs)
+
+        return wrapper
+
+    def getSyncApi(self):
+        """Return the wrapped synchronous API instance"""
+        return self._api
+
+
+class AsyncNodeWsApi(AsyncTortugaWsApi):
+    api_class = NodeWsApi
+
+    async def iterNodeList(self, **kwargs):
+        """
+        Asynchronous generator of nodes; pages are fetched on demand
+        """
+
+        nodes = self._api.iterNodeList(**kwargs)
+
+        sentinel = object()
+
+        while True:
+            node = await self._run(next, nodes, sentinel)
+
+            if node is sentinel:
+                break
+
+            yield node
+
+
+class AsyncSoftwareProfileWsApi(AsyncTortugaWsApi):
+    api_class = SoftwareProfileWsApi
+
+
+class AsyncHardwareProfileWsApi(AsyncTortugaWsApi):
+    api_class = HardwareProfileWsApi
+
+
+class AsyncAddHostWsApi(AsyncTortugaWsApi):
+    api_class = AddHostWsApi
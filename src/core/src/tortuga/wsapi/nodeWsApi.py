@@ -32,21 +32,61 @@ class NodeWsApi(TortugaWsApi, NodeApiInterface): \
     Node WS API class.
     """
 
-    def getNodeList(self, tags=None):
+    # Number of nodes requested per page by iterNodeList()
+    NODE_LIST_PAGE_SIZE = 500
+
+    def getNodeList(self, tags=None, limit=None, after=None):
         """
         Get list of nodes
 
+        If 'limit' and/or 'after' are specified, only the requested page
+        is returned, otherwise all pages are retrieved.
+
             Returns:
                a list of nodes
             Throws:
                 TortugaException
         """
 
+        if limit is not None or after is not None:
+            nodeList, _ = self.__getNodeListPage(tags, limit, after)
+
+            return nodeList
+
+        return TortugaObjectList(self.iterNodeList(tags=tags))
+
+    def iterNodeList(self, tags=None, page_size=None):
+        """
+        Generator returning all nodes, retrieving the node list from the
+        web service one page at a time.
+
+            Throws:
+                TortugaException
+        """
+
+        after = None
+
+        while True:
+            nodeList, after = self.__getNodeListPage(
+                tags, page_size or self.NODE_LIST_PAGE_SIZE, after)
+
+            for node in nodeList:
+                yield node
+
+            if after is None:
+                break
+
+    def __getNodeListPage(self, tags, limit, after):
+        """
+        Returns tuple of (list of nodes, cursor for next page). The cursor
+        is None when there are no further pages.
+        """
+
         url = 'v1/nodes'
 
-        if tags:
-            params = []
+        params = []
 
+        if tags:
             for key, value in tags.items():
                 if value is None:
                     params.append(urllib.parse.urlencode({'tag': key}))
@@ -55,8 +95,14 @@ class NodeWsApi(TortugaWsApi, NodeApiInterface): \
                         urllib.parse.urlencode({'tag': '{0}={1}'.format(
                             key, value)}))
 
-            if params:
-                url += '?' + '&'.join(params)
+        if limit is not None:
+            params.append(urllib.parse.urlencode({'limit': limit}))
+
+        if after is not None:
+            params.append(urllib.parse.urlencode({'after': after}))
+
+        if params:
+            url += '?' + '&'.join(params)
 
         try:
             _, responseDict = self.sendSessionRequest(url)
@@ -74,7 +120,8 @@ class NodeWsApi(TortugaWsApi, NodeApiInterface): \
 
                 nodeList.append(node)
 
-            return nodeList
+            # Servers without paging support do not return 'next'
+            return nodeList, responseDict.get('next')
         except TortugaException:
             raise
         except Exception as ex:
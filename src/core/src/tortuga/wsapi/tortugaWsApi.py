@@ -18,6 +18,7 @@ import logging
 from urllib.parse import urlparse
 
 from tortuga.web_client import sessionManager
+from tortuga.web_client.tokenCache import TokenCache
 from tortuga.config.configManager import ConfigManager
 from tortuga.exceptions.userNotAuthorized import UserNotAuthorized
 
@@ -44,6 +45,7 @@ class TortugaWsApi:
         self._username = username
         self._password = password
         self._sm = None
+        self._cachedToken = None
 
     def _getWsUrl(self, url):
         """Extract scheme and net location from provided url. Use defaults
@@ -72,11 +74,10 @@ class TortugaWsApi:
         """ Return configmanager reference """
         return self._cm
 
-    def sendSessionRequest(self, url, method='GET',
-                           contentType='application/json', data='',
-                           acceptType='application/json'):
+    def establishSession(self, url=''):
         """
-        Send authorized session request
+        Establish authenticated session with the web service, if not
+        already established
 
         Raises:
             UserNotAuthorized
@@ -84,22 +85,61 @@ class TortugaWsApi:
 
         sm = self._getSessionManager()
 
-        if not sm.hasSession():
-            if self._username is None:
-                raise UserNotAuthorized('Username not supplied')
+        if sm.hasSession():
+            return
 
-            if self._password is None:
-                raise UserNotAuthorized('Password not supplied')
+        if self._username is None:
+            raise UserNotAuthorized('Username not supplied')
 
-            wsUrl = self._getWsUrl(url)
+        if self._password is None:
+            raise UserNotAuthorized('Password not supplied')
 
+        wsUrl = self._getWsUrl(url)
+
+        # Reuse token issued to a previous invocation
+        token = TokenCache().get(wsUrl, self._username)
+
+        if token:
+            sm.resumeSession(wsUrl, self._username, self._password, token)
+        else:
             # establishSession() sets the 'wsUrl' so the explicit call
             # to setHost() is not required
             sm.establishSession(wsUrl, self._username, self._password)
 
-        return sm.sendRequest(
+            self.__cacheToken(sm, url)
+
+    def sendSessionRequest(self, url, method='GET',
+                           contentType='application/json', data='',
+                           acceptType='application/json'):
+        """
+        Send authorized session request
+
+        Raises:
+            UserNotAuthorized
+        """
+
+        self.establishSession(url)
+
+        sm = self._getSessionManager()
+
+        result = sm.sendRequest(
             url, method, contentType, data, acceptType=acceptType)
 
+        self.__cacheToken(sm, url)
+
+        return result
+
+    def __cacheToken(self, sm, url):
+        """Persist token issued by the web service for later invocations"""
+
+        token, expires = sm.getToken()
+
+        if token and expires and token != self._cachedToken:
+            TokenCache().put(
+                self._getWsUrl(url), self._username, token, expires)
+
+            self._cachedToken = token
+
     def sendRequest(self, url, method='GET',
                     contentType='application/json', data='',
                     acceptType='application/json'):
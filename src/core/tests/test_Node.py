@@ -15,8 +15,10 @@
 # pylint: disable=no-member,relative-import
 
 import json
+from types import SimpleNamespace
 import pytest
 from tortuga.objects.node import Node
+from tortuga.objects.tortugaObject import TortugaObjectList
 
 
 @pytest.fixture
@@ -38,6 +40,36 @@ def test_getFromDbDict():
     assert tmpnode.getName() == 'mike'
 
 
+def test_getFromDbDict_profile_cache():
+    dbHardwareProfile = SimpleNamespace(
+        id=1, name='LocalIron', resourceadapter=None)
+    dbSoftwareProfile = SimpleNamespace(id=1, name='Compute')
+
+    profile_cache = {}
+
+    nodes = TortugaObjectList([
+        Node.getFromDbDict({
+            'id': index,
+            'name': 'compute-%02d' % (index),
+            'hardwareprofile': dbHardwareProfile,
+            'softwareprofile': dbSoftwareProfile,
+        }, profile_cache=profile_cache) for index in range(3)
+    ])
+
+    # Profiles are converted once and shared by all nodes
+    assert len(profile_cache) == 2
+
+    assert nodes[0].getHardwareProfile() is nodes[2].getHardwareProfile()
+    assert nodes[0].getSoftwareProfile() is nodes[2].getSoftwareProfile()
+
+    assert nodes[2].getHardwareProfile().getName() == 'LocalIron'
+    assert nodes[2].getSoftwareProfile().getName() == 'Compute'
+
+    # Serialized output is unchanged by sharing profile objects
+    assert json.loads(json.dumps(nodes.getCleanDict())) == [
+        node.getCleanDict() for node in nodes]
+
+
 def test_repr(node):
     assert str(node) == 'testnode'
 
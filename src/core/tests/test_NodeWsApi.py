@@ -5,3 +5,32 @@ def test_instantiation():
     obj = NodeWsApi()
 
     assert obj
+
+
+def test_iterNodeList_pages(monkeypatch):
+    pages = {
+        None: {'nodes': [{'name': 'compute-01'}, {'name': 'compute-02'}],
+               'next': 'compute-02'},
+        'compute-02': {'nodes': [{'name': 'compute-03'}]},
+    }
+
+    requests = []
+
+    def sendSessionRequest(self, url, **kwargs):
+        requests.append(url)
+
+        after = url.split('after=', 1)[1] if 'after=' in url else None
+
+        return None, pages[after]
+
+    monkeypatch.setattr(NodeWsApi, 'sendSessionRequest', sendSessionRequest)
+
+    nodes = NodeWsApi().iterNodeList(page_size=2)
+
+    assert [node.getName() for node in nodes] == \
+        ['compute-01', 'compute-02', 'compute-03']
+
+    assert requests == [
+        'v1/nodes?limit=2',
+        'v1/nodes?limit=2&after=compute-02',
+    ]
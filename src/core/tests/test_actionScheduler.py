@@ -0,0 +1,118 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import pytest
+from tortuga.kit.actions.actionScheduler import get_dependencies, \
+    run_component_actions
+
+
+class ComponentInstaller(object):
+    def __init__(self, name, log, parallel_safe=True, run_after=None,
+                 delay=0.0, error=None):
+        self.name = name
+        self.parallel_safe = parallel_safe
+        self.run_after = run_after or []
+
+        self._log = log
+        self._delay = delay
+        self._error = error
+
+    def run_action(self, action_name, *args, **kwargs):
+        self._log.append(('start', self.name))
+
+        time.sleep(self._delay)
+
+        self._log.append(('end', self.name))
+
+        if self._error:
+            raise self._error
+
+
+def test_dependencies():
+    log = []
+
+    component_installers = [
+        ComponentInstaller('dhcpd', log),
+        ComponentInstaller('dns', log),
+        ComponentInstaller('installer', log, run_after=['dhcpd', 'dns']),
+        ComponentInstaller('thirdparty', log, parallel_safe=False),
+        ComponentInstaller('ssh', log),
+    ]
+
+    assert get_dependencies(component_installers) == [
+        set(), set(), {0, 1}, {0, 1, 2}, {3}]
+
+
+def test_conflicting_dependencies():
+    log = []
+
+    component_installers = [
+        ComponentInstaller('a', log, run_after=['b']),
+        ComponentInstaller('b', log, run_after=['a']),
+    ]
+
+    assert get_dependencies(component_installers) == [set(), {0}]
+
+
+def test_run_component_actions():
+    log = []
+
+    component_installers = [
+        ComponentInstaller('dhcpd', log, delay=0.2),
+        ComponentInstaller('dns', log, delay=0.2),
+        ComponentInstaller('installer', log, run_after=['dhcpd', 'dns']),
+        ComponentInstaller('thirdparty', log, parallel_safe=False),
+    ]
+
+    start = time.monotonic()
+
+    run_component_actions(component_installers, 'add_host', max_workers=4)
+
+    # dhcpd and dns run concurrently
+    assert time.monotonic() - start < 0.35
+
+    assert set(log[:2]) == {('start', 'dhcpd'), ('start', 'dns')}
+    assert log[4:] == [('start', 'installer'), ('end', 'installer'),
+                       ('start', 'thirdparty'), ('end', 'thirdparty')]
+
+
+def test_run_component_actions_error():
+    log = []
+
+    component_installers = [
+        ComponentInstaller('dhcpd', log, error=ValueError('failed')),
+        ComponentInstaller('dns', log, delay=0.1),
+        ComponentInstaller('installer', log, run_after=['dhcpd', 'dns']),
+    ]
+
+    with pytest.raises(ValueError):
+        run_component_actions(component_installers, 'add_host',
+                              max_workers=4)
+
+    # Running actions complete; dependent actions are not started
+    assert ('end', 'dns') in log
+    assert ('start', 'installer') not in log
+
+
+def test_run_component_actions_sequential():
+    log = []
+
+    component_installers = [
+        ComponentInstaller(name, log) for name in ('a', 'b', 'c')]
+
+    run_component_actions(component_installers, 'add_host')
+
+    assert log == [('start', 'a'), ('end', 'a'), ('start', 'b'),
+                   ('end', 'b'), ('start', 'c'), ('end', 'c')]
@@ -0,0 +1,85 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+import time
+from tortuga.objects.node import Node
+from tortuga.wsapi.asyncWsApi import AsyncNodeWsApi
+from tortuga.wsapi.nodeWsApi import NodeWsApi
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_bounded_concurrency(monkeypatch):
+    lock = threading.Lock()
+
+    state = {'active': 0, 'max_active': 0, 'sessions': 0}
+
+    def establishSession(self, url=''):
+        state['sessions'] += 1
+
+    def getNode(self, name, optionDict=None):
+        with lock:
+            state['active'] += 1
+            state['max_active'] = max(state['max_active'], state['active'])
+
+        time.sleep(0.01)
+
+        with lock:
+            state['active'] -= 1
+
+        return Node(name)
+
+    monkeypatch.setattr(NodeWsApi, 'establishSession', establishSession)
+    monkeypatch.setattr(NodeWsApi, 'getNode', getNode)
+
+    api = AsyncNodeWsApi('admin', 'password', concurrency=4)
+
+    names = ['compute-%02d' % (index) for index in range(20)]
+
+    async def get_nodes():
+        return await asyncio.gather(*[api.getNode(name) for name in names])
+
+    nodes = run(get_nodes())
+
+    assert [node.getName() for node in nodes] == names
+
+    assert 1 < state['max_active'] <= 4
+
+    # Session is established once for all concurrent requests
+    assert state['sessions'] == 1
+
+
+def test_iterNodeList(monkeypatch):
+    def iterNodeList(self, **kwargs):
+        for name in ['compute-01', 'compute-02']:
+            yield Node(name)
+
+    monkeypatch.setattr(NodeWsApi, 'establishSession', lambda self: None)
+    monkeypatch.setattr(NodeWsApi, 'iterNodeList', iterNodeList)
+
+    api = AsyncNodeWsApi('admin', 'password')
+
+    async def collect():
+        return [node.getName() async for node in api.iterNodeList()]
+
+    assert run(collect()) == ['compute-01', 'compute-02']
@@ -0,0 +1,93 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import crypt
+import pytest
+from tortuga.config.configManager import ConfigManager
+from tortuga.types.singleton import SingletonType
+from tortuga.utility import authManager
+from tortuga.utility.authManager import AuthManager
+
+
+class Admin(object):
+    def __init__(self, admin_id, username, password):
+        self._id = admin_id
+        self._username = username
+        self._password = crypt.crypt(password, '$1$')
+
+    def getId(self):
+        return self._id
+
+    def getUsername(self):
+        return self._username
+
+    def getPassword(self):
+        return self._password
+
+
+class AdminApi(object):
+    def __init__(self):
+        self.admins = {}
+
+    def getAdminList(self):
+        return list(self.admins.values())
+
+
+@pytest.fixture
+def admin_api(tmpdir, monkeypatch):
+    api = AdminApi()
+
+    api.admins['admin'] = Admin(1, 'admin', 'password')
+
+    monkeypatch.setattr(authManager, 'getAdminApi', lambda: api)
+    monkeypatch.setattr(ConfigManager, 'isInstaller', lambda self: True)
+    monkeypatch.setattr(ConfigManager, 'getRoot', lambda self: str(tmpdir))
+
+    yield api
+
+    SingletonType._instances.pop(AuthManager, None)
+
+
+def new_auth_manager():
+    # One instance per process
+    SingletonType._instances.pop(AuthManager, None)
+
+    return AuthManager()
+
+
+def test_invalidate_principals(admin_api):
+    worker = new_auth_manager()
+
+    assert worker.verifyCredentials('admin', 'password') is not None
+    assert worker.verifyCredentials('other', 'password') is None
+
+    # Admins changed by another process
+    admin_api.admins['admin'] = Admin(1, 'admin', 'changed')
+    admin_api.admins['other'] = Admin(2, 'other', 'password')
+
+    new_auth_manager().invalidatePrincipals()
+
+    assert worker.verifyCredentials('admin', 'password') is None
+    assert worker.verifyCredentials('admin', 'changed') is not None
+    assert worker.verifyCredentials('other', 'password') is not None
+
+    del admin_api.admins['other']
+
+    new_auth_manager().invalidatePrincipals()
+
+    # Bearer tokens of deleted admins are rejected
+    assert worker.getCurrentPrincipal('other') is None
+    assert worker.getCurrentPrincipal('admin').getAttributes()['id'] == 1
+
+    assert worker.verifyCredentials('other', 'password') is None
@@ -0,0 +1,178 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+import pytest
+from tortuga.kit.actions.configRegenerator import ConfigRegenerator
+
+
+class ComponentInstaller(object):
+    def __init__(self, name, error=None, failures=None):
+        self.name = name
+        self.regenerated = []
+
+        self._error = error
+        self._failures = failures
+        self._event = threading.Event()
+
+    def regenerate(self):
+        self.regenerated.append(time.monotonic())
+
+        self._event.set()
+
+        if self._error and (self._failures is None or
+                            len(self.regenerated) <= self._failures):
+            raise self._error
+
+    def wait(self, timeout):
+        return self._event.wait(timeout)
+
+
+def test_quiet_period():
+    regenerator = ConfigRegenerator(quiet_period=0.2, max_delay=5)
+
+    component_installer = ComponentInstaller('dns')
+
+    for _ in range(5):
+        regenerator.mark_dirty(component_installer)
+
+        time.sleep(0.05)
+
+    assert not component_installer.regenerated
+
+    assert component_installer.wait(2)
+
+    time.sleep(0.3)
+
+    assert len(component_installer.regenerated) == 1
+
+
+def test_max_delay():
+    regenerator = ConfigRegenerator(quiet_period=0.2, max_delay=0.5)
+
+    component_installer = ComponentInstaller('dns')
+
+    start = time.monotonic()
+
+    # Changes requested more often than the quiet period
+    while not component_installer.regenerated and \
+            time.monotonic() - start < 2:
+        regenerator.mark_dirty(component_installer)
+
+        time.sleep(0.05)
+
+    assert component_installer.regenerated
+
+    assert component_installer.regenerated[0] - start < 1
+
+
+def test_flush():
+    regenerator = ConfigRegenerator(quiet_period=60, max_delay=60)
+
+    component_installers = [
+        ComponentInstaller('dhcpd'), ComponentInstaller('dns')]
+
+    for component_installer in component_installers:
+        regenerator.mark_dirty(component_installer)
+        regenerator.mark_dirty(component_installer)
+
+    regenerator.flush()
+
+    assert [len(component_installer.regenerated)
+            for component_installer in component_installers] == [1, 1]
+
+    # Nothing left to regenerate
+    regenerator.flush()
+
+    assert [len(component_installer.regenerated)
+            for component_installer in component_installers] == [1, 1]
+
+
+def test_flush_error():
+    regenerator = ConfigRegenerator(quiet_period=60, max_delay=60)
+
+    component_installers = [
+        ComponentInstaller('dhcpd', error=ValueError('failed')),
+        ComponentInstaller('dns')]
+
+    for component_installer in component_installers:
+        regenerator.mark_dirty(component_installer)
+
+    with pytest.raises(ValueError):
+        regenerator.flush()
+
+    # Remaining components are regenerated
+    assert component_installers[1].regenerated
+
+    # Failed component remains pending
+    with pytest.raises(ValueError):
+        regenerator.flush()
+
+    assert [len(component_installer.regenerated)
+            for component_installer in component_installers] == [2, 1]
+
+
+def test_retry():
+    regenerator = ConfigRegenerator(
+        quiet_period=0.05, max_delay=5, retry_base=0.1, retry_max=0.2)
+
+    component_installer = ComponentInstaller(
+        'dhcpd', error=ValueError('failed'), failures=2)
+
+    regenerator.mark_dirty(component_installer)
+
+    # Retried without being marked dirty again
+    start = time.monotonic()
+
+    while len(component_installer.regenerated) < 3 and \
+            time.monotonic() - start < 5:
+        time.sleep(0.05)
+
+    assert len(component_installer.regenerated) == 3
+
+    # Backoff between retries
+    assert component_installer.regenerated[2] - \
+        component_installer.regenerated[1] >= 0.2
+
+    time.sleep(0.5)
+
+    # No further retries once regenerated successfully
+    assert len(component_installer.regenerated) == 3
+
+
+def test_retry_marked_while_failing():
+    regenerator = ConfigRegenerator(
+        quiet_period=60, max_delay=60, retry_base=60, retry_max=60)
+
+    component_installer = ComponentInstaller('dns')
+
+    # Component requests regeneration of changes it failed to apply
+    def regenerate():
+        regenerator.mark_dirty(component_installer)
+
+        raise ValueError('failed')
+
+    component_installer.regenerate = regenerate
+
+    regenerator.mark_dirty(component_installer)
+
+    with pytest.raises(ValueError):
+        regenerator.flush()
+
+    # Retried after the backoff delay rather than the quiet period
+    with regenerator._cond:  # pylint: disable=protected-access
+        assert not regenerator._dirty  # pylint: disable=protected-access
+        assert component_installer in \
+            regenerator._failed  # pylint: disable=protected-access
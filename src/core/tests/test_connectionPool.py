@@ -0,0 +1,170 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import http.client
+import http.server
+import threading
+import pytest
+from tortuga.exceptions.invalidArgument import InvalidArgument
+from tortuga.web_client.connectionPool import ConnectionPool, \
+    DEFAULT_MAXSIZE, DEFAULT_TIMEOUT, configure_pools, get_connection_pool
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args): \
+            # pylint: disable=arguments-differ
+        pass
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self.server.clients.add(self.client_address)
+
+        self.server.requests.append(('GET', self.path))
+
+        if self.path == '/drop-once' and \
+                self.server.requests.count(('GET', self.path)) == 1:
+            # Close connection after receiving the request
+            self.close_connection = True
+
+            return
+
+        body = self.path.encode()
+
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+
+        if self.path == '/close':
+            self.send_header('Connection', 'close')
+
+        self.end_headers()
+
+        self.wfile.write(body)
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self.rfile.read(int(self.headers['Content-Length']))
+
+        self.server.requests.append(('POST', self.path))
+
+        self.close_connection = True
+
+
+@pytest.fixture
+def server():
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    httpd.clients = set()
+    httpd.requests = []
+
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,),
+                              daemon=True)
+    thread.start()
+
+    yield httpd
+
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get_netloc(server):
+    return '127.0.0.1:%d' % (server.server_address[1])
+
+
+def test_request_reuses_connection(server):
+    pool = ConnectionPool('http', get_netloc(server))
+
+    for index in range(5):
+        response = pool.request('GET', '/node-%d' % (index))
+
+        assert response.status == 200
+        assert response.read() == b'/node-%d' % (index)
+
+    # All requests were sent on a single connection
+    assert len(server.clients) == 1
+
+    pool.close()
+
+
+def test_request_connection_close(server):
+    pool = ConnectionPool('http', get_netloc(server))
+
+    pool.request('GET', '/close')
+    pool.request('GET', '/close')
+
+    assert len(server.clients) == 2
+
+
+def test_request_retry_stale_connection(server):
+    pool = ConnectionPool('http', get_netloc(server))
+
+    pool.request('GET', '/')
+
+    # Simulate server closing the idle keep-alive connection
+    for conn, _ in pool._idle:  # pylint: disable=protected-access
+        conn.sock.close()
+
+    assert pool.request('GET', '/retry').read() == b'/retry'
+
+
+def test_request_retry_idempotent(server):
+    pool = ConnectionPool('http', get_netloc(server))
+
+    pool.request('GET', '/')
+
+    # Connection is closed after the request was sent
+    assert pool.request('GET', '/drop-once').read() == b'/drop-once'
+
+    assert server.requests.count(('GET', '/drop-once')) == 2
+
+
+def test_request_no_retry_after_send(server):
+    pool = ConnectionPool('http', get_netloc(server))
+
+    pool.request('GET', '/')
+
+    # Request may have been processed by the server, so is not sent again
+    with pytest.raises((OSError, http.client.HTTPException)):
+        pool.request('POST', '/nodes', body=b'{}')
+
+    assert server.requests.count(('POST', '/nodes')) == 1
+
+
+def test_idle_timeout(server):
+    pool = ConnectionPool('http', get_netloc(server), idle_timeout=0)
+
+    pool.request('GET', '/')
+    pool.request('GET', '/')
+
+    assert len(server.clients) == 2
+
+
+def test_get_connection_pool():
+    try:
+        configure_pools(maxsize=2, timeout=10)
+
+        pool = get_connection_pool('https', 'installer:8443')
+
+        assert pool is get_connection_pool('https', 'installer:8443')
+        assert pool is not get_connection_pool('http', 'installer:8008')
+
+        assert pool.maxsize == 2
+        assert pool.timeout == 10
+
+        # Changing options discards existing pools
+        configure_pools(maxsize=4)
+
+        assert get_connection_pool('https', 'installer:8443') is not pool
+        with pytest.raises(InvalidArgument):
+            configure_pools(size=4)
+    finally:
+        configure_pools(maxsize=DEFAULT_MAXSIZE, timeout=DEFAULT_TIMEOUT)
@@ -0,0 +1,86 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from tortuga.utility.authPrincipal import AuthPrincipal
+from tortuga.utility.credentialCache import CredentialCache
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_put():
+    clock = FakeClock()
+
+    cache = CredentialCache(ttl=10, negative_ttl=2, clock=clock)
+
+    principal = AuthPrincipal('admin')
+
+    assert cache.get('admin', 'secret') == (False, None)
+
+    cache.put('admin', 'secret', principal)
+    cache.put('admin', 'wrong', None)
+
+    assert cache.get('admin', 'secret') == (True, principal)
+    assert cache.get('admin', 'wrong') == (True, None)
+    assert cache.get('admin', 'other') == (False, None)
+
+    # Failed verifications expire first
+    clock.now = 5
+
+    assert cache.get('admin', 'wrong') == (False, None)
+    assert cache.get('admin', 'secret') == (True, principal)
+
+    clock.now = 10
+
+    assert cache.get('admin', 'secret') == (False, None)
+    assert not cache
+
+
+def test_eviction():
+    cache = CredentialCache(max_entries=2)
+
+    cache.put('user1', 'pw', AuthPrincipal('user1'))
+    cache.put('user2', 'pw', AuthPrincipal('user2'))
+
+    # Mark 'user1' as recently used
+    assert cache.get('user1', 'pw')[0]
+
+    cache.put('user3', 'pw', AuthPrincipal('user3'))
+
+    assert len(cache) == 2
+    assert cache.get('user1', 'pw')[0]
+    assert not cache.get('user2', 'pw')[0]
+
+
+def test_invalidate():
+    cache = CredentialCache()
+
+    cache.put('user1', 'pw', AuthPrincipal('user1'))
+    cache.put('user1', 'bad', None)
+    cache.put('user2', 'pw', AuthPrincipal('user2'))
+
+    cache.invalidate('user1')
+
+    assert not cache.get('user1', 'pw')[0]
+    assert not cache.get('user1', 'bad')[0]
+    assert cache.get('user2', 'pw')[0]
+
+    cache.invalidate()
+
+    assert not cache
@@ -0,0 +1,64 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from tortuga.exceptions.nodeNotFound import NodeNotFound
+from tortuga.exceptions.tortugaException import TortugaException
+from tortuga.utility import tortugaStatus
+from tortuga.web_client import exceptionMapper
+
+
+def status_headers(code, msg='message'):
+    return {
+        'Tortuga-Status-Code': str(code),
+        'Tortuga-Status-Message': msg,
+    }
+
+
+def test_checkStatus_ok():
+    exceptionMapper.checkStatus({})
+    exceptionMapper.checkStatus(status_headers(tortugaStatus.TORTUGA_OK))
+
+
+def test_checkStatus():
+    with pytest.raises(NodeNotFound) as excinfo:
+        exceptionMapper.checkStatus(
+            status_headers(tortugaStatus.TORTUGA_NODE_NOT_FOUND_ERROR))
+
+    assert str(excinfo.value) == 'message'
+
+
+@pytest.mark.parametrize('code', [
+    9999,
+    # Kit not installed
+    tortugaStatus.TORTUGA_UGE_CLUSTER_NOT_FOUND_ERROR,
+])
+def test_checkStatus_unknown(code):
+    with pytest.raises(TortugaException) as excinfo:
+        exceptionMapper.checkStatus(status_headers(code))
+
+    assert type(excinfo.value) is TortugaException
+
+
+def test_exception_maps():
+    # Every mapped exception can be resolved in both directions
+    for code, exStr in tortugaStatus.exceptionMap.items():
+        assert tortugaStatus.exceptionCodeMap[
+            exStr.rsplit('.', 1)[-1]] == code
+
+        if exStr.startswith('exceptions.'):
+            exClass = exceptionMapper.getExceptionClass(code)
+
+            assert exClass.__name__ == exStr.rsplit('.', 1)[-1]
+            assert issubclass(exClass, Exception)
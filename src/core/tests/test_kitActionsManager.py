@@ -0,0 +1,105 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from tortuga.kit.actions import kitActionsManager
+from tortuga.kit.actions.kitActionsManager import KitActionsManager, \
+    invalidate_component_installers
+
+
+class ComponentInstaller(object):
+    def __init__(self, name):
+        self.name = name
+
+
+def new_kit_installer(kit_name, component_names):
+    class KitInstaller(object):
+        name = kit_name
+
+        instances = 0
+
+        def __init__(self):
+            KitInstaller.instances += 1
+
+            self._component_installers = [
+                ComponentInstaller(name) for name in component_names]
+
+        def get_all_component_installers(self):
+            return self._component_installers
+
+    return KitInstaller
+
+
+@pytest.fixture
+def kits(tmpdir, monkeypatch):
+    kit_installers = [
+        new_kit_installer('other', ['other1', 'other2']),
+        new_kit_installer('base', ['core', 'dhcpd']),
+    ]
+
+    enabled = {'core', 'other2'}
+
+    monkeypatch.setattr(kitActionsManager, 'load_kits', lambda: None)
+    monkeypatch.setattr(kitActionsManager, 'get_all_kit_installers',
+                        lambda: kit_installers)
+    monkeypatch.setattr(
+        kitActionsManager, '_get_marker_path',
+        lambda: str(tmpdir.join('var', 'tmp', 'kit-components.generation')))
+    monkeypatch.setattr(
+        KitActionsManager, '_get_enabled_component_names',
+        lambda self: set(enabled))
+
+    invalidate_component_installers()
+
+    yield kit_installers, enabled
+
+
+def names(component_installers):
+    return [component_installer.name
+            for component_installer in component_installers]
+
+
+def test_component_installers(kits):
+    kit_installers, enabled = kits
+
+    mgr = KitActionsManager()
+
+    assert names(mgr._get_all_component_installers()) == \
+        ['core', 'dhcpd', 'other1', 'other2']
+
+    assert names(mgr._get_all_component_installers(
+        base_kit_order='last')) == ['other1', 'other2', 'core', 'dhcpd']
+
+    assert names(mgr._get_component_installers().enabled['first']) == \
+        ['core', 'other2']
+
+    assert mgr.load_component('dhcpd').name == 'dhcpd'
+    assert mgr.load_component('unknown') is None
+
+    # Kit installers are instantiated once
+    assert [kit_installer.instances for kit_installer in kit_installers] \
+        == [1, 1]
+
+    enabled.add('dhcpd')
+
+    assert names(mgr._get_component_installers().enabled['first']) == \
+        ['core', 'other2']
+
+    invalidate_component_installers()
+
+    assert names(mgr._get_component_installers().enabled['first']) == \
+        ['core', 'dhcpd', 'other2']
+
+    assert [kit_installer.instances for kit_installer in kit_installers] \
+        == [2, 2]
@@ -0,0 +1,77 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from tortuga.os_objects.rhel.omshell import OmshellBatch
+
+
+def get_batch():
+    batch = OmshellBatch()
+
+    batch.create_host('compute-01', '00:00:00:00:00:01', '10.0.0.1')
+    batch.create_host('compute-02', '00:00:00:00:00:02', '10.0.0.2')
+    batch.remove_host('compute-03', '00:00:00:00:00:03', '10.0.0.3')
+
+    return batch
+
+
+def host_output(name, error=None):
+    output = 'obj: host\nname = "%s"\n' % (name)
+
+    if error:
+        output += error + '\n'
+
+    return output
+
+
+def test_get_script():
+    script = get_batch().get_script()
+
+    lines = script.splitlines()
+
+    # Single connection for all hosts
+    assert lines.count('connect') == 1
+    assert lines[0] == 'connect'
+
+    assert lines.count('new host') == 3
+    assert lines.count('close') == 3
+    assert lines.count('create') == 2
+    assert lines.count('remove') == 1
+
+    assert 'set name = "compute-02"' in lines
+    assert 'set hardware-address = 00:00:00:00:00:02' in lines
+
+
+def test_parse_output():
+    output = host_output('compute-01') + \
+        host_output('compute-02',
+                    "can't open object: already exists") + \
+        host_output('compute-03', "can't open object: not found") + \
+        "can't destroy object: not found\n" + \
+        'not open.\n'
+
+    assert get_batch().parse_output(output) == {
+        'compute-02': "can't open object: already exists",
+        'compute-03': "can't open object: not found",
+    }
+
+
+def test_parse_output_not_connected():
+    output = 'dhcpctl_connect: connection refused\n' + \
+        'not connected.\n' * 3
+
+    assert get_batch().parse_output(output) == {
+        'compute-01': 'dhcpctl_connect: connection refused',
+        'compute-02': 'dhcpctl_connect: connection refused',
+        'compute-03': 'dhcpctl_connect: connection refused',
+    }
@@ -0,0 +1,117 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import concurrent.futures
+import http.server
+import json
+import threading
+import time
+import pytest
+from tortuga.web_client.sessionManager import SessionManager
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args): \
+            # pylint: disable=arguments-differ
+        pass
+
+    def send_json(self, status, data):
+        body = json.dumps(data).encode()
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        self.wfile.write(body)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        authorization = self.headers.get('Authorization')
+
+        with self.server.lock:
+            self.server.requests.append(authorization)
+
+            valid = authorization == 'Bearer %s' % (self.server.token)
+
+        if not valid:
+            self.send_json(401, {})
+
+            return
+
+        self.send_json(200, {'path': self.path})
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self.rfile.read(int(self.headers['Content-Length']))
+
+        # Slow login so concurrent requests overlap
+        time.sleep(0.1)
+
+        with self.server.lock:
+            self.server.logins += 1
+
+            self.server.token = 'token-%d' % (self.server.logins)
+
+            token = self.server.token
+
+        self.send_json(200, {'token': token, 'expires': 0})
+
+
+@pytest.fixture
+def server():
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    httpd.logins = 0
+    httpd.token = None
+
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,),
+                              daemon=True)
+    thread.start()
+
+    yield httpd
+
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_reauthenticate_once(server):
+    url = 'http://127.0.0.1:%d' % (server.server_address[1])
+
+    sm = SessionManager()
+
+    sm.establishSession(url, 'admin', 'password')
+
+    assert sm.getToken() == ('token-1', 0)
+
+    # Token expired
+    with server.lock:
+        server.token = 'token-expired'
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(
+            lambda index: sm.sendRequest('/v1/nodes/%d' % (index)),
+            range(16)))
+
+    assert [responseDict['path'] for _, responseDict in results] == \
+        ['/v1/nodes/%d' % (index) for index in range(16)]
+
+    # Single login for all rejected requests
+    assert server.logins == 2
+
+    assert sm.getToken() == ('token-2', 0)
+
+    # Requests were never sent without credentials
+    assert None not in server.requests
@@ -0,0 +1,63 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import time
+from tortuga.web_client.tokenCache import TokenCache
+
+
+def test_token_cache(tmpdir):
+    path = os.path.join(str(tmpdir), '.tortuga', 'token_cache.json')
+
+    cache = TokenCache(path)
+
+    url = 'https://installer:8443'
+
+    assert cache.get(url, 'admin') is None
+
+    cache.put(url, 'admin', 'token1', int(time.time()) + 3600)
+
+    assert TokenCache(path).get(url, 'admin') == 'token1'
+
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+    # Token is not used for a different user or web service
+    assert cache.get(url, 'other') is None
+    assert cache.get('https://other:8443', 'admin') is None
+
+    # Password is not stored
+    with open(path) as fp:
+        assert 'password' not in fp.read()
+
+    cache.remove(url, 'admin')
+
+    assert cache.get(url, 'admin') is None
+
+
+def test_token_cache_expired(tmpdir):
+    cache = TokenCache(os.path.join(str(tmpdir), 'token_cache.json'))
+
+    cache.put('url', 'admin', 'token1', int(time.time()) + 30)
+
+    # Token about to expire is not reused
+    assert cache.get('url', 'admin') is None
+
+
+def test_token_cache_unreadable(tmpdir):
+    path = os.path.join(str(tmpdir), 'token_cache.json')
+
+    with open(path, 'w') as fp:
+        fp.write('not json')
+
+    assert TokenCache(path).get('url', 'admin') is None
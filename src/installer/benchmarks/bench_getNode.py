@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Microbenchmark for the per-call overhead of NodeDbApi.getNode().
+
+The 'uncached' run discards the session factory and mapped table state
+before every call, reproducing the behaviour of DbManager prior to
+caching them.
+
+Usage: TORTUGA_ROOT=<dir> python bench_getNode.py [-n ITERATIONS]
+"""
+
+import argparse
+import timeit
+
+from sqlalchemy import create_engine
+
+from tortuga.db.dbManager import DbManager
+from tortuga.db.nodeDbApi import NodeDbApi
+from tortuga.db.nodes import Nodes
+
+
+def setup_db():
+    dbm = DbManager(create_engine('sqlite:///:memory:'))
+
+    dbm.init_database()
+
+    with dbm.session() as session:
+        session.add(Nodes('compute-01'))
+        session.commit()
+
+    return dbm
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', '--iterations', type=int, default=1000)
+
+    args = parser.parse_args()
+
+    dbm = setup_db()
+
+    node_api = NodeDbApi()
+
+    def get_node():
+        node_api.getNode('compute-01')
+
+    def get_node_uncached():
+        dbm.Session = None
+        dbm._tables_mapped = False  # pylint: disable=protected-access
+
+        node_api.getNode('compute-01')
+
+    for label, func in (('uncached', get_node_uncached),
+                        ('cached', get_node)):
+        elapsed = timeit.timeit(func, number=args.iterations)
+
+        print('{0:10s} {1:8.1f} us/call'.format(
+            label, elapsed / args.iterations * 1e6))
+
+    print('pool status: {0}'.format(dbm.getPoolStatus()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark for case-insensitive node name lookups.
+
+Compares NodesDbHandler.getNode() using the indexed 'lowerName' column
+to the previous lower(name)/LIKE filter, which required a full table
+scan.
+
+Usage: TORTUGA_ROOT=<dir> python bench_getNodeByName.py [-c NODES]
+"""
+
+import argparse
+import random
+import timeit
+
+from sqlalchemy import create_engine, func, or_
+
+from tortuga.db.dbManager import DbManagerBase
+from tortuga.db.nodes import Nodes
+from tortuga.db.nodesDbHandler import NodesDbHandler
+
+
+def setup_db(count):
+    dbm = DbManagerBase(create_engine('sqlite:///:memory:'))
+
+    dbm.init_database()
+
+    names = ['Compute-%06d.example.com' % (index) for index in range(count)]
+
+    with dbm.engine.begin() as connection:
+        connection.execute(
+            dbm.getMetadataTable('Nodes').insert(), [
+                {
+                    'name': name,
+                    'lowerName': name.lower(),
+                    'lockedState': 'Unlocked',
+                    'isIdle': True,
+                } for name in names
+            ])
+
+    return dbm, names
+
+
+def get_node_unindexed(session, name):
+    return session.query(Nodes).filter(
+        or_(func.lower(Nodes.name) == name.lower(),
+            func.lower(Nodes.name).like(name.lower() + '.%'))).one()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-c', '--count', type=int, default=50000,
+                        help='number of nodes (default: %(default)s)')
+    parser.add_argument('-n', '--iterations', type=int, default=200)
+
+    args = parser.parse_args()
+
+    dbm, names = setup_db(args.count)
+
+    handler = NodesDbHandler()
+
+    short_names = [
+        name.split('.', 1)[0].upper()
+        for name in random.sample(names, args.iterations)
+    ]
+
+    with dbm.session() as session:
+        for label, func_ in (('unindexed', get_node_unindexed),
+                             ('indexed', handler.getNode)):
+            short_names_iter = iter(short_names)
+
+            elapsed = timeit.timeit(
+                lambda: func_(session, next(short_names_iter)),
+                number=args.iterations)
+
+            session.expunge_all()
+
+            print('{0:10s} {1:10.1f} us/lookup ({2} nodes)'.format(
+                label, elapsed / args.iterations * 1e6, args.count))
+
+
+if __name__ == '__main__':
+    main()
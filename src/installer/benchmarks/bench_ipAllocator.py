@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark for provisioning IP address allocation on a /16 network.
+
+Compares IpAllocator to the previous allocation scheme, which built a
+list of all used addresses and scanned it for each candidate address.
+
+Usage: python bench_ipAllocator.py [-u USED] [-n COUNT]
+"""
+
+import argparse
+import ipaddress
+import time
+
+from tortuga.addhost.ipAllocator import IpAllocator
+
+
+NETWORK = '10.0.0.0'
+NETMASK = '255.255.0.0'
+
+
+def list_allocate(used_ips, count):
+    n = ipaddress.IPv4Network('%s/%s' % (NETWORK, NETMASK))
+
+    ips = [ipaddress.IPv4Address(ip) for ip in used_ips]
+
+    result = []
+
+    for _ in range(count):
+        ip = n[1]
+
+        for _ in range(n.num_addresses):
+            if ip not in ips:
+                break
+
+            ip += 1
+
+        ips.append(ip)
+
+        result.append(ip.exploded)
+
+    return result
+
+
+def bitmap_allocate(used_ips, count):
+    allocator = IpAllocator(NETWORK, NETMASK)
+
+    allocator.mark_used(used_ips)
+
+    return [allocator.allocate()[0] for _ in range(count)]
+
+
+def bitmap_allocate_batch(used_ips, count):
+    allocator = IpAllocator(NETWORK, NETMASK)
+
+    allocator.mark_used(used_ips)
+
+    return allocator.allocate(count)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-u', '--used', type=int, default=1000,
+                        help='number of used addresses (default: %(default)s)')
+    parser.add_argument('-n', '--count', type=int, default=100,
+                        help='addresses to allocate (default: %(default)s)')
+
+    args = parser.parse_args()
+
+    network = ipaddress.IPv4Network('%s/%s' % (NETWORK, NETMASK))
+
+    used_ips = [str(network[index]) for index in range(1, args.used + 1)]
+
+    expected = None
+
+    for label, func in (('list', list_allocate),
+                        ('bitmap', bitmap_allocate),
+                        ('bitmap (batch)', bitmap_allocate_batch)):
+        start = time.perf_counter()
+
+        result = func(used_ips, args.count)
+
+        elapsed = time.perf_counter() - start
+
+        if expected is None:
+            expected = result
+
+        assert result == expected
+
+        print('{0:15s} {1:10.1f} ms ({2} used, {3} allocated)'.format(
+            label, elapsed * 1e3, args.used, args.count))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Request latency of sequential NodeWsApi.getNode() calls against a
+local stub web service, with and without the keep-alive connection
+pool.
+
+The 'per-request' run uses a new SSL context, HTTPS handler and opener
+for every request, reproducing SessionManager prior to connection
+pooling. HTTPS is used by default (a self-signed certificate is
+generated with the 'openssl' command); use --http to compare plain HTTP.
+
+Usage: TORTUGA_ROOT=<dir> python bench_wsGetNode.py [-n REQUESTS] [--http]
+"""
+
+import argparse
+import http.server
+import json
+import os
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from tortuga.config.configManager import ConfigManager
+from tortuga.utility import tortugaStatus
+from tortuga.web_client.sessionManager import SessionManager
+from tortuga.wsapi.nodeWsApi import NodeWsApi
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    # Send headers and body in one segment, as CherryPy does
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args): \
+            # pylint: disable=arguments-differ
+        pass
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+        if self.path == '/v1/auth/login':
+            response = {'token': 'token', 'expires': int(time.time()) + 3600}
+        else:
+            response = {'node': {'name': self.path.rsplit('/', 1)[-1]}}
+
+        body = json.dumps(response).encode()
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Tortuga-Status-Code', str(tortugaStatus.TORTUGA_OK))
+        self.end_headers()
+
+        self.wfile.write(body)
+
+
+class PerRequestSessionManager(SessionManager):
+    """SessionManager.sendRequest() prior to connection pooling"""
+
+    def sendRequest(self, url, method='GET',
+                    contentType='application/json', data='',
+                    acceptType='application/json'):
+        if '://' not in url:
+            url = '%s/%s' % (self._host, url)
+
+        request = urllib.request.Request(url, data=data.encode())
+        request.get_method = lambda: method
+        request.add_header('Content-Length', str(len(data)))
+        request.add_header('Content-Type', contentType)
+        request.add_header('Accept', acceptType)
+
+        ctx = ssl.create_default_context()
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+
+        opener = urllib.request.build_opener(
+            urllib.request.HTTPSHandler(context=ctx))
+
+        return self._response_handler(opener.open(request))
+
+
+def start_server(tmpdir, use_https):
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+
+    if use_https:
+        certfile = os.path.join(tmpdir, 'cert.pem')
+        keyfile = os.path.join(tmpdir, 'key.pem')
+
+        subprocess.check_call(
+            ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+             '-subj', '/CN=localhost', '-days', '1',
+             '-keyout', keyfile, '-out', certfile],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ctx.load_cert_chain(certfile, keyfile)
+
+        server.socket = ctx.wrap_socket(server.socket, server_side=True)
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    return server
+
+
+def run(api, count):
+    latencies = []
+
+    for index in range(count):
+        start = time.perf_counter()
+
+        api.getNode('compute-%05d' % (index))
+
+        latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+
+    return latencies
+
+
+def report(label, latencies):
+    print('%-12s total %7.3fs  mean %6.2fms  p50 %6.2fms  p99 %6.2fms' % (
+        label, sum(latencies),
+        sum(latencies) / len(latencies) * 1000,
+        latencies[len(latencies) // 2] * 1000,
+        latencies[int(len(latencies) * 0.99)] * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=1000,
+                        help='number of getNode() calls')
+    parser.add_argument('--http', action='store_true',
+                        help='use plain HTTP instead of HTTPS')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Keep the token cache out of the home directory
+        os.environ['HOME'] = tmpdir
+
+        server = start_server(tmpdir, not args.http)
+
+        cm = ConfigManager()
+        cm.setInstaller('127.0.0.1')
+        cm.setAdminPort(server.server_address[1])
+        cm.setAdminScheme('http' if args.http else 'https')
+
+        pooled = NodeWsApi('admin', 'password')
+
+        legacy = NodeWsApi('admin', 'password')
+        legacy._sm = PerRequestSessionManager()  # pylint: disable=W0212
+
+        if not args.http:
+            report('per-request', run(legacy, args.n))
+
+        report('pooled', run(pooled, args.n))
+
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
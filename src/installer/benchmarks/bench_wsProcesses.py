@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Requests per second served by the web service versus number of
+processes.
+
+By default a CherryPy application returning a JSON node list (similar
+to GET /v1/nodes) is run under PreforkServer with each process count
+in turn, so the benchmark needs no Tortuga installation. Use --url to
+load an existing tortugawsd instead (start it with the desired
+--processes value; --processes is then only used as a label).
+
+Requests are issued over keep-alive connections by --clients client
+processes.
+
+Usage: TORTUGA_ROOT=<dir> python bench_wsProcesses.py
+           [--processes 1,2,4] [--clients 16] [--duration 10]
+           [--nodes 500] [--url URL --username USER --password PASS]
+"""
+
+import argparse
+import base64
+import http.client
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import ssl
+import time
+import urllib.parse
+
+import cherrypy
+
+from tortuga.web_service.prefork import PreforkServer
+
+
+class NodeListApp(object):
+    def __init__(self, count):
+        self._count = count
+
+    @cherrypy.expose
+    def nodes(self):
+        # Build and encode the response per request, as the node
+        # controller does
+        nodes = [{
+            'name': 'compute-%05d' % (index),
+            'state': 'Installed',
+            'hardwareprofile': {'name': 'execd'},
+            'softwareprofile': {'name': 'execd'},
+            'nics': [{
+                'ip': '10.2.%d.%d' % (index // 256, index % 256),
+                'mac': '52:54:00:%02x:%02x:%02x' % (
+                    index >> 16 & 0xff, index >> 8 & 0xff, index & 0xff),
+                'boot': True,
+            }],
+        } for index in range(self._count)]
+
+        cherrypy.response.headers['Content-Type'] = 'application/json'
+
+        return json.dumps({'nodes': nodes}).encode()
+
+
+def serve(port, count):
+    cherrypy.config.update({
+        'server.socket_host': '127.0.0.1',
+        'server.socket_port': port,
+        'environment': 'production',
+        'log.screen': False,
+    })
+
+    cherrypy.tree.mount(NodeListApp(count), '/')
+
+    # As runServer(worker=True)
+    httpserver, _ = cherrypy.server.httpserver_from_self()
+    httpserver.reuse_port = True
+    cherrypy.server.httpserver = httpserver
+
+    cherrypy.engine.signals.subscribe()
+    cherrypy.engine.start()
+    cherrypy.engine.block()
+
+
+def start_server(processes, count):
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+
+        port = sock.getsockname()[1]
+
+    supervisor = multiprocessing.get_context('fork').Process(
+        target=lambda: PreforkServer(
+            processes, lambda: serve(port, count)).run())
+    supervisor.start()
+
+    deadline = time.monotonic() + 30
+
+    # Wait for all processes to bind the port
+    time.sleep(0.5 * processes)
+
+    while True:
+        try:
+            socket.create_connection(('127.0.0.1', port)).close()
+
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+
+            time.sleep(0.1)
+
+    return supervisor, 'http://127.0.0.1:%d/nodes' % (port)
+
+
+def client(url, headers, duration):
+    parsed = urllib.parse.urlsplit(url)
+
+    if parsed.scheme == 'https':
+        ctx = ssl.create_default_context()
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+
+        conn = http.client.HTTPSConnection(parsed.netloc, context=ctx)
+    else:
+        conn = http.client.HTTPConnection(parsed.netloc)
+
+    path = parsed.path + ('?' + parsed.query if parsed.query else '')
+
+    count = 0
+
+    deadline = time.monotonic() + duration
+
+    while time.monotonic() < deadline:
+        conn.request('GET', path, headers=headers)
+
+        response = conn.getresponse()
+        response.read()
+
+        if response.status != 200:
+            raise Exception('HTTP status %d' % (response.status))
+
+        count += 1
+
+    conn.close()
+
+    return count
+
+
+def run(url, headers, clients, duration):
+    with multiprocessing.Pool(clients) as pool:
+        counts = pool.starmap(
+            client, [(url, headers, duration)] * clients)
+
+    return sum(counts) / duration
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--processes', default='1,2,4',
+                        help='comma-separated web service process counts')
+    parser.add_argument('--clients', type=int, default=16,
+                        help='number of concurrent client processes')
+    parser.add_argument('--duration', type=float, default=10,
+                        help='seconds to run each test')
+    parser.add_argument('--nodes', type=int, default=500,
+                        help='number of nodes in each response')
+    parser.add_argument('--url',
+                        help='URL of a running web service (ie.'
+                             ' https://localhost:8443/v1/nodes)')
+    parser.add_argument('--username')
+    parser.add_argument('--password')
+    args = parser.parse_args()
+
+    headers = {}
+
+    if args.username:
+        headers['Authorization'] = 'Basic ' + base64.b64encode(
+            ('%s:%s' % (args.username, args.password)).encode()).decode()
+
+    print('cpus: %d  clients: %d  duration: %ss' % (
+        os.cpu_count(), args.clients, args.duration))
+
+    baseline = None
+
+    for processes in [int(value) for value in args.processes.split(',')]:
+        supervisor = None
+
+        if args.url:
+            url = args.url
+        else:
+            supervisor, url = start_server(processes, args.nodes)
+
+        try:
+            rate = run(url, headers, args.clients, args.duration)
+        finally:
+            if supervisor:
+                os.kill(supervisor.pid, signal.SIGTERM)
+
+                supervisor.join()
+
+        baseline = baseline or rate
+
+        print('processes %2d  %8.1f req/s  speedup %.2fx' % (
+            processes, rate, rate / baseline))
+
+
+if __name__ == '__main__':
+    main()
@@ -15,10 +15,12 @@
 # pylint: disable=no-member,maybe-no-member
 
 import threading
-import uuid
+import time
+
 from tortuga.objects.tortugaObject import TortugaObjectList
 from tortuga.objects.tortugaObjectManager import TortugaObjectManager
 from tortuga.objects.addHostStatus import AddHostStatus
+from tortuga.db.changeEvents import publish_event
 from tortuga.db.nodeDbApi import NodeDbApi
 from tortuga.exceptions.notFound import NotFound
 from tortuga.resourceAdapter import resourceAdapterFactory
@@ -33,17 +35,33 @@ from tortuga.wsapi.syncWsApi import SyncWsApi
 from tortuga.db.tags import Tags
 from tortuga.db.tagsDbHandler import TagsDbHandler
 from tortuga.types import Singleton
+from .sessionStore import AddHostSessionStore
 
 
 class AddHostManager(TortugaObjectManager, Singleton):
+    # Completed sessions are deleted after this number of seconds
+    COMPLETED_SESSION_TTL = 3600
+
+    # Minimum number of seconds between checks for expired sessions
+    EVICTION_INTERVAL = 300
+
+    # Sessions updated by other processes are checked at this interval
+    # (seconds) while waiting for status
+    STATUS_POLL_INTERVAL = 1
+
     def __init__(self):
         super(AddHostManager, self).__init__()
 
-        # Now do the class specific variable initialization
-        self._addHostLock = threading.RLock()
-        self._sessions = {}
+        # Now do the class specific variable initialization. Session
+        # state is shared by all web service processes.
+        self._sessions = AddHostSessionStore()
         self._nodeDbApi = NodeDbApi()
 
+        # Notified when sessions are updated by this process
+        self._cond = threading.Condition()
+
+        self._last_eviction = None
+
     def addHosts(self, session, addHostSession, addHostRequest):
         """
         Raises:
@@ -134,75 +152,125 @@ class AddHostManager(TortugaObjectManager, Singleton):
         SyncWsApi().scheduleClusterUpdate(updateReason='Node(s) added')
 
     def updateStatus(self, addHostSession, msg):
-        self._addHostLock.acquire()
+        if not self._sessions.append_message(addHostSession, msg):
+            self.getLogger().warn(
+                'updateStatus(): unknown session ID [%s]' % (
+                    addHostSession))
 
-        try:
-            if addHostSession not in self._sessions:
-                self.getLogger().warn(
-                    'updateStatus(): unknown session ID [%s]' % (
-                        addHostSession))
+            return
 
-                return
+        self.__notify()
 
-            addHostStatus = self._sessions[addHostSession]['status']
+        publish_event('addhost', 'MODIFIED', {
+            'id': addHostSession,
+            'message': msg,
+        })
 
-            addHostStatus.getMessageList().append(msg)
-        finally:
-            self._addHostLock.release()
+    def __notify(self):
+        with self._cond:
+            self._cond.notify_all()
 
-    def getStatus(self, session, startMessage, getNodes):
+    def __wait_for_messages(self, session, startMessage, wait):
+        # Returns messages starting with 'startMessage', waiting up to
+        # 'wait' seconds for messages or session completion
+        deadline = time.monotonic() + wait
+
+        while True:
+            try:
+                messages = self._sessions.get_messages(session, startMessage)
+            except KeyError:
+                raise NotFound(
+                    'Invalid add host session ID [%s]' % (session))
+
+            remaining = deadline - time.monotonic()
+
+            if messages or remaining <= 0 or \
+                    self._sessions.is_completed(session):
+                return messages
+
+            with self._cond:
+                self._cond.wait(min(remaining, self.STATUS_POLL_INTERVAL))
+
+    def getStatus(self, session, startMessage, getNodes, wait=0,
+                  nodeCursor=None):
         """
+        Return messages starting with message number 'startMessage' and,
+        if 'getNodes' is set, nodes added by the session. If 'nodeCursor'
+        is specified, only nodes added after the node cursor returned by
+        a previous call are returned.
+
+        If there are no new messages, wait up to 'wait' seconds for
+        messages to be added or the session to be completed.
+
         Raises:
             NotFound
         """
 
         statusCopy = AddHostStatus()
 
-        self._addHostLock.acquire()
+        messages = self.__wait_for_messages(session, startMessage, wait)
 
-        try:
-            if getNodes and session is not None and \
-                    self._nodeDbApi is not None:
-                nodeList = self._nodeDbApi.getNodesByAddHostSession(session)
-            else:
-                nodeList = TortugaObjectList()
+        if getNodes and session is not None and \
+                self._nodeDbApi is not None:
+            nodeList = self._nodeDbApi.getNodesByAddHostSession(
+                session, after=nodeCursor)
+        else:
+            nodeList = TortugaObjectList()
 
-            # Lock and copy for data consistency
-            if session not in self._sessions:
-                raise NotFound('Invalid add host session ID [%s]' % (session))
+        statusCopy.setIsRunning(self._sessions.is_running(session))
 
-            sessionDict = self._sessions.get(session)
+        statusCopy.setIsCompleted(self._sessions.is_completed(session))
 
-            # Copy simple data
-            for key in sessionDict['status'].getKeys():
-                statusCopy.set(key, sessionDict['status'].get(key))
+        statusCopy.setMessageList(messages)
 
-            # Get slice of status messages
-            messages = sessionDict['status'].getMessageList()[startMessage:]
+        statusCopy.setNextMessage(startMessage + len(messages))
 
-            statusCopy.setMessageList(messages)
+        statusCopy.getNodeList().extend(nodeList)
 
-            statusCopy.getNodeList().extend(nodeList)
+        statusCopy.setNodeCursor(
+            max([node.getId() for node in nodeList] +
+                ([nodeCursor] if nodeCursor is not None else []),
+                default=None))
 
-            return statusCopy
-        finally:
-            self._addHostLock.release()
+        return statusCopy
 
     def createNewSession(self) -> str:
         self.getLogger().debug('createNewSession()')
 
-        with self._addHostLock:
-            # Create new add nodes session
-            session_id = str(uuid.uuid4())
+        self.__evict_sessions()
 
-            self._sessions[session_id] = {
-                'status': AddHostStatus(),
-            }
+        # Create new add nodes session
+        session_id = self._sessions.create()
 
-            return session_id
+        publish_event('addhost', 'ADDED', {'id': session_id})
+
+        return session_id
+
+    def __evict_sessions(self):
+        now = time.monotonic()
+
+        with self._cond:
+            if self._last_eviction is not None and \
+                    now - self._last_eviction < self.EVICTION_INTERVAL:
+                return
+
+            self._last_eviction = now
+
+        session_ids = self._sessions.evict(self.COMPLETED_SESSION_TTL)
+
+        if session_ids:
+            self.getLogger().debug(
+                'Deleted {0} expired add host sessions'.format(
+                    len(session_ids)))
+
+        for session_id in session_ids:
+            publish_event('addhost', 'DELETED', {'id': session_id})
 
     def delete_session(self, session_id):
-        """TODO: currently a no-op"""
+        """
+        No-op; completed sessions remain available to clients for
+        COMPLETED_SESSION_TTL seconds and are then deleted
+        """
 
     def delete_sessions(self, session_ids):
         """Bulk session deletion
@@ -212,21 +280,26 @@ class AddHostManager(TortugaObjectManager, Singleton):
 
         self.getLogger().debug('delete_sessions()')
 
-        with self._addHostLock:
-            for session_id in session_ids:
-                if session_id in self._sessions:
-                    self.getLogger().debug(
-                        'Deleting session [{0}]'.format(session_id))
+        session_ids = list(session_ids)
 
-                    del self._sessions[session_id]
+        self._sessions.delete(session_ids)
+
+        for session_id in session_ids:
+            publish_event('addhost', 'DELETED', {'id': session_id})
 
     def update_session(self, session_id, running=None):
         self.getLogger().debug(
             'Updating add host session [%s] (status: running=%s)' % (
                 session_id, str(running)))
 
-        with self._addHostLock:
-            self._sessions[session_id]['status'].setIsRunning(running)
+        self._sessions.set_running(session_id, running)
+
+        self.__notify()
+
+        publish_event('addhost', 'MODIFIED', {
+            'id': session_id,
+            'running': running,
+        })
 
 
 def get_tags(session, tagdict):
@@ -14,6 +14,7 @@
 
 # pylint: disable=no-self-use,no-name-in-module,no-member
 
+import collections
 import itertools
 import threading
 import random
@@ -21,7 +22,7 @@ import string
 import logging
 import ipaddress
 from sqlalchemy.orm.session import Session
-from typing import NoReturn, List, Optional
+from typing import NoReturn, List, Optional, Tuple
 from tortuga.utility.tortugaApi import TortugaApi
 from tortuga.db.nodesDbHandler import NodesDbHandler
 from tortuga.exceptions.networkNotFound import NetworkNotFound
@@ -32,16 +33,19 @@ from tortuga.utility.network import validateMacAddress
 from tortuga.resourceAdapter.utility import get_provisioning_nics
 from tortuga.db.nodes import Nodes
 from tortuga.db.hardwareProfiles import HardwareProfiles
+from tortuga.db.networks import Networks
+from .ipAllocator import allocate_ip_addresses, mark_ip_addresses_used, \
+    release_ip_addresses
 
 
 session_nodes_lock = threading.RLock()
 
 session_nodes = []
 
-# Maintain a list of used IP addresses. We do this to ensure we are
+# Maintain a set of used IP addresses. We do this to ensure we are
 # not reusing IP addresses that were already used in this add nodes
 # session.
-reservedIps = []
+reservedIps = set()
 
 logger = logging.getLogger('tortuga.addhost.addhostserverlocal')
 logger.addHandler(logging.NullHandler())
@@ -61,6 +65,17 @@ class AddHostServerLocal(TortugaApi):
             for node in nodes:
                 AddHostServerLocal.clear_session_node(node, lock=False)
 
+    @staticmethod
+    def clear_session_node_names(names: List[str]) -> NoReturn:
+        """Remove session entries for names reserved but not used"""
+
+        with session_nodes_lock:
+            for name in names:
+                hostname = get_host_name(name)
+
+                if hostname in session_nodes:
+                    session_nodes.remove(hostname)
+
     @staticmethod
     def clear_session_node(node: Nodes, lock: bool = True) -> NoReturn:
         if lock:
@@ -86,8 +101,7 @@ class AddHostServerLocal(TortugaApi):
             prov_nics = get_provisioning_nics(node)
 
             if prov_nics:
-                if prov_nics[0].ip in reservedIps:
-                    reservedIps.remove(prov_nics[0].ip)
+                reservedIps.discard(prov_nics[0].ip)
         finally:
             if lock:
                 session_nodes_lock.release()
@@ -145,6 +159,24 @@ class AddHostServerLocal(TortugaApi):
             InvalidArgument
         '''
 
+        return self.generate_node_names(
+            session, nameFormat, 1, rackNumber=rackNumber,
+            randomize=randomize, dns_zone=dns_zone)[0]
+
+    def generate_node_names(self, session: Session, nameFormat: str,
+                            count: int, rackNumber: Optional[str] = None,
+                            randomize: bool = False,
+                            dns_zone: Optional[str] = None) -> List[str]:
+        '''
+        Generate 'count' unique node names for the specified nameFormat.
+
+        Existing node names are retrieved using a single query and the
+        lowest available slot numbers are reserved in one pass.
+
+        Raises:
+            InvalidArgument
+        '''
+
         try:
             base_name = nameFormat if rackNumber is None else \
                 self._substituteHashSpecifier(
@@ -152,50 +184,64 @@ class AddHostServerLocal(TortugaApi):
 
             # Find all pre-existing nodes + nodes in the session
             if not randomize:
-                nodes = self._nodesDbHandler.getNodesByNameFilter(
+                node_names = self._nodesDbHandler.getNodeNamesByNameFilter(
                     session,
                     self._substituteHashSpecifier(
                         base_name, '#N', '_'))
 
-                # Get list of all existing nodes names
-                node_names = [get_host_name(tmpNode.name)
-                              for tmpNode in nodes]
+                # Get set of all existing nodes names
+                used_names = set(
+                    get_host_name(node_name) for node_name in node_names)
             else:
                 # Get all nodes matching name format WITH a random suffix
-                nodes = self._nodesDbHandler.getNodesByNameFilter(
+                node_names = self._nodesDbHandler.getNodeNamesByNameFilter(
                     session,
                     self._substituteHashSpecifier(base_name, '#N', '_') +
                     '-_____')
 
-                node_names = [
-                    strip_random_node_name_suffix(get_host_name(node.name))
-                    for node in nodes]
+                used_names = set(
+                    strip_random_node_name_suffix(get_host_name(node_name))
+                    for node_name in node_names)
+
+            names = []
 
             with session_nodes_lock:
-                # Build a list of all nodes in database and session
+                # Include names of nodes in all add host sessions
                 if randomize:
-                    all_session_nodes = node_names + \
-                        strip_random_node_name_suffixes(session_nodes)
+                    used_names.update(
+                        strip_random_node_name_suffixes(session_nodes))
                 else:
-                    all_session_nodes = node_names + session_nodes
+                    used_names.update(session_nodes)
 
-            for slot in itertools.count(1):
-                name = self._substituteHashSpecifier(
-                    base_name, '#N', slot)
+                for slot in itertools.count(1):
+                    if len(names) == count:
+                        break
 
-                if name not in all_session_nodes:
-                    break
+                    name = self._substituteHashSpecifier(
+                        base_name, '#N', slot)
 
-            if randomize:
-                # Add random 5 letter suffix to generated host name
-                name += '-%s' % (
-                    ''.join(random.sample(string.ascii_lowercase, 5)))
+                    if name not in used_names:
+                        used_names.add(name)
+
+                        names.append(name)
+                    elif '#N' not in base_name:
+                        # Name format does not contain a node number
+                        raise InvalidArgument(
+                            'Unable to generate unique host name')
+
+                if randomize:
+                    # Add random 5 letter suffix to generated host names
+                    names = [
+                        name + '-%s' % (
+                            ''.join(random.sample(string.ascii_lowercase, 5)))
+                        for name in names
+                    ]
 
-            with session_nodes_lock:
                 # Add only host name to session_nodes cache
-                session_nodes.append(name)
+                session_nodes.extend(names)
 
-            return '{}.{}'.format(name, dns_zone) if dns_zone else name
+            return ['{}.{}'.format(name, dns_zone) if dns_zone else name
+                    for name in names]
         except InvalidArgument as exc:
             raise InvalidArgument('%s (format=[%s])' % (exc, nameFormat))
 
@@ -333,7 +379,10 @@ class AddHostServerLocal(TortugaApi):
             dbNic.boot = dbNic.network and dbNic.network.type == 'provision'
 
             if dbNic.ip:
-                reservedIps.append(dbNic.ip)
+                reservedIps.add(dbNic.ip)
+
+                if dbNic.network:
+                    mark_ip_addresses_used(dbNic.network.id, [dbNic.ip])
 
             nics.append(dbNic)
 
@@ -371,52 +420,106 @@ class AddHostServerLocal(TortugaApi):
             # (we do not assign the IP address for this hardwareProfile.)
             return None
 
-        n = ipaddress.IPv4Network(
-            '%s/%s' % (network.address, network.netmask))
+        return self.generate_provisioning_ip_addresses(network, 1)[0]
 
-        # Get list of all currently allocated IPs on this network
-        ips = [
-            ipaddress.IPv4Address(str(dbNic.ip))
-            for dbNic in network.nics if dbNic and dbNic.ip]
+    def generate_provisioning_ip_addresses(self, network,
+                                           count: int) -> List[str]:
+        """
+        Allocate 'count' IP addresses on the specified network
+
+        Raises:
+            InvalidArgument
+        """
 
         with session_nodes_lock:
-            # Include reserved IPs
-            ips.extend([ipaddress.IPv4Address(str(ip))
-                        for ip in reservedIps])
-
-            if not network.startIp:
-                # Assume the starting IP address is the first IP address in
-                # the subnet
-                try:
-                    ip = n[1]
-                except IndexError:
-                    raise InvalidArgument('IP address space exhausted')
-            else:
-                ip = ipaddress.IPv4Address(str(network.startIp))
+            ips = allocate_ip_addresses(
+                network, count=count, reserved_ips=reservedIps)
 
-            # Ensure there's a valid increment if none is defined in the
-            # network object.
-            inc = network.increment if network.increment else 1
+            reservedIps.update(ips)
 
-            for _ in range(n.num_addresses):
-                if ip not in ips:
-                    # Found available IP address within address space
-                    break
+        self.getLogger().debug(
+            'Assigning IP addresses [%s] on network [%s/%s]' % (
+                ' '.join(ips), network.address, network.netmask))
 
-                ip += int(inc)
-            else:
-                raise InvalidArgument('IP address space exhausted')
+        return ips
 
-            if ip == n.broadcast_address:
-                raise InvalidArgument('IP address space exhausted')
+    @staticmethod
+    def release_provisioning_ip_addresses(
+            allocations: List[Tuple[Networks, List[str]]]) -> NoReturn:
+        """
+        Release IP addresses allocated by allocate_nic_ip_addresses()
+        """
 
-            reservedIps.append(ip.exploded)
+        with session_nodes_lock:
+            for network, ips in allocations:
+                reservedIps.difference_update(ips)
 
-        self.getLogger().debug(
-            'Assigning IP address [%s] on network [%s]' % (
-                ip.exploded, str(n)))
+                release_ip_addresses(network.id, ips)
+
+    def allocate_nic_ip_addresses(
+            self, dbHardwareProfile: HardwareProfiles,
+            nic_defs_list: List[List[dict]],
+            bGenerateIp: bool = True) \
+            -> List[Tuple[Networks, List[str]]]:
+        """
+        Allocate IP addresses for the provisioning NICs of many nodes at
+        once. Each entry in 'nic_defs_list' is the list of nic
+        definitions for one node; entries are updated in place with the
+        allocated 'ip'. NICs are matched to hardware profile networks in
+        the same order as _initializeNics().
+
+        Returns list of (network, ips) tuples for the allocated addresses.
+
+        Raises:
+            InvalidArgument
+        """
+
+        if not bGenerateIp:
+            return []
+
+        hwpnetworks = dbHardwareProfile.hardwareprofilenetworks[:]
+
+        hwpnetworks.sort(key=lambda a: a.networkdevice.name)
+
+        # Nic definitions requiring an address, grouped by network
+        slots = collections.OrderedDict()
+
+        for nic_defs in nic_defs_list:
+            for index, dbHardwareProfileNetwork in enumerate(hwpnetworks):
+                network = dbHardwareProfileNetwork.network
+
+                if network.type != 'provision' or network.usingDhcp:
+                    continue
+
+                if index < len(nic_defs) and nic_defs[index] and \
+                        'ip' in nic_defs[index]:
+                    continue
+
+                while len(nic_defs) <= index:
+                    nic_defs.append({})
+
+                if nic_defs[index] is None:
+                    nic_defs[index] = {}
+
+                slots.setdefault(network, []).append(nic_defs[index])
+
+        allocations = []
+
+        try:
+            for network, nic_defs in slots.items():
+                ips = self.generate_provisioning_ip_addresses(
+                    network, len(nic_defs))
+
+                allocations.append((network, ips))
+
+                for nic_def, ip in zip(nic_defs, ips):
+                    nic_def['ip'] = ip
+        except Exception:
+            self.release_provisioning_ip_addresses(allocations)
+
+            raise
 
-        return ip.exploded
+        return allocations
 
 
 def strip_random_node_name_suffix(name):
@@ -62,9 +62,11 @@ def process_delete_host_request(request):
 
             req.message = str(exc)
 
-            req.state = 'error'
-
             req.last_update = datetime.datetime.utcnow()
+
+            # Deleting nodes may be retried; the request queue retries
+            # the request with backoff or marks it as failed
+            raise
         finally:
             ahm.update_session(request['transaction_id'], running=False)
     finally:
@@ -0,0 +1,285 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ipaddress
+import logging
+import re
+import threading
+from typing import Iterable, List, Optional
+
+from sqlalchemy.orm import object_session
+
+from tortuga.db.nics import Nics
+from tortuga.exceptions.invalidArgument import InvalidArgument
+
+
+logger = logging.getLogger('tortuga.addhost.ipallocator')
+logger.addHandler(logging.NullHandler())
+
+# Matches any byte in the bitmap with at least one free address
+_FREE_BYTE_RE = re.compile(b'[^\xff]')
+
+# Maximum number of values in a single SQL 'IN' clause
+_IN_CLAUSE_BATCH_SIZE = 500
+
+ip_allocators_lock = threading.RLock()
+
+# Allocators keyed on network id
+ip_allocators = {}
+
+
+class IpAllocator(object):
+    """
+    Allocates IP addresses within a network. Used addresses are tracked
+    in a bitmap (one bit per address in the network).
+
+    Candidate addresses start at 'start_ip' (or the first host address)
+    and advance by 'increment'. The broadcast address is never allocated.
+    """
+
+    def __init__(self, address: str, netmask: str,
+                 start_ip: Optional[str] = None, increment: int = 1):
+        self._network = ipaddress.IPv4Network(
+            '%s/%s' % (address, netmask))
+
+        self._base = int(self._network.network_address)
+
+        self._bitmap = bytearray((self._network.num_addresses + 7) // 8)
+
+        self._increment = int(increment) if increment else 1
+
+        self._start = int(ipaddress.IPv4Address(str(start_ip))) - \
+            self._base if start_ip else 1
+
+        # Addresses at or beyond the broadcast address are not allocated
+        self._limit = self._network.num_addresses - 1
+
+        # Lowest index which may be free
+        self._next = self._start
+
+    @property
+    def network(self) -> ipaddress.IPv4Network:
+        return self._network
+
+    def __index(self, ip: str) -> Optional[int]:
+        index = int(ipaddress.IPv4Address(str(ip))) - self._base
+
+        return index if 0 <= index < self._network.num_addresses else None
+
+    def __is_set(self, index: int) -> bool:
+        return self._bitmap[index >> 3] & (1 << (index & 7)) != 0
+
+    def __find_free(self, index: int) -> Optional[int]:
+        if index < 0:
+            # Starting address is outside of network
+            return None
+
+        while index < self._limit:
+            if self._increment == 1:
+                # Skip over fully allocated bytes
+                match = _FREE_BYTE_RE.search(self._bitmap, index >> 3)
+
+                if not match:
+                    return None
+
+                index = max(index, match.start() << 3)
+
+                if index >= self._limit:
+                    return None
+
+            if not self.__is_set(index):
+                return index
+
+            index += self._increment
+
+        return None
+
+    def is_used(self, ip: str) -> bool:
+        index = self.__index(ip)
+
+        return index is not None and self.__is_set(index)
+
+    def mark_used(self, ips: Iterable[str]) -> None:
+        for ip in ips:
+            index = self.__index(ip)
+
+            if index is not None:
+                self._bitmap[index >> 3] |= 1 << (index & 7)
+
+    def release(self, ips: Iterable[str]) -> None:
+        for ip in ips:
+            index = self.__index(ip)
+
+            if index is None:
+                continue
+
+            self._bitmap[index >> 3] &= ~(1 << (index & 7)) & 0xff
+
+            if self._start <= index < self._next and \
+                    (index - self._start) % self._increment == 0:
+                self._next = index
+
+    def allocate(self, count: int = 1) -> List[str]:
+        """
+        Allocate 'count' addresses.
+
+        Raises:
+            InvalidArgument
+        """
+
+        indexes = []
+
+        index = self._next
+
+        while len(indexes) < count:
+            index = self.__find_free(index)
+
+            if index is None:
+                raise InvalidArgument('IP address space exhausted')
+
+            indexes.append(index)
+
+            index += self._increment
+
+        for index in indexes:
+            self._bitmap[index >> 3] |= 1 << (index & 7)
+
+        self._next = index
+
+        return [str(ipaddress.IPv4Address(self._base + index))
+                for index in indexes]
+
+
+def _get_network_key(network):
+    return (network.address, network.netmask, network.startIp,
+            network.increment)
+
+
+def _build_ip_allocator(network, reserved_ips: Iterable[str]) \
+        -> IpAllocator:
+    allocator = IpAllocator(network.address, network.netmask,
+                            start_ip=network.startIp,
+                            increment=network.increment)
+
+    allocator.mark_used(dbNic.ip for dbNic in network.nics
+                        if dbNic and dbNic.ip)
+
+    allocator.mark_used(reserved_ips)
+
+    return allocator
+
+
+def _get_used_ips(network, ips: List[str]) -> List[str]:
+    """
+    Return addresses in 'ips' already assigned to a NIC in the database
+    """
+
+    session = object_session(network)
+
+    if session is None:
+        return []
+
+    used_ips = []
+
+    for index in range(0, len(ips), _IN_CLAUSE_BATCH_SIZE):
+        used_ips.extend(
+            [ip for ip, in session.query(Nics.ip).filter(
+                Nics.ip.in_(ips[index:index + _IN_CLAUSE_BATCH_SIZE]))])
+
+    return used_ips
+
+
+def allocate_ip_addresses(network, count: int = 1,
+                          reserved_ips: Iterable[str] = ()) -> List[str]:
+    """
+    Allocate 'count' addresses on 'network' (a Networks database object).
+
+    The allocator for the network is built from the database on first
+    use. Allocated addresses are checked against the database to detect
+    addresses assigned by another process. The allocator is rebuilt
+    once if the address space appears to be exhausted.
+
+    Raises:
+        InvalidArgument
+    """
+
+    with ip_allocators_lock:
+        key = _get_network_key(network)
+
+        entry = ip_allocators.get(network.id)
+
+        rebuilt = entry is None or entry[0] != key
+
+        if rebuilt:
+            entry = (key, _build_ip_allocator(network, reserved_ips))
+
+            ip_allocators[network.id] = entry
+
+        allocator = entry[1]
+
+        ips = []
+
+        while len(ips) < count:
+            try:
+                candidates = allocator.allocate(count - len(ips))
+            except InvalidArgument:
+                allocator.release(ips)
+
+                if rebuilt:
+                    raise
+
+                logger.debug(
+                    'Rebuilding IP allocator for network [%s]' % (
+                        allocator.network))
+
+                allocator = _build_ip_allocator(network, reserved_ips)
+
+                ip_allocators[network.id] = (key, allocator)
+
+                rebuilt = True
+
+                ips = []
+
+                continue
+
+            used_ips = set(_get_used_ips(network, candidates))
+
+            ips.extend([ip for ip in candidates if ip not in used_ips])
+
+        return ips
+
+
+def release_ip_addresses(network_id: int, ips: Iterable[str]) -> None:
+    """
+    Return addresses to the allocator for the specified network
+    """
+
+    with ip_allocators_lock:
+        entry = ip_allocators.get(network_id)
+
+        if entry is not None:
+            entry[1].release(ips)
+
+
+def mark_ip_addresses_used(network_id: int, ips: Iterable[str]) -> None:
+    """
+    Mark addresses assigned without the allocator (ie. specified in an
+    add nodes request) as used
+    """
+
+    with ip_allocators_lock:
+        entry = ip_allocators.get(network_id)
+
+        if entry is not None:
+            entry[1].mark_used(ips)
@@ -0,0 +1,193 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import errno
+import glob
+import json
+import os
+import time
+import uuid
+from typing import Iterable, List, Optional
+
+from tortuga.config.configManager import ConfigManager
+
+
+class AddHostSessionStore(object):
+    """
+    Add host session state shared by all processes on this host.
+
+    Each session is a message log file, containing one JSON-encoded
+    status message per line, a marker file present while the session
+    is being processed and a marker file created when processing
+    completes. Messages are appended with a single write() to a
+    file opened with O_APPEND, so concurrent writers do not interleave.
+
+    Files are used rather than the database so status messages may be
+    written while a database transaction (ie. adding nodes) is open.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path or os.path.join(
+            ConfigManager().getRoot(), 'var', 'addhost')
+
+    def __get_log_path(self, session_id: str) -> str:
+        # Session ids are generated UUIDs; reject anything else so ids
+        # from requests cannot refer to other files
+        return os.path.join(self._path, '%s.log' % (uuid.UUID(session_id)))
+
+    def __get_running_path(self, session_id: str) -> str:
+        return os.path.join(
+            self._path, '%s.running' % (uuid.UUID(session_id)))
+
+    def __get_completed_path(self, session_id: str) -> str:
+        return os.path.join(
+            self._path, '%s.completed' % (uuid.UUID(session_id)))
+
+    def create(self) -> str:
+        """
+        Create new session and return its id
+        """
+
+        os.makedirs(self._path, exist_ok=True)
+
+        session_id = str(uuid.uuid4())
+
+        fd = os.open(self.__get_log_path(session_id),
+                     os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+
+        os.close(fd)
+
+        return session_id
+
+    def exists(self, session_id: str) -> bool:
+        try:
+            return os.path.exists(self.__get_log_path(session_id))
+        except ValueError:
+            return False
+
+    def append_message(self, session_id: str, msg: str) -> bool:
+        """
+        Append status message. Returns False if the session does not
+        exist.
+        """
+
+        data = (json.dumps(msg) + '\n').encode('utf-8')
+
+        try:
+            # No O_CREAT; messages for deleted sessions are dropped
+            fd = os.open(self.__get_log_path(session_id),
+                         os.O_WRONLY | os.O_APPEND)
+        except (OSError, ValueError):
+            return False
+
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+        return True
+
+    def get_messages(self, session_id: str, start: int = 0) -> List[str]:
+        """
+        Return status messages starting with message number 'start'
+
+        Raises:
+            KeyError
+        """
+
+        try:
+            with open(self.__get_log_path(session_id), 'rb') as fp:
+                lines = fp.read().splitlines()
+        except (OSError, ValueError):
+            raise KeyError(session_id)
+
+        return [json.loads(line.decode('utf-8')) for line in lines[start:]]
+
+    def set_running(self, session_id: str, running: bool) -> None:
+        """
+        Raises:
+            KeyError
+        """
+
+        if not self.exists(session_id):
+            raise KeyError(session_id)
+
+        running_path = self.__get_running_path(session_id)
+        completed_path = self.__get_completed_path(session_id)
+
+        # Failed requests may be processed again
+        _touch(running_path if running else completed_path)
+
+        _unlink(completed_path if running else running_path)
+
+    def is_running(self, session_id: str) -> bool:
+        try:
+            return os.path.exists(self.__get_running_path(session_id))
+        except ValueError:
+            return False
+
+    def is_completed(self, session_id: str) -> bool:
+        try:
+            return os.path.exists(self.__get_completed_path(session_id))
+        except ValueError:
+            return False
+
+    def evict(self, max_age: float) -> List[str]:
+        """
+        Delete sessions completed more than 'max_age' seconds ago.
+        Returns ids of deleted sessions.
+        """
+
+        expires = time.time() - max_age
+
+        session_ids = []
+
+        for path in glob.glob(os.path.join(self._path, '*.completed')):
+            try:
+                if os.stat(path).st_mtime >= expires:
+                    continue
+            except FileNotFoundError:
+                continue
+
+            session_ids.append(
+                os.path.splitext(os.path.basename(path))[0])
+
+        self.delete(session_ids)
+
+        return session_ids
+
+    def delete(self, session_ids: Iterable[str]) -> None:
+        for session_id in session_ids:
+            try:
+                paths = [self.__get_running_path(session_id),
+                         self.__get_completed_path(session_id),
+                         self.__get_log_path(session_id)]
+            except ValueError:
+                continue
+
+            for path in paths:
+                _unlink(path)
+
+
+def _touch(path: str) -> None:
+    with open(path, 'w'):
+        pass
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError as exc:
+        if exc.errno != errno.ENOENT:
+            raise
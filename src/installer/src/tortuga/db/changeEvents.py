@@ -0,0 +1,160 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Change events for nodes, profiles and add host sessions.
+
+Node and profile changes are collected as sessions are flushed and
+published when the transaction commits; changes rolled back are not
+published. Events are dicts containing 'type' (ADDED, MODIFIED or
+DELETED) and 'object' (the changed columns of the object).
+
+Events are only published once a publisher has been registered (ie. by
+the web service), so other processes do not track changes.
+"""
+
+import logging
+import threading
+
+import sqlalchemy
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .hardwareProfiles import HardwareProfiles
+from .nodes import Nodes
+from .softwareProfiles import SoftwareProfiles
+
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Topics and published columns of tracked classes
+TRACKED_CLASSES = {
+    Nodes: ('node', (
+        'id', 'name', 'state', 'hardwareProfileId', 'softwareProfileId',
+        'lockedState', 'isIdle', 'addHostSession')),
+    SoftwareProfiles: ('softwareprofile', ('id', 'name', 'type')),
+    HardwareProfiles: ('hardwareprofile', ('id', 'name')),
+}
+
+# Session.info key of events pending commit
+_PENDING_EVENTS_KEY = 'tortuga_change_events'
+
+_lock = threading.Lock()
+
+_publisher = None
+
+_listening = False
+
+
+def register_event_publisher(publisher):
+    """
+    Set function called as 'publisher(topic, event)' for each change
+    event, or None to stop publishing events
+    """
+
+    global _publisher, _listening  # pylint: disable=global-statement
+
+    with _lock:
+        _publisher = publisher
+
+        if publisher is not None and not _listening:
+            event.listen(Session, 'after_flush', _after_flush)
+            event.listen(Session, 'after_commit', _after_commit)
+            event.listen(Session, 'after_soft_rollback', _after_rollback)
+
+            _listening = True
+
+
+def publish_event(topic, event_type, obj):
+    """
+    Publish event immediately (for changes not made through the
+    database)
+    """
+
+    publisher = _publisher
+
+    if publisher is None:
+        return
+
+    try:
+        publisher(topic, {'type': event_type, 'object': obj})
+    except Exception:
+        logger.exception('Error publishing [%s] event' % (topic))
+
+
+def _get_object(instance, columns):
+    # Only use loaded values; attributes of deleted or expired instances
+    # cannot be loaded while flushing
+    values = sqlalchemy.inspect(instance).dict
+
+    return {column: values[column] for column in columns
+            if column in values}
+
+
+def _after_flush(session, flush_context):  # pylint: disable=unused-argument
+    if _publisher is None:
+        return
+
+    pending = session.info.setdefault(_PENDING_EVENTS_KEY, {})
+
+    for instances, event_type in ((session.new, 'ADDED'),
+                                  (session.dirty, 'MODIFIED'),
+                                  (session.deleted, 'DELETED')):
+        for instance in instances:
+            tracked = TRACKED_CLASSES.get(type(instance))
+
+            if tracked is None:
+                continue
+
+            if event_type == 'MODIFIED' and not session.is_modified(
+                    instance, include_collections=False):
+                continue
+
+            topic, columns = tracked
+
+            obj = _get_object(instance, columns)
+
+            key = (topic, obj.get('id'))
+
+            previous = pending.get(key)
+
+            change_type = event_type
+
+            # Object added and modified in the same transaction
+            if previous is not None and previous['type'] == 'ADDED' and \
+                    change_type == 'MODIFIED':
+                change_type = 'ADDED'
+
+            # Publish in order of last change
+            pending.pop(key, None)
+
+            pending[key] = {'type': change_type, 'object': obj}
+
+
+def _after_commit(session):
+    events = session.info.pop(_PENDING_EVENTS_KEY, None)
+
+    if not events:
+        return
+
+    for (topic, _), change in events.items():
+        publish_event(topic, change['type'], change['object'])
+
+
+def _after_rollback(session, previous_transaction): \
+        # pylint: disable=unused-argument
+    if previous_transaction.parent is None:
+        # Outermost transaction rolled back
+        session.info.pop(_PENDING_EVENTS_KEY, None)
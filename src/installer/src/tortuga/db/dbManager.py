@@ -18,6 +18,7 @@
 import configparser
 from logging import getLogger
 import os
+import threading
 
 import sqlalchemy
 import sqlalchemy.orm
@@ -89,6 +90,14 @@ class DbManagerBase(TortugaObjectManager):
 
         self._metadata = sqlalchemy.MetaData(self._engine)
         self._mapped_tables = {}
+        self._tables_mapped = False
+
+        # Per-thread stack of sessions returned by openSession()
+        self._open_sessions = threading.local()
+
+        # Serializes creation of the session factory by concurrent first
+        # callers of openSession()
+        self._session_factory_lock = threading.Lock()
 
     def _map_db_tables(self):
         #
@@ -108,12 +117,19 @@ class DbManagerBase(TortugaObjectManager):
                 self._mapped_tables[key] = table_mapper()
                 self._mapped_tables[key].map(self)
 
+        self._tables_mapped = True
+
     @property
     def engine(self):
         """
         SQLAlchemy Engine object property
+
+        Tables are mapped on first access only. init_database() maps
+        tables provided by kits installed subsequently.
         """
-        self._map_db_tables()
+        if not self._tables_mapped:
+            self._map_db_tables()
+
         return self._engine
 
     def session(self):
@@ -133,6 +149,37 @@ class DbManagerBase(TortugaObjectManager):
             self.getLogger().exception('SQLAlchemy raised exception')
             raise DbError('Check database settings or credentials')
 
+        self.upgrade_database()
+
+    def upgrade_database(self):
+        """
+        Upgrade tables created by a previous release to the current
+        schema
+        """
+        for table_mapper in list(self._mapped_tables.values()):
+            table_mapper.upgrade(self)
+
+        self.__create_missing_indexes()
+
+    def __create_missing_indexes(self):
+        inspector = sqlalchemy.inspect(self.engine)
+
+        table_names = inspector.get_table_names()
+
+        for table in self._metadata.sorted_tables:
+            if table.name not in table_names:
+                continue
+
+            index_names = [
+                index['name'] for index in inspector.get_indexes(table.name)
+            ]
+
+            for index in table.indexes:
+                if index.name not in index_names:
+                    logger.info('Creating index: {}'.format(index.name))
+
+                    index.create(self.engine)
+
     @property
     def metadata(self):
         return self._metadata
@@ -259,18 +306,82 @@ class DbManagerBase(TortugaObjectManager):
     def getMetadataTable(self, table):
         return self._metadata.tables[table]
 
+    def getPoolStatus(self):
+        """
+        Return dict containing connection pool metrics. Metrics not
+        supported by the pool implementation in use are None.
+        """
+
+        pool = self._engine.pool
+
+        def _get_metric(name):
+            value = getattr(pool, name, None)
+
+            if not callable(value):
+                return value
+
+            try:
+                return value()
+            except (AttributeError, NotImplementedError):
+                return None
+
+        return {
+            'pool': pool.__class__.__name__,
+            'size': _get_metric('size'),
+            'checkedin': _get_metric('checkedin'),
+            'checkedout': _get_metric('checkedout'),
+            'overflow': _get_metric('overflow'),
+        }
+
     def openSession(self):
-        """ Open db session. """
-        session_factory = sqlalchemy.orm.sessionmaker(bind=self.engine)
-        self.Session = sqlalchemy.orm.scoped_session(session_factory)
+        """
+        Open db session.
+
+        The session factory is created once and shared by all callers.
+        As before, each call returns a new session, so nested calls (ie.
+        DbApi methods committing or rolling back their own changes) do
+        not affect the transaction of the caller's session.
+        """
+
+        if self.Session is None:
+            with self._session_factory_lock:
+                if self.Session is None:
+                    session_factory = sqlalchemy.orm.sessionmaker(
+                        bind=self.engine)
 
-        return self.Session()
+                    self.Session = sqlalchemy.orm.scoped_session(
+                        session_factory)
+
+        sessions = self.__get_open_sessions()
+
+        # The outermost session is the thread's scoped session
+        session = self.Session.session_factory() if sessions else \
+            self.Session()
+
+        sessions.append(session)
+
+        return session
 
     def closeSession(self):
-        """Close scoped_session."""
+        """Close most recently opened session."""
+
+        sessions = self.__get_open_sessions()
+
+        if len(sessions) > 1:
+            sessions.pop().close()
+
+            return
+
+        del sessions[:]
 
         self.Session.remove()
 
+    def __get_open_sessions(self):
+        if not hasattr(self._open_sessions, 'sessions'):
+            self._open_sessions.sessions = []
+
+        return self._open_sessions.sessions
+
 
 class DbManager(DbManagerBase, Singleton):
     pass
@@ -127,10 +127,14 @@ class HardwareProfileDbApi(TortugaDbApi):
         finally:
             DbManager().closeSession()
 
-    def getHardwareProfileList(self, optionDict=None, tags=None):
+    def getHardwareProfileList(self, optionDict=None, tags=None,
+                               fields=None):
         """
         Get list of all available hardwareProfiles from the db.
 
+        If 'fields' is specified, only the named fields are returned and
+        relations not required by them are not loaded.
+
             Returns:
                 [hardwareProfile]
             Throws:
@@ -140,23 +144,25 @@ class HardwareProfileDbApi(TortugaDbApi):
         session = DbManager().openSession()
 
         try:
+            # For now expand networks
+            relations = self.getRelationsForFields(
+                dict(optionDict or {}, hardwareprofilenetworks=True,
+                     tags=True, nics=True),
+                fields, fieldMap={'networks': 'hardwareprofilenetworks'})
+
             dbHardwareProfileList = self._hardwareProfilesDbHandler.\
-                getHardwareProfileList(session, tags=tags)
+                getHardwareProfileList(
+                    session, tags=tags, relations=list(relations))
 
             hardwareProfileList = TortugaObjectList()
 
             for dbHardwareProfile in dbHardwareProfileList:
-                # For now expand networks
-                self.loadRelation(
-                    dbHardwareProfile, 'hardwareprofilenetworks')
-
-                self.loadRelations(dbHardwareProfile, optionDict or {})
-
-                self.loadRelations(dbHardwareProfile, dict(tags=True))
+                self.loadRelations(dbHardwareProfile, relations)
 
                 hardwareProfileList.append(
-                    HardwareProfile.getFromDbDict(
-                        dbHardwareProfile.__dict__))
+                    self.projectFields(
+                        HardwareProfile.getFromDbDict(
+                            dbHardwareProfile.__dict__), fields))
 
             return hardwareProfileList
         except TortugaException as ex:
@@ -15,6 +15,7 @@
 # pylint: disable=not-callable,multiple-statements,no-member
 
 from sqlalchemy import or_, and_
+from sqlalchemy.orm import lazyload
 from sqlalchemy.orm.exc import NoResultFound
 
 from tortuga.db.tortugaDbObjectHandler import TortugaDbObjectHandler
@@ -70,9 +71,12 @@ class HardwareProfilesDbHandler(TortugaDbObjectHandler):
 
         return dbHardwareProfile
 
-    def getHardwareProfileList(self, session, tags=None):
+    def getHardwareProfileList(self, session, tags=None, relations=None):
         """
         Get list of hardwareProfiles from the db.
+
+        If 'relations' is specified, eagerly loaded relations not named in
+        it are not loaded.
         """
 
         self.getLogger().debug('Retrieving hardware profile list')
@@ -88,7 +92,12 @@ class HardwareProfilesDbHandler(TortugaDbObjectHandler):
             else:
                 searchspec.append(HardwareProfiles.tags.any(name=tag[0]))
 
-        return session.query(HardwareProfiles).filter(
+        query = session.query(HardwareProfiles)
+
+        if relations is not None and 'nics' not in relations:
+            query = query.options(lazyload(HardwareProfiles.nics))
+
+        return query.filter(
             or_(*searchspec)).order_by(HardwareProfiles.name).all()
 
     def setIdleSoftwareProfile(self, dbHardwareProfile,
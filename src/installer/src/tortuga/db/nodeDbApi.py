@@ -33,6 +33,19 @@ class NodeDbApi(TortugaDbApi):
     Nodes DB API class.
     """
 
+    # Relations loaded for node lists
+    NODE_LIST_RELATIONS = {
+        'nics': True,
+        'tags': True,
+        'hardwareprofile': True,
+        'softwareprofile': True,
+    }
+
+    # Node fields populated from a relation with a different name
+    NODE_FIELD_RELATIONS = {
+        'resource_adapter': 'hardwareprofile',
+    }
+
     def __init__(self):
         TortugaDbApi.__init__(self)
 
@@ -72,9 +85,10 @@ class NodeDbApi(TortugaDbApi):
         finally:
             DbManager().closeSession()
 
-    def getNodesByAddHostSession(self, ahSession):
+    def getNodesByAddHostSession(self, ahSession, after=None):
         """
-        Get node(s) from db based their addhost session
+        Get node(s) from db based their addhost session, optionally only
+        those with ids greater than 'after'
         """
 
         session = DbManager().openSession()
@@ -82,7 +96,7 @@ class NodeDbApi(TortugaDbApi):
         try:
             return self.__convert_nodes_to_TortugaObjectList(
                 self._nodesDbHandler.getNodesByAddHostSession(
-                    session, ahSession))
+                    session, ahSession, after=after))
         except TortugaException as ex:
             raise
         except Exception as ex:
@@ -144,28 +158,76 @@ class NodeDbApi(TortugaDbApi):
         finally:
             DbManager().closeSession()
 
-    def __convert_nodes_to_TortugaObjectList(self, nodes, relations=None):
+    def getNodesByIps(self, ips):
+        """
+        Get nodes by IP address
+
+            Returns:
+                dict of nodes keyed on IP address; addresses not assigned
+                to any node are omitted
+            Throws:
+                DbError
+        """
+
+        session = DbManager().openSession()
+
+        try:
+            dbNodes = self._nodesDbHandler.getNodesByIps(session, ips)
+
+            # Profiles are shared by many nodes; convert each only once
+            profile_cache = {}
+
+            nodes = {}
+
+            for dbNode in set(dbNodes.values()):
+                nodes[dbNode.id] = Node.getFromDbDict(
+                    dbNode.__dict__, profile_cache=profile_cache)
+
+            return {
+                ip: nodes[dbNode.id] for ip, dbNode in dbNodes.items()
+            }
+        except TortugaException as ex:
+            raise
+        except Exception as ex:
+            self.getLogger().exception('%s' % ex)
+            raise
+        finally:
+            DbManager().closeSession()
+
+    def __convert_nodes_to_TortugaObjectList(self, nodes, relations=None,
+                                             fields=None):
         nodeList = TortugaObjectList()
 
         relations = relations or dict(softwareprofile=True,
                                       hardwareprofile=True)
 
+        # Always load 'tags' relation
+        relations = self.getRelationsForFields(
+            dict(relations, tags=True), fields,
+            fieldMap=self.NODE_FIELD_RELATIONS)
+
+        # Profiles are shared by many nodes; convert each only once
+        profile_cache = {}
+
         for t in nodes:
             self.loadRelations(t, relations)
 
-            # Always load 'tags' relation
-            self.loadRelations(t, {'tags': True})
-
-            node = Node.getFromDbDict(t.__dict__)
+            node = Node.getFromDbDict(t.__dict__, profile_cache=profile_cache)
 
-            nodeList.append(node)
+            nodeList.append(self.projectFields(node, fields))
 
         return nodeList
 
-    def getNodeList(self, tags=None):
+    def getNodeList(self, tags=None, limit=None, after=None, fields=None):
         """
         Get list of all available nodes from the db.
 
+        Use 'limit' and 'after' (name of last node in previous page) to
+        retrieve the node list in pages.
+
+        If 'fields' is specified, only the named fields are returned and
+        relations not required by them are not loaded.
+
             Returns:
                 [node]
             Throws:
@@ -175,8 +237,15 @@ class NodeDbApi(TortugaDbApi):
         session = DbManager().openSession()
 
         try:
+            relations = self.getRelationsForFields(
+                self.NODE_LIST_RELATIONS, fields,
+                fieldMap=self.NODE_FIELD_RELATIONS)
+
             return self.__convert_nodes_to_TortugaObjectList(
-                self._nodesDbHandler.getNodeList(session, tags=tags))
+                self._nodesDbHandler.getNodeList(
+                    session, tags=tags, limit=limit, after=after,
+                    relations=list(relations)),
+                fields=fields)
         except TortugaException as ex:
             raise
         except Exception as ex:
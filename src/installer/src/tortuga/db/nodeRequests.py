@@ -16,3 +16,5 @@ class NodeRequests(object):
     def __init__(self, node_request=None):
         self.request = node_request
         self.state = 'pending'
+        self.priority = 0
+        self.attempts = 0
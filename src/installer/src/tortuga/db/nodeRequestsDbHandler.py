@@ -14,10 +14,22 @@
 
 # pylint: disable=not-callable,no-member,multiple-statements
 
+from sqlalchemy import and_, or_
+
 from tortuga.db.tortugaDbObjectHandler import TortugaDbObjectHandler
 from tortuga.db.nodeRequests import NodeRequests
 
 
+def _claimable(now):
+    # Pending requests that are due and requests whose lease has expired
+    return or_(
+        and_(NodeRequests.state == 'pending',
+             or_(NodeRequests.next_attempt == None,  # noqa
+                 NodeRequests.next_attempt <= now)),
+        and_(NodeRequests.state == 'processing',
+             NodeRequests.lease_expires < now))
+
+
 class NodeRequestsDbHandler(TortugaDbObjectHandler):
     """Accessor methods for NodeRequests table
     """
@@ -39,3 +51,77 @@ class NodeRequestsDbHandler(TortugaDbObjectHandler):
             # pylint: disable=no-self-use
         return session.query(NodeRequests).filter(
             NodeRequests.addHostSession == addHostSession).first()
+
+    def get_claimable(self, session, now, limit): \
+            # pylint: disable=no-self-use
+        """
+        Return up to 'limit' requests that are pending and due or whose
+        lease has expired, highest priority first and oldest first
+        within a priority
+        """
+
+        return session.query(NodeRequests).filter(
+            _claimable(now)).order_by(
+                NodeRequests.priority.desc(),
+                NodeRequests.id).limit(limit).all()
+
+    def claim(self, session, node_request_id, owner, lease_expires, now): \
+            # pylint: disable=no-self-use
+        """
+        Atomically take the lease on request 'node_request_id'. Returns
+        False if another process claimed the request first.
+
+        The caller must commit the session.
+        """
+
+        count = session.query(NodeRequests).filter(
+            NodeRequests.id == node_request_id,
+            _claimable(now)).update({
+                'state': 'processing',
+                'lease_owner': owner,
+                'lease_expires': lease_expires,
+                'attempts': NodeRequests.attempts + 1,
+                'last_update': now,
+            }, synchronize_session=False)
+
+        return count == 1
+
+    def renew_leases(self, session, owner, node_request_ids,
+                     lease_expires): \
+            # pylint: disable=no-self-use
+        """
+        Extend leases held by 'owner'. Returns number of leases renewed.
+
+        The caller must commit the session.
+        """
+
+        if not node_request_ids:
+            return 0
+
+        return session.query(NodeRequests).filter(
+            NodeRequests.id.in_(node_request_ids),
+            NodeRequests.state == 'processing',
+            NodeRequests.lease_owner == owner).update({
+                'lease_expires': lease_expires,
+            }, synchronize_session=False)
+
+    def release_leases(self, session, owner, node_request_ids): \
+            # pylint: disable=no-self-use
+        """
+        Return requests leased by 'owner' to the pending state so they
+        may be claimed by any process.
+
+        The caller must commit the session.
+        """
+
+        if not node_request_ids:
+            return 0
+
+        return session.query(NodeRequests).filter(
+            NodeRequests.id.in_(node_request_ids),
+            NodeRequests.state == 'processing',
+            NodeRequests.lease_owner == owner).update({
+                'state': 'pending',
+                'lease_owner': None,
+                'lease_expires': None,
+            }, synchronize_session=False)
@@ -18,14 +18,16 @@ import time
 from typing import List, Union
 
 from sqlalchemy import and_, or_
+from sqlalchemy.orm import lazyload, selectinload
 from sqlalchemy.orm.exc import NoResultFound
-from sqlalchemy import func
 
 from tortuga.db.tortugaDbObjectHandler import TortugaDbObjectHandler
 from tortuga.db.nodes import Nodes
 from tortuga.db.nics import Nics
 from tortuga.db.softwareProfiles import SoftwareProfiles
+from tortuga.db.hardwareProfiles import HardwareProfiles
 from tortuga.kit.actions.kitActionsManager import KitActionsManager
+from tortuga.addhost.ipAllocator import release_ip_addresses
 from tortuga.exceptions.nodeNotFound import NodeNotFound
 from tortuga.exceptions.nodeSoftwareProfileLocked \
     import NodeSoftwareProfileLocked
@@ -53,6 +55,9 @@ class NodesDbHandler(TortugaDbObjectHandler):
     NODE_STATE_INSTALLED = 'Installed'
     NODE_STATE_DELETED = 'Deleted'
 
+    # Maximum number of values in a single SQL 'IN' clause
+    IN_CLAUSE_BATCH_SIZE = 500
+
     def __init__(self):
         TortugaDbObjectHandler.__init__(self)
 
@@ -81,6 +86,39 @@ class NodesDbHandler(TortugaDbObjectHandler):
         return self.__getNodeState(dbNode) == \
             NodesDbHandler.NODE_STATE_INSTALLED
 
+    def __node_list_query(self, session, relations=None):
+        """
+        Return query for Nodes with the relations required to build node
+        lists eagerly loaded.
+
+        NICs are already loaded using a join (see NodesTableMapper).
+        Tags, hardware profiles (including resource adapter), and software
+        profiles are loaded with one additional SELECT each, regardless of
+        the number of nodes returned.
+
+        If 'relations' is specified, only the named relations are loaded.
+        """
+
+        if relations is None:
+            relations = ('nics', 'tags', 'hardwareprofile', 'softwareprofile')
+
+        options = []
+
+        if 'nics' not in relations:
+            options.append(lazyload(Nodes.nics))
+
+        if 'tags' in relations:
+            options.append(selectinload(Nodes.tags))
+
+        if 'hardwareprofile' in relations:
+            options.append(selectinload(Nodes.hardwareprofile).joinedload(
+                HardwareProfiles.resourceadapter))
+
+        if 'softwareprofile' in relations:
+            options.append(selectinload(Nodes.softwareprofile))
+
+        return session.query(Nodes).options(*options)
+
     def getNode(self, session, name):
         """
         Return node.
@@ -89,17 +127,23 @@ class NodesDbHandler(TortugaDbObjectHandler):
             NodeNotFound
         """
 
+        # Case-insensitive lookups use the indexed 'lowerName' column
+        lower_name = name.lower()
+
         try:
             if '.' in name:
                 # Attempt exact match on fully-qualfied name
                 return session.query(Nodes).filter(
-                    func.lower(Nodes.name) == name.lower()).one()
+                    Nodes.lowerName == lower_name).one()
 
             # 'name' is short host name; attempt to match on either short
-            # host name or any host starting with same host name
+            # host name or any host starting with same host name. The
+            # prefix match is expressed as a range ('/' follows '.') to
+            # allow use of the index.
             return session.query(Nodes).filter(
-                or_(func.lower(Nodes.name) == name.lower(),
-                    func.lower(Nodes.name).like(name.lower() + '.%'))).one()
+                or_(Nodes.lowerName == lower_name,
+                    and_(Nodes.lowerName >= lower_name + '.',
+                         Nodes.lowerName < lower_name + '/'))).one()
         except NoResultFound:
             raise NodeNotFound("Node [%s] not found" % (name))
 
@@ -142,17 +186,25 @@ class NodesDbHandler(TortugaDbObjectHandler):
 
         return session.query(Nodes).filter(or_(*searchspec)).all()
 
-    def getNodesByAddHostSession(self, session, ahSession):
+    def getNodesByAddHostSession(self, session, ahSession, after=None):
         """
         Get nodes by add host session
         Returns a list of nodes
+
+        If 'after' is specified, only nodes with ids greater than 'after'
+        are returned, ordered by id.
         """
 
         self.getLogger().debug(
             'getNodesByAddHostSession(): ahSession [%s]' % (ahSession))
 
-        return session.query(Nodes).filter(
-            Nodes.addHostSession == ahSession).order_by(Nodes.name).all()
+        query = self.__node_list_query(session).filter(
+            Nodes.addHostSession == ahSession)
+
+        if after is not None:
+            return query.filter(Nodes.id > after).order_by(Nodes.id).all()
+
+        return query.order_by(Nodes.name).all()
 
     def getNodesByNameFilter(self, session,
                              filter_spec: Union[str, list]) -> List[Nodes]:
@@ -162,6 +214,21 @@ class NodesDbHandler(TortugaDbObjectHandler):
         Returns a list of Nodes
         """
 
+        return session.query(Nodes).filter(
+            self.__get_name_filter(filter_spec)).all()
+
+    def getNodeNamesByNameFilter(self, session,
+                                 filter_spec: Union[str, list]) -> List[str]:
+        """
+        Same as getNodesByNameFilter(), but returns only the node names
+        """
+
+        return [
+            name for name, in session.query(Nodes.name).filter(
+                self.__get_name_filter(filter_spec))
+        ]
+
+    def __get_name_filter(self, filter_spec: Union[str, list]):
         filter_spec_list = [filter_spec] \
             if type(filter_spec) is not list else filter_spec
 
@@ -181,7 +248,7 @@ class NodesDbHandler(TortugaDbObjectHandler):
             # (ie. "hostname-01.domain")
             node_filter.append(Nodes.name.like(filter_spec_item))
 
-        return session.query(Nodes).filter(or_(*node_filter)).all()
+        return or_(*node_filter)
 
     def getNodeById(self, session, _id):
         """
@@ -215,10 +282,41 @@ class NodesDbHandler(TortugaDbObjectHandler):
             raise NodeNotFound(
                 'Node with IP address [%s] not found.' % (ip))
 
-    def getNodeList(self, session, softwareProfile=None, tags=None):
+    def getNodesByIps(self, session, ips):
+        """
+        Return dict of nodes keyed on IP address for all addresses in
+        'ips'. Addresses not assigned to any node are omitted.
+        """
+
+        result = {}
+
+        wanted = set(ips)
+
+        ips = list(wanted)
+
+        # Limit number of bound parameters per query
+        for index in range(0, len(ips), self.IN_CLAUSE_BATCH_SIZE):
+            for dbNode in session.query(Nodes).join(Nics).filter(
+                    Nics.ip.in_(ips[index:index + self.IN_CLAUSE_BATCH_SIZE])):
+                for dbNic in dbNode.nics:
+                    if dbNic.ip in wanted:
+                        result[dbNic.ip] = dbNode
+
+        return result
+
+    def getNodeList(self, session, softwareProfile=None, tags=None,
+                    limit=None, after=None, relations=None):
         """
         Get sorted list of nodes from the db.
 
+        'limit' and 'after' allow retrieving the node list in pages
+        ordered by node name. 'after' is the name of the last node in the
+        previous page.
+
+        'relations' optionally restricts the relations loaded along with
+        the nodes (default: 'nics', 'tags', 'hardwareprofile', and
+        'softwareprofile').
+
         Raises:
             SoftwareProfileNotFound
         """
@@ -229,22 +327,33 @@ class NodesDbHandler(TortugaDbObjectHandler):
             dbSoftwareProfile = self._softwareProfilesDbHandler.\
                 getSoftwareProfile(session, softwareProfile)
 
-            return dbSoftwareProfile.nodes
+            query = self.__node_list_query(session, relations).filter(
+                Nodes.softwareProfileId == dbSoftwareProfile.id)
+        else:
+            searchspec = []
 
-        searchspec = []
+            if tags:
+                # Build searchspec from specified tags
+                for tag in tags:
+                    if len(tag) == 2:
+                        searchspec.append(
+                            and_(Nodes.tags.any(name=tag[0]),
+                                 Nodes.tags.any(value=tag[1])))
+                    else:
+                        searchspec.append(Nodes.tags.any(name=tag[0]))
 
-        if tags:
-            # Build searchspec from specified tags
-            for tag in tags:
-                if len(tag) == 2:
-                    searchspec.append(
-                        and_(Nodes.tags.any(name=tag[0]),
-                             Nodes.tags.any(value=tag[1])))
-                else:
-                    searchspec.append(Nodes.tags.any(name=tag[0]))
+            query = self.__node_list_query(session, relations).filter(
+                or_(*searchspec))
 
-        return session.query(Nodes).filter(
-            or_(*searchspec)).order_by(Nodes.name).all()
+        if after is not None:
+            query = query.filter(Nodes.name > after)
+
+        query = query.order_by(Nodes.name)
+
+        if limit is not None:
+            query = query.limit(limit)
+
+        return query.all()
 
     def getNodeListByNodeStateAndSoftwareProfileName(self, session,
                                                      nodeState,
@@ -344,19 +453,20 @@ class NodesDbHandler(TortugaDbObjectHandler):
             # Call the resource adapter
             adapter.deleteNode(dbNodeList)
 
-            # Iterate over all nodes in hardware profile, completing the
-            # delete operation.
-            for dbNode in dbNodeList:
-                # Remove PXE boot file and remove lease from dhcp server
-                if hwProfile.location == 'local':
-                    # Only attempt to remove local boot configuration for
-                    # nodes that are marked as 'local'
-                    bhm = osUtility.getOsObjectFactory().\
-                        getOsBootHostManager()
+            # Remove PXE boot files and remove leases from dhcp server
+            if hwProfile.location == 'local':
+                # Only attempt to remove local boot configuration for
+                # nodes that are marked as 'local'
+                bhm = osUtility.getOsObjectFactory().getOsBootHostManager()
 
+                for dbNode in dbNodeList:
                     bhm.rmPXEFile(dbNode)
-                    bhm.removeDhcpLease(dbNode)
 
+                bhm.removeDhcpLeases(dbNodeList)
+
+            # Iterate over all nodes in hardware profile, completing the
+            # delete operation.
+            for dbNode in dbNodeList:
                 # Iterate over nics belonging to node
                 for dbNic in dbNode.nics:
                     try:
@@ -374,6 +484,10 @@ class NodesDbHandler(TortugaDbObjectHandler):
 
                 # Delete all associated NICs
                 for item in dbNode.nics:
+                    if item.ip and item.networkId:
+                        # Return IP address to provisioning network
+                        release_ip_addresses(item.networkId, [item.ip])
+
                     session.delete(item)
 
                 for tag in dbNode.tags:
@@ -47,6 +47,8 @@ class ResourceAdapterDbApi(TortugaDbApi):
             raise
         except Exception as ex:
             self.getLogger().exception(str(ex))
+        finally:
+            DbManager().closeSession()
 
         return resourceAdapterObj
 
@@ -85,6 +87,8 @@ class ResourceAdapterDbApi(TortugaDbApi):
             raise
         except Exception as ex:
             self.getLogger().exception(str(ex))
+        finally:
+            DbManager().closeSession()
 
         # Success!
         self.getLogger().info('Added resource adapter [%s]' % (name))
@@ -115,6 +119,8 @@ class ResourceAdapterDbApi(TortugaDbApi):
             raise
         except Exception as ex:
             self.getLogger().exception(str(ex))
+        finally:
+            DbManager().closeSession()
 
         # Success!
         self.getLogger().info('Deleted resource adapter [%s]' % (name))
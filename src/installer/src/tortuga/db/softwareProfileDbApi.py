@@ -124,10 +124,13 @@ class SoftwareProfileDbApi(TortugaDbApi):
         finally:
             DbManager().closeSession()
 
-    def getSoftwareProfileList(self, tags=None):
+    def getSoftwareProfileList(self, tags=None, fields=None):
         """
         Get list of all available softwareProfiles from the db.
 
+        If 'fields' is specified, only the named fields are returned and
+        relations not required by them are not loaded.
+
             Returns:
                 [softwareProfile]
             Throws:
@@ -137,22 +140,27 @@ class SoftwareProfileDbApi(TortugaDbApi):
         session = DbManager().openSession()
 
         try:
+            relations = self.getRelationsForFields({
+                'components': True,
+                'partitions': True,
+                'hardwareprofiles': True,
+                'tags': True,
+                'os': True,
+            }, fields)
+
             dbSoftwareProfileList = self._softwareProfilesDbHandler.\
-                getSoftwareProfileList(session, tags=tags)
+                getSoftwareProfileList(
+                    session, tags=tags, relations=list(relations))
 
             softwareProfileList = TortugaObjectList()
 
             for dbSoftwareProfile in dbSoftwareProfileList:
-                self.loadRelations(dbSoftwareProfile, {
-                    'components': True,
-                    'partitions': True,
-                    'hardwareprofiles': True,
-                    'tags': True,
-                })
+                self.loadRelations(dbSoftwareProfile, relations)
 
                 softwareProfileList.append(
-                    SoftwareProfile.getFromDbDict(
-                        dbSoftwareProfile.__dict__))
+                    self.projectFields(
+                        SoftwareProfile.getFromDbDict(
+                            dbSoftwareProfile.__dict__), fields))
 
             return softwareProfileList
         except TortugaException as ex:
@@ -954,41 +962,44 @@ class SoftwareProfileDbApi(TortugaDbApi):
                             dstSoftwareProfileName):
         session = DbManager().openSession()
 
-        srcSoftwareProfile = self.getSoftwareProfile(
-            srcSoftwareProfileName, {
-                'partitions': True,
-                'packages': True,
-                'components': True,
-            })
+        try:
+            srcSoftwareProfile = self.getSoftwareProfile(
+                srcSoftwareProfileName, {
+                    'partitions': True,
+                    'packages': True,
+                    'components': True,
+                })
 
-        dstSoftwareProfile = self.getSoftwareProfile(
-            srcSoftwareProfileName)
-        dstSoftwareProfile.setName(dstSoftwareProfileName)
-        newDescription = 'Copy of %s' % (
-            dstSoftwareProfile.getDescription())
-        dstSoftwareProfile.setDescription(newDescription)
+            dstSoftwareProfile = self.getSoftwareProfile(
+                srcSoftwareProfileName)
+            dstSoftwareProfile.setName(dstSoftwareProfileName)
+            newDescription = 'Copy of %s' % (
+                dstSoftwareProfile.getDescription())
+            dstSoftwareProfile.setDescription(newDescription)
 
-        # partitions
-        dstSoftwareProfile.setPartitions(
-            srcSoftwareProfile.getPartitions())
+            # partitions
+            dstSoftwareProfile.setPartitions(
+                srcSoftwareProfile.getPartitions())
 
-        # packages
-        dstSoftwareProfile.setPackages(srcSoftwareProfile.getPackages())
+            # packages
+            dstSoftwareProfile.setPackages(srcSoftwareProfile.getPackages())
 
-        # Finally add the software profile
-        dstSoftwareProfile = self.addSoftwareProfile(
-            dstSoftwareProfile, session)
+            # Finally add the software profile
+            dstSoftwareProfile = self.addSoftwareProfile(
+                dstSoftwareProfile, session)
 
-        # Enable components separately
-        srcCompList = self.getEnabledComponentList(srcSoftwareProfileName)
+            # Enable components separately
+            srcCompList = self.getEnabledComponentList(srcSoftwareProfileName)
 
-        for srcComp in srcCompList:
-            if srcComp.getKit().getIsOs() or srcComp.getName() == 'core':
-                self._softwareProfilesDbHandler.\
-                    addComponentToSoftwareProfileEx(
-                        session, srcComp.getId(), dstSoftwareProfile)
+            for srcComp in srcCompList:
+                if srcComp.getKit().getIsOs() or srcComp.getName() == 'core':
+                    self._softwareProfilesDbHandler.\
+                        addComponentToSoftwareProfileEx(
+                            session, srcComp.getId(), dstSoftwareProfile)
 
-        session.commit()
+            session.commit()
+        finally:
+            DbManager().closeSession()
 
     def getUsableNodes(self, name):
         """
@@ -14,6 +14,7 @@
 
 # pylint: disable=not-callable,multiple-statements,no-member
 
+from sqlalchemy.orm import lazyload
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy import and_, or_
 
@@ -85,9 +86,12 @@ class SoftwareProfilesDbHandler(TortugaDbObjectHandler):
 
         return dbSoftwareProfile
 
-    def getSoftwareProfileList(self, session, tags=None):
+    def getSoftwareProfileList(self, session, tags=None, relations=None):
         """
         Get list of softwareProfiles from the db.
+
+        If 'relations' is specified, eagerly loaded relations not named in
+        it are not loaded.
         """
 
         self.getLogger().debug('Retrieving software profile list')
@@ -104,7 +108,17 @@ class SoftwareProfilesDbHandler(TortugaDbObjectHandler):
                 else:
                     searchspec.append(SoftwareProfiles.tags.any(name=tag[0]))
 
-        return session.query(SoftwareProfiles).filter(
+        query = session.query(SoftwareProfiles)
+
+        if relations is not None:
+            if 'os' not in relations:
+                query = query.options(lazyload(SoftwareProfiles.os))
+
+            if 'hardwareprofiles' not in relations:
+                query = query.options(
+                    lazyload(SoftwareProfiles.hardwareprofiles))
+
+        return query.filter(
             or_(*searchspec)).order_by(SoftwareProfiles.name).all()
 
     def getIdleSoftwareProfileList(self, session):
@@ -21,3 +21,13 @@ class TableMapper:
 
         """
         pass
+
+    def upgrade(self, db_manager):
+        """
+        Upgrades existing table(s) to the current schema. Called after
+        tables have been mapped and created.
+
+        :param db_manager: an instance of DbManagerBase
+
+        """
+        pass
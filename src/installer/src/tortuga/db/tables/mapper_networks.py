@@ -87,6 +87,8 @@ class NicsTableMapper(TableMapper):
         Index('Nics_nodeId', nics_table.c.nodeId)
         Index('Nics_networkId', nics_table.c.networkId)
         Index('Nics_networkDeviceId', nics_table.c.networkDeviceId)
+        Index('Nics_ip', nics_table.c.ip)
+        Index('Nics_mac', nics_table.c.mac)
 
         mapper(Nics, nics_table, properties={
             'network': relation(
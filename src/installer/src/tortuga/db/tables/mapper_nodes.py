@@ -12,9 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from logging import getLogger
+
 from sqlalchemy import Sequence
 from sqlalchemy import (Table, Boolean, Column, DateTime, ForeignKey, Index,
-                        Integer, String, Text, UniqueConstraint)
+                        Integer, String, Text, UniqueConstraint, event, func,
+                        inspect)
 from sqlalchemy.orm import mapper, relation
 
 from .mapper import TableMapper
@@ -26,6 +29,14 @@ from ..nodeTags import NodeTags
 from ..tags import Tags
 
 
+logger = getLogger(__name__)
+
+
+def _set_lower_name(mapper_, connection, target): \
+        # pylint: disable=unused-argument
+    target.lowerName = target.name.lower() if target.name else None
+
+
 class NodesTableMapper(TableMapper):
     def map(self, db_manager):
         backend_opts = db_manager.get_backend_opts()
@@ -35,6 +46,8 @@ class NodesTableMapper(TableMapper):
             db_manager.metadata,
             Column('id', Integer, Sequence('nodes_id_seq'), primary_key=True),
             Column('name', String(45), unique=True, nullable=False),
+            # Lowercase 'name' for indexed case-insensitive lookups
+            Column('lowerName', String(45)),
             Column('state', String(20)),
             Column('bootFrom', Integer, default=0),
             Column('lastUpdate', String(20)),
@@ -55,6 +68,8 @@ class NodesTableMapper(TableMapper):
             **backend_opts
         )
 
+        Index('Nodes_lowerName',
+              nodes_table.c.lowerName)
         Index('Nodes_parentNodeId',
               nodes_table.c.parentNodeId)
         Index('Nodes_softwareProfileId',
@@ -78,6 +93,36 @@ class NodesTableMapper(TableMapper):
 
         })
 
+        event.listen(Nodes, 'before_insert', _set_lower_name)
+        event.listen(Nodes, 'before_update', _set_lower_name)
+
+    def upgrade(self, db_manager):
+        engine = db_manager.engine
+
+        columns = [
+            column['name']
+            for column in inspect(engine).get_columns('Nodes')
+        ]
+
+        if 'lowerName' in columns:
+            return
+
+        logger.info('Adding column [lowerName] to table [Nodes]')
+
+        nodes_table = db_manager.getMetadataTable('Nodes')
+
+        preparer = engine.dialect.identifier_preparer
+
+        with engine.begin() as connection:
+            connection.execute('ALTER TABLE %s ADD COLUMN %s %s' % (
+                preparer.format_table(nodes_table),
+                preparer.format_column(nodes_table.c.lowerName),
+                nodes_table.c.lowerName.type.compile(
+                    dialect=engine.dialect)))
+
+            connection.execute(nodes_table.update().values(
+                lowerName=func.lower(nodes_table.c.name)))
+
 
 class NodeRequestsTableMapper(TableMapper):
     def map(self, db_manager):
@@ -96,12 +141,58 @@ class NodeRequestsTableMapper(TableMapper):
             Column('message', Text),
             Column('admin_id', Integer, ForeignKey('Admins.id')),
             Column('action', String(255), nullable=False),
+            # Requests with higher priority are processed first
+            Column('priority', Integer, nullable=False, default=0,
+                   server_default='0'),
+            Column('attempts', Integer, nullable=False, default=0,
+                   server_default='0'),
+            # Identifier of the web service process processing the
+            # request and expiry time of its lease
+            Column('lease_owner', String(255)),
+            Column('lease_expires', DateTime),
+            # Failed requests are retried no earlier than this time
+            Column('next_attempt', DateTime),
             **backend_opts)
 
+        Index('NodeRequests_state_priority',
+              tbl.c.state, tbl.c.priority, tbl.c.id)
+
         mapper(NodeRequests, tbl, properties={
             'owner': relation(Admins),
         })
 
+    def upgrade(self, db_manager):
+        engine = db_manager.engine
+
+        columns = [
+            column['name']
+            for column in inspect(engine).get_columns('NodeRequests')
+        ]
+
+        tbl = db_manager.getMetadataTable('NodeRequests')
+
+        preparer = engine.dialect.identifier_preparer
+
+        for column in tbl.columns:
+            if column.name in columns:
+                continue
+
+            logger.info(
+                'Adding column [%s] to table [NodeRequests]' % (
+                    column.name))
+
+            ddl = 'ALTER TABLE %s ADD COLUMN %s %s' % (
+                preparer.format_table(tbl),
+                preparer.format_column(column),
+                column.type.compile(dialect=engine.dialect))
+
+            if column.server_default is not None:
+                ddl += ' NOT NULL DEFAULT %s' % (
+                    column.server_default.arg)
+
+            with engine.begin() as connection:
+                connection.execute(ddl)
+
 
 class NodeTagsTableMapper(TableMapper):
     def map(self, db_manager):
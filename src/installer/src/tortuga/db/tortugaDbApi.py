@@ -57,6 +57,43 @@ class TortugaDbApi(object):
             except InvalidDbRelation as ex:
                 self.getLogger().error(ex)
 
+    def getRelationsForFields(self, optionDict, fields, fieldMap=None): \
+            # pylint: disable=no-self-use
+        """
+        Return subset of relations in 'optionDict' (see loadRelations())
+        required to populate 'fields'. 'fieldMap' maps field names to
+        relation names, where they differ.
+
+        All relations are returned if 'fields' is None.
+        """
+
+        if fields is None:
+            return optionDict
+
+        relations = set(
+            (fieldMap or {}).get(field, field) for field in fields)
+
+        return {
+            key: value for key, value in optionDict.items()
+            if key in relations
+        }
+
+    def projectFields(self, tortugaObject, fields): \
+            # pylint: disable=no-self-use
+        """
+        Remove all keys not named in 'fields' from 'tortugaObject'. The
+        'id' and 'name' keys are always retained.
+        """
+
+        if fields is None:
+            return tortugaObject
+
+        for key in list(tortugaObject.keys()):
+            if key not in fields and key not in ('id', 'name'):
+                del tortugaObject[key]
+
+        return tortugaObject
+
     def getTortugaObjectList(self, cls, dbList): \
             # pylint: disable=no-self-use
         return TortugaObjectList([
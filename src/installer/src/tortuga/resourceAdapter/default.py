@@ -327,42 +327,87 @@ class Default(ResourceAdapter):
 
         newNodes = []
 
-        for nodeDict in nodeDetails:
-            addNodeRequest = {}
+        # Reserve names for all nodes requiring a generated name at once
+        generatedNames = []
 
-            addNodeRequest['addHostSession'] = self.addHostSession
+        if dbHardwareProfile.nameFormat and \
+                dbHardwareProfile.nameFormat != '*':
+            nameCount = len(
+                [nodeDict for nodeDict in nodeDetails
+                 if 'name' not in nodeDict])
 
-            if 'rack' in addNodesRequest:
-                # rack can be undefined, in which case it is not copied
-                # into the node request
-                addNodeRequest['rack'] = addNodesRequest['rack']
+            if nameCount:
+                generatedNames = self.addHostApi.generate_node_names(
+                    dbSession, dbHardwareProfile.nameFormat, nameCount,
+                    rackNumber=addNodesRequest.get('rack'),
+                    dns_zone=dns_zone)
 
-            if 'nics' in nodeDict:
-                addNodeRequest['nics'] = nodeDict['nics']
+        generatedNames.reverse()
 
-            if 'name' in nodeDict:
-                addNodeRequest['name'] = nodeDict['name']
+        # Allocate provisioning IP addresses for all nodes at once. Nic
+        # definitions are copied to avoid modifying the request.
+        nodeNicDefs = [
+            [dict(nic_def) if nic_def else nic_def
+             for nic_def in nodeDict.get('nics', [])]
+            for nodeDict in nodeDetails]
 
-            node = self.nodeApi.createNewNode(
-                dbSession, addNodeRequest, dbHardwareProfile,
-                dbSoftwareProfile, bGenerateIp=bGenerateIp, dns_zone=dns_zone)
+        ipAllocations = []
 
-            dbSession.add(node)
+        try:
+            ipAllocations = self.addHostApi.allocate_nic_ip_addresses(
+                dbHardwareProfile, nodeNicDefs, bGenerateIp=bGenerateIp)
+
+            for nodeDict, nicDefs in zip(nodeDetails, nodeNicDefs):
+                addNodeRequest = {}
+
+                addNodeRequest['addHostSession'] = self.addHostSession
+
+                if 'rack' in addNodesRequest:
+                    # rack can be undefined, in which case it is not copied
+                    # into the node request
+                    addNodeRequest['rack'] = addNodesRequest['rack']
+
+                if nicDefs:
+                    addNodeRequest['nics'] = nicDefs
+
+                if 'name' in nodeDict:
+                    addNodeRequest['name'] = nodeDict['name']
+
+                node = self.nodeApi.createNewNode(
+                    dbSession, addNodeRequest, dbHardwareProfile,
+                    dbSoftwareProfile, bGenerateIp=bGenerateIp,
+                    dns_zone=dns_zone,
+                    generated_name=generatedNames.pop()
+                    if 'name' not in nodeDict and generatedNames else None)
+
+                newNodes.append(node)
+
+            # Insert all nodes and nics in a single flush
+            dbSession.add_all(newNodes)
+
+            dbSession.flush()
+        except Exception:
+            self.addHostApi.release_provisioning_ip_addresses(ipAllocations)
+
+            raise
+        finally:
+            # Release reserved names not assigned to a node
+            self.addHostApi.clear_session_node_names(generatedNames)
+
+        # Create DHCP/PXE configuration for all nodes
+        self.writeLocalBootConfigurations(
+            newNodes, dbHardwareProfile, dbSoftwareProfile)
 
-            # Create DHCP/PXE configuration
-            self.writeLocalBootConfiguration(
-                node, dbHardwareProfile, dbSoftwareProfile)
+        hosts = []
 
+        for node in newNodes:
             # Get the provisioning nic
             nics = get_provisioning_nics(node)
 
-            self._pre_add_host(
-                node.name,
-                dbHardwareProfile.name,
-                dbSoftwareProfile.name,
-                nics[0].ip if nics else None)
+            hosts.append((node.name, nics[0].ip if nics else None))
 
-            newNodes.append(node)
+        self._pre_add_hosts(
+            dbHardwareProfile.name, dbSoftwareProfile.name, hosts)
 
         return newNodes
 
@@ -486,6 +486,19 @@ class ResourceAdapter(object): \
             NicNotFound
         """
 
+        self.writeLocalBootConfigurations(
+            [node], hardwareprofile, softwareprofile)
+
+    def writeLocalBootConfigurations(self, nodes, hardwareprofile,
+                                     softwareprofile):
+        """
+        Write PXE files for all nodes and add DHCP leases for all nodes
+        in a single batch
+
+        Raises:
+            NicNotFound
+        """
+
         if not hardwareprofile.nics:
             # Hardware profile has no provisioning NICs defined. This
             # shouldn't happen...
@@ -499,31 +512,37 @@ class ResourceAdapter(object): \
         # Determine the provisioning nic for the hardware profile
         hwProfileProvisioningNic = hardwareprofile.nics[0]
 
-        nic = None
+        # Set up DHCP/PXE for newly addded nodes
+        bhm = getOsObjectFactory().getOsBootHostManager()
+
+        leases = []
 
-        if hwProfileProvisioningNic.network:
-            # Find the nic attached to the newly added node that is on
-            # the same network as the provisioning nic.
-            nic = self.__findNicForProvisioningNetwork(
-                node.nics, hwProfileProvisioningNic.network)
+        for node in nodes:
+            nic = None
 
-        if not nic or not nic.mac:
-            self.getLogger().warning(
-                'MAC address not defined for nic (ip=[%s]) on node [%s]' % (
-                    nic.ip, node.name))
+            if hwProfileProvisioningNic.network:
+                # Find the nic attached to the newly added node that is on
+                # the same network as the provisioning nic.
+                nic = self.__findNicForProvisioningNetwork(
+                    node.nics, hwProfileProvisioningNic.network)
 
-            return
+            if not nic or not nic.mac:
+                self.getLogger().warning(
+                    'MAC address not defined for nic (ip=[%s]) on node'
+                    ' [%s]' % (nic.ip, node.name))
 
-        # Set up DHCP/PXE for newly addded node
-        bhm = getOsObjectFactory().getOsBootHostManager()
+                continue
 
-        # Write out the PXE file
-        bhm.writePXEFile(
-            node, hardwareprofile=hardwareprofile,
-            softwareprofile=softwareprofile, localboot=False)
+            # Write out the PXE file
+            bhm.writePXEFile(
+                node, hardwareprofile=hardwareprofile,
+                softwareprofile=softwareprofile, localboot=False)
 
-        # Add a DHCP lease
-        bhm.addDhcpLease(node, nic)
+            leases.append((node, nic))
+
+        if leases:
+            # Add DHCP leases
+            bhm.addDhcpLeases(leases)
 
     def removeLocalBootConfiguration(self, node):
         bhm = self.osObject.getOsBootHostManager()
@@ -531,6 +550,37 @@ class ResourceAdapter(object): \
         bhm.rmPXEFile(node)
         bhm.removeDhcpLease(node)
 
+    def _pre_add_hosts(self, hwprofilename, swprofilename, hosts):
+        """
+        Perform "pre-add-host" operation for list of (name, ip) tuples
+        using a single invocation of the 'pre-add-host' command
+        """
+
+        if not hosts:
+            return
+
+        command = ('sudo %s/pre-add-host'
+                   ' --hardware-profile %s'
+                   ' --software-profile %s'
+                   ' --hosts-file -' % (
+                       self._cm.getBinDir(),
+                       hwprofilename,
+                       swprofilename))
+
+        self.getLogger().debug(
+            'calling command= [%s] (%d hosts)' % (command, len(hosts)))
+
+        p = subprocess.Popen(
+            command, shell=True, stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, close_fds=True,
+            universal_newlines=True)
+
+        p.communicate(''.join(
+            '%s %s\n' % (name, ip) if ip else '%s\n' % (name)
+            for name, ip in hosts))
+
+        p.wait()
+
     def _pre_add_host(self, name, hwprofilename, swprofilename, ip): \
             # pylint: disable=unused-argument
         # Perform "pre-add-host" operation
@@ -0,0 +1,195 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+import binascii
+import errno
+import hashlib
+import hmac
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Optional, Tuple
+
+from tortuga.config.configManager import ConfigManager
+from tortuga.exceptions.configurationError import ConfigurationError
+
+
+# Name of file (in $TORTUGA_ROOT/etc) containing the token signing key
+SECRET_FILE_NAME = 'tortugawsd.secret'
+
+# Length (in bytes) of the token signing key, which is stored hex-encoded
+SECRET_LENGTH = 32
+
+_auth_token_lock = threading.Lock()
+
+_auth_token = None
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+class AuthToken(object):
+    """
+    Issue and verify signed bearer tokens.
+
+    A token is the base64-encoded JSON payload (username, admin id,
+    credential fingerprint and expiry time) and its HMAC-SHA256
+    signature, separated by '.'. Tokens are verified using only the
+    signing key; no session store or database access is required.
+
+    The credential fingerprint is a keyed hash of the stored (crypted)
+    password of the principal, so tokens can be rejected once the
+    password is changed.
+    """
+
+    def __init__(self, secret: bytes, ttl: int = 3600, clock=time.time):
+        self._secret = secret
+        self._ttl = ttl
+        self._clock = clock
+
+    def __sign(self, payload: str) -> str:
+        return _b64encode(hmac.new(
+            self._secret, payload.encode('ascii'), hashlib.sha256).digest())
+
+    def get_credential_fingerprint(self, credential: str) -> str:
+        """
+        Returns keyed hash of 'credential' (ie. crypted password)
+        """
+
+        return _b64encode(hmac.new(
+            self._secret, b'credential\0' + credential.encode('utf-8'),
+            hashlib.sha256).digest()[:16])
+
+    def issue(self, username: str, admin_id: Optional[int] = None,
+              credential: Optional[str] = None) -> Tuple[str, int]:
+        """
+        Returns tuple (token, expiry time)
+        """
+
+        expires = int(self._clock()) + self._ttl
+
+        payload = _b64encode(json.dumps({
+            'sub': username,
+            'aid': admin_id,
+            'crd': self.get_credential_fingerprint(credential)
+                   if credential is not None else None,
+            'exp': expires,
+        }, separators=(',', ':')).encode('utf-8'))
+
+        return '%s.%s' % (payload, self.__sign(payload)), expires
+
+    def verify(self, token: str) -> Optional[dict]:
+        """
+        Returns dict containing 'username', 'admin_id' and 'credential'
+        (fingerprint) or None if the token is malformed, has an invalid
+        signature or has expired.
+        """
+
+        payload, sep, signature = token.partition('.')
+
+        if not sep:
+            return None
+
+        try:
+            if not hmac.compare_digest(self.__sign(payload), signature):
+                return None
+
+            claims = json.loads(_b64decode(payload).decode('utf-8'))
+        except (ValueError, UnicodeError, binascii.Error):
+            return None
+
+        if not isinstance(claims, dict) or \
+                not isinstance(claims.get('exp'), int) or \
+                claims['exp'] <= self._clock():
+            return None
+
+        return {
+            'username': claims.get('sub'),
+            'admin_id': claims.get('aid'),
+            'credential': claims.get('crd'),
+        }
+
+    def check_credential(self, claims: dict, credential: str) -> bool:
+        """
+        Returns True if token 'claims' were issued for 'credential'
+        """
+
+        fingerprint = claims.get('credential')
+
+        if not isinstance(fingerprint, str):
+            return False
+
+        return hmac.compare_digest(
+            fingerprint, self.get_credential_fingerprint(credential))
+
+
+def _load_secret(path: str) -> bytes:
+    """
+    Read signing key from 'path', creating it if it does not exist. All
+    web service processes sharing the key accept each other's tokens.
+
+    Raises:
+        ConfigurationError
+    """
+
+    if not os.path.exists(path):
+        # Write the key to a temporary file and link it into place, so
+        # other processes never read a partially written key
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+
+        try:
+            with os.fdopen(fd, 'w') as fp:
+                fp.write(binascii.hexlify(
+                    os.urandom(SECRET_LENGTH)).decode('ascii'))
+
+            try:
+                os.link(tmp_path, path)
+            except OSError as exc:
+                # Created by another process
+                if exc.errno != errno.EEXIST:
+                    raise
+        finally:
+            os.unlink(tmp_path)
+
+    with open(path) as fp:
+        secret = fp.read().strip().encode('ascii')
+
+    if len(secret) < SECRET_LENGTH * 2:
+        raise ConfigurationError(
+            'Token signing key [%s] is invalid' % (path))
+
+    return secret
+
+
+def get_auth_token() -> AuthToken:
+    """
+    Return AuthToken using the signing key for this installation
+    """
+
+    global _auth_token  # pylint: disable=global-statement
+
+    with _auth_token_lock:
+        if _auth_token is None:
+            _auth_token = AuthToken(_load_secret(os.path.join(
+                ConfigManager().getEtcDir(), SECRET_FILE_NAME)))
+
+        return _auth_token
@@ -18,6 +18,7 @@ from .addHostController import AddHostController
 from .adminController import AdminController
 from .applicationMonitorController import ApplicationMonitorController
 from .authController import AuthController
+from .eventController import EventController
 from .hardwareProfileController import HardwareProfileController
 from .kitController import KitController
 from .networkController import NetworkController
@@ -29,6 +30,7 @@ from .ruleController import RuleController
 from .softwareProfileController import SoftwareProfileController
 from .tagController import TagController
 from .updateController import UpdateController
+from .workerController import WorkerController
 from tortuga.kit.loader import load_kits
 from tortuga.kit.registry import get_all_kit_installers
 
@@ -37,6 +39,7 @@ register_ws_controller(AddHostController)
 register_ws_controller(AdminController)
 register_ws_controller(ApplicationMonitorController)
 register_ws_controller(AuthController)
+register_ws_controller(EventController)
 register_ws_controller(HardwareProfileController)
 register_ws_controller(KitController)
 register_ws_controller(NetworkController)
@@ -47,3 +50,4 @@ register_ws_controller(RuleController)
 register_ws_controller(SoftwareProfileController)
 register_ws_controller(TagController)
 register_ws_controller(UpdateController)
+register_ws_controller(WorkerController)
@@ -21,14 +21,20 @@ import cherrypy
 from tortuga.addhost.addHostManager import AddHostManager
 from tortuga.exceptions.invalidArgument import InvalidArgument
 from tortuga.exceptions.notFound import NotFound
+from tortuga.exceptions.serviceBusy import ServiceBusy
 from tortuga.addhost.utility import validate_addnodes_request
 from tortuga.db.nodeRequests import NodeRequests
-from ..threadManager import threadManager
+from ..requestQueue import requestQueue
 from .tortugaController import TortugaController
 from .authController import AuthController, require
 from .. import dbm
 
 
+# Maximum number of seconds add host status requests wait for messages.
+# Waiting requests occupy a web server thread.
+MAX_STATUS_WAIT = 60
+
+
 class AddHostController(TortugaController):
     actions = [
         {
@@ -59,7 +65,17 @@ class AddHostController(TortugaController):
                 'addNodesRequest': cherrypy.request.json['node'],
             }
 
-            admin_id = cherrypy.session.get('admin_id')
+            # Requests with higher priority are processed first
+            if 'priority' in cherrypy.request.json:
+                try:
+                    addNodesRequest['priority'] = \
+                        int(cherrypy.request.json['priority'])
+                except (TypeError, ValueError):
+                    raise InvalidArgument('Malformed request priority')
+
+            # 'admin_id' is set on the request for token authentication
+            admin_id = getattr(cherrypy.request, 'admin_id', None) or \
+                cherrypy.session.get('admin_id')
             if admin_id:
                 addNodesRequest['metadata'] = {
                     'admin_id': admin_id,
@@ -69,6 +85,10 @@ class AddHostController(TortugaController):
                 'addHostSession': enqueue_addnodes_request(
                     cherrypy.request.db, addNodesRequest),
             }
+        except ServiceBusy as ex:
+            self.handleException(ex)
+            code = self.getTortugaStatusCode(ex)
+            response = self.serviceBusyErrorResponse(str(ex), code)
         except Exception as ex:
             self.getLogger().exception('Exception occurred while adding hosts')
             self.handleException(ex)
@@ -82,17 +102,30 @@ class AddHostController(TortugaController):
     def getStatus(self, session, **kwargs):
         '''
         Call the addHost manager directly
-        '''
 
-        startMessage = int(kwargs['startMessage']) \
-            if 'startMessage' in kwargs else 0
+        If 'wait' is specified, wait up to 'wait' seconds for messages
+        following 'startMessage'. If 'nodeCursor' is specified, only
+        nodes added after those returned by the previous call are
+        returned.
+        '''
 
         getNodes = kwargs['getNodes'].lower().startswith('t') \
             if 'getNodes' in kwargs else False
 
         try:
+            try:
+                startMessage = int(kwargs.get('startMessage', 0))
+
+                wait = min(int(kwargs.get('wait', 0)), MAX_STATUS_WAIT)
+
+                nodeCursor = int(kwargs['nodeCursor']) \
+                    if kwargs.get('nodeCursor') else None
+            except ValueError:
+                raise InvalidArgument('Malformed add host status request')
+
             status = AddHostManager().getStatus(
-                session, int(startMessage), getNodes)
+                session, startMessage, getNodes, wait=max(wait, 0),
+                nodeCursor=nodeCursor)
 
             response = {'addhoststatus': status.getCleanDict()}
         except NotFound as ex:
@@ -112,16 +145,7 @@ def enqueue_addnodes_request(session, addNodesRequest):
 
     request = init_node_request_record(addNodesRequest)
 
-    session.add(request)
-
-    session.commit()
-
-    threadManager.queue.put({
-        'action': 'ADD',
-        'data': {
-            'addHostSession': request.addHostSession,
-        },
-    })
+    requestQueue.submit(session, request)
 
     return request.addHostSession
 
@@ -136,4 +160,7 @@ def init_node_request_record(addNodesRequest):
             'admin_id' in addNodesRequest['metadata']:
         request.admin_id = addNodesRequest['metadata']['admin_id']
 
+    if 'priority' in addNodesRequest:
+        request.priority = addNodesRequest['priority']
+
     return request
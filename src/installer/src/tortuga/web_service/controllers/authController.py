@@ -19,6 +19,7 @@ import cherrypy
 from cherrypy.lib import httpauth
 from tortuga.utility import tortugaStatus
 from tortuga.utility.authManager import AuthManager
+from tortuga.web_service.authToken import get_auth_token
 from .tortugaController import TortugaController
 
 
@@ -39,19 +40,14 @@ def checkCredentials(username, password):
     logger = logging.getLogger('tortuga.checkCredentials')
     logger.addHandler(logging.NullHandler())
 
-    principal = AuthManager().getPrincipal(username, password)
-
-    if principal is None:
-        # See if there is a new admin available
-        AuthManager().reloadPrincipals()
-
-        principal = AuthManager().getPrincipal(
-            username, password)
+    principal = AuthManager().verifyCredentials(username, password)
 
     if principal:
         logger.debug('Successful login from user [%s]' % (username))
 
         if 'id' in principal.getAttributes():
+            cherrypy.request.admin_id = principal.getAttributes()['id']
+
             cherrypy.session['admin_id'] = principal.getAttributes()['id']
 
         return None
@@ -83,7 +79,37 @@ def checkAuth(*args):   # pylint: disable=unused-argument
     conditions = cherrypy.request.config.get('auth.require', None)
 
     if conditions is not None:
-        username = cherrypy.session.get(SESSION_KEY)
+        authorization = cherrypy.request.headers.get('authorization', '')
+
+        if authorization[:7].lower() == 'bearer ':
+            # Signed token; verified without accessing the session store
+            claims = get_auth_token().verify(authorization[7:].strip())
+
+            if not claims:
+                logger.debug('Invalid or expired authentication token')
+
+                raise TortugaHTTPAuthError()
+
+            username = claims['username']
+
+            # Reject tokens of admins deleted or whose password changed
+            # since the token was issued
+            principal = AuthManager().getCurrentPrincipal(username)
+
+            if principal is None or \
+                    principal.getAttributes().get('id') != \
+                    claims['admin_id'] or \
+                    not get_auth_token().check_credential(
+                        claims, principal.getPassword()):
+                logger.debug(
+                    'Authentication token of user [%s] revoked' % (
+                        username))
+
+                raise TortugaHTTPAuthError()
+
+            cherrypy.request.admin_id = claims['admin_id']
+        else:
+            username = cherrypy.session.get(SESSION_KEY)
 
         if username:
             cherrypy.request.login = username
@@ -239,4 +265,15 @@ class AuthController(TortugaController):
 
         cherrypy.session[SESSION_KEY] = cherrypy.request.login = username
 
+        principal = AuthManager().getCurrentPrincipal(username)
+
+        token, expires = get_auth_token().issue(
+            username, getattr(cherrypy.request, 'admin_id', None),
+            principal.getPassword() if principal else None)
+
         self.addTortugaResponseHeaders(tortugaStatus.TORTUGA_OK)
+
+        return {
+            'token': token,
+            'expires': expires,
+        }
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from tortuga.exceptions.invalidArgument import InvalidArgument
+
 
 def parse_tag_query_string(tag_dict):
     tagspec = []
@@ -28,3 +30,47 @@ def parse_tag_query_string(tag_dict):
                 tagspec.append((tagval[0],))
 
     return tagspec
+
+
+def parse_page_query_string(kwargs):
+    """
+    Returns tuple of ('limit', 'after') paging parameters from query
+    string arguments. 'limit' is None if not specified.
+
+    Raises:
+        InvalidArgument
+    """
+
+    limit = kwargs.get('limit')
+
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise InvalidArgument('Malformed limit [%s]' % (limit))
+
+        if limit < 1:
+            raise InvalidArgument('Limit must be greater than zero')
+
+    return limit, kwargs.get('after') or None
+
+
+def parse_fields_query_string(kwargs):
+    """
+    Returns list of field names requested using 'fields' query string
+    argument(s) or None, if not specified. Multiple field names may be
+    comma-separated or the argument may be repeated.
+    """
+
+    fields = kwargs.get('fields')
+
+    if not fields:
+        return None
+
+    result = []
+
+    for field in fields if isinstance(fields, list) else [fields]:
+        result.extend(
+            [name.strip() for name in field.split(',') if name.strip()])
+
+    return result
@@ -0,0 +1,186 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# pylint: disable=no-member
+
+import json
+import time
+
+import cherrypy
+
+from tortuga.exceptions.invalidArgument import InvalidArgument
+from tortuga.exceptions.serviceBusy import ServiceBusy
+from ..eventBroker import eventBroker, parse_event_id
+from .authController import require
+from .tortugaController import TortugaController
+
+
+class EventController(TortugaController):
+    """
+    Change event stream controller class.
+
+    """
+    actions = [
+        {
+            'name': 'eventStream',
+            'path': '/v1/events',
+            'action': 'eventStreamRequest',
+            'method': ['GET'],
+        },
+    ]
+
+    # Default and maximum number of seconds a stream is kept open
+    DEFAULT_STREAM_TIMEOUT = 300
+    MAX_STREAM_TIMEOUT = 3600
+
+    # Send keepalive after this number of seconds without events
+    KEEPALIVE_INTERVAL = 15
+
+    @cherrypy.config(**{'response.stream': True})
+    @require()
+    def eventStreamRequest(self, **kwargs):
+        """
+        Stream node, profile and add host session change events.
+
+        Events following the event id 'since' (or the 'Last-Event-ID'
+        header) are returned; without either, only new events are
+        returned. 'topic' is a comma-separated list of topics (node,
+        softwareprofile, hardwareprofile, addhost).
+
+        Events are sent as server-sent events or, if 'format' is
+        'ndjson', as newline-delimited JSON. The stream is closed after
+        'timeout' seconds. A RESET event is sent if events following
+        'since' are no longer available; clients must then retrieve
+        current state before handling further events.
+        """
+
+        try:
+            since, topics, timeout, fmt = self.__parse_args(kwargs)
+
+            stream = eventBroker.open_stream()
+
+            # Release the stream even if the response body is never
+            # iterated (ie. client disconnected before streaming began)
+            cherrypy.request.hooks.attach('on_end_request', stream.close)
+        except ServiceBusy as ex:
+            self.handleException(ex)
+            code = self.getTortugaStatusCode(ex)
+
+            cherrypy.response.headers['Content-Type'] = 'application/json'
+
+            return json.dumps(
+                self.serviceBusyErrorResponse(str(ex), code)).encode()
+        except Exception as ex:
+            self.getLogger().exception(
+                'event WS API eventStreamRequest() failed')
+            self.handleException(ex)
+
+            cherrypy.response.headers['Content-Type'] = 'application/json'
+
+            return json.dumps(self.errorResponse(str(ex))).encode()
+
+        if fmt == 'sse':
+            cherrypy.response.headers['Content-Type'] = 'text/event-stream'
+        else:
+            cherrypy.response.headers['Content-Type'] = \
+                'application/x-ndjson'
+
+        cherrypy.response.headers['Cache-Control'] = 'no-cache'
+
+        return self.__stream_events(stream, since, topics, timeout, fmt)
+
+    def __parse_args(self, kwargs):
+        since = kwargs.get('since') or \
+            cherrypy.request.headers.get('Last-Event-ID')
+
+        if since:
+            try:
+                parse_event_id(since)
+            except ValueError:
+                raise InvalidArgument('Malformed event id [%s]' % (since))
+
+        topics = None
+
+        if kwargs.get('topic'):
+            topics = set(topic.strip() for topic in
+                         kwargs['topic'].split(',') if topic.strip())
+
+        try:
+            timeout = int(kwargs.get('timeout', self.DEFAULT_STREAM_TIMEOUT))
+        except ValueError:
+            raise InvalidArgument('Malformed timeout')
+
+        if timeout < 0:
+            raise InvalidArgument('Malformed timeout')
+
+        timeout = min(timeout, self.MAX_STREAM_TIMEOUT)
+
+        fmt = kwargs.get('format', 'sse')
+
+        if fmt not in ('sse', 'ndjson'):
+            raise InvalidArgument('Unsupported event format [%s]' % (fmt))
+
+        return since, topics, timeout, fmt
+
+    def __stream_events(self, stream, since, topics, timeout, fmt):
+        deadline = time.monotonic() + timeout
+
+        if not since:
+            # Only return events following those already buffered
+            since = eventBroker.buffer.get_last_id()
+
+        with stream:
+            while True:
+                remaining = deadline - time.monotonic()
+
+                if remaining <= 0 or eventBroker.buffer.closed:
+                    break
+
+                events, reset = eventBroker.buffer.wait(
+                    since, min(remaining, self.KEEPALIVE_INTERVAL))
+
+                if reset:
+                    # Resume after the latest event
+                    since = events[-1]['id']
+
+                    yield _format_event({'type': 'RESET', 'id': since}, fmt)
+
+                    continue
+
+                if not events:
+                    # Keep connection (and intermediate proxies) alive
+                    yield b':\n\n' if fmt == 'sse' else b'\n'
+
+                    continue
+
+                for event in events:
+                    since = event['id']
+
+                    if topics is None or event['topic'] in topics:
+                        yield _format_event(event, fmt)
+
+
+def _format_event(event, fmt):
+    if fmt == 'ndjson':
+        return (json.dumps(event) + '\n').encode()
+
+    lines = []
+
+    if event.get('id'):
+        lines.append('id: %s' % (event['id']))
+
+    lines.append('event: %s' % (event['type']))
+    lines.append('data: %s' % (json.dumps(event)))
+
+    return ('\n'.join(lines) + '\n\n').encode()
@@ -23,7 +23,7 @@ from tortuga.objects.hardwareProfile import HardwareProfile
 from tortuga.exceptions.hardwareProfileNotFound \
     import HardwareProfileNotFound
 from tortuga.objects.osInfo import OsInfo
-from .common import parse_tag_query_string
+from .common import parse_tag_query_string, parse_fields_query_string
 from .tortugaController import TortugaController
 from .authController import AuthController
 from .authController import require
@@ -118,9 +118,11 @@ class HardwareProfileController(TortugaController):
         if 'tag' in kwargs and kwargs['tag']:
             tagspec.extend(parse_tag_query_string(kwargs['tag']))
 
+        fields = parse_fields_query_string(kwargs)
+
         try:
             hardwareProfiles = HardwareProfileManager().\
-                getHardwareProfileList(tags=tagspec)
+                getHardwareProfileList(tags=tagspec, fields=fields)
 
             response = {
                 'hardwareprofiles': hardwareProfiles.getCleanDict(),
@@ -15,14 +15,17 @@
 # pylint: disable=no-member
 
 import datetime
+import json
 import cherrypy
 
 from tortuga.exceptions.invalidArgument import InvalidArgument
 from tortuga.addhost.addHostManager import AddHostManager
 from tortuga.db.nodeRequests import NodeRequests
 from tortuga.exceptions.nodeNotFound import NodeNotFound
-from ..threadManager import threadManager
-from .common import parse_tag_query_string
+from tortuga.exceptions.serviceBusy import ServiceBusy
+from ..requestQueue import requestQueue
+from .common import parse_tag_query_string, parse_page_query_string, \
+    parse_fields_query_string
 from .authController import AuthController, require
 from .tortugaController import TortugaController
 from .. import app
@@ -40,6 +43,12 @@ class NodeController(TortugaController):
             'action': 'nodeListRequest',
             'method': ['GET']
         },
+        {
+            'name': 'userNodesStream',
+            'path': '/v1/nodes/stream',
+            'action': 'nodeListStreamRequest',
+            'method': ['GET']
+        },
         {
             'name': 'getNodeProvisioningInfo',
             'path': '/v1/nodes/:(nodeName)/provisioningInfo',
@@ -152,11 +161,24 @@ class NodeController(TortugaController):
         },
     ]
 
+    # Number of nodes retrieved from the database at once when streaming
+    # the node list
+    NODE_STREAM_PAGE_SIZE = 500
+
     @cherrypy.tools.json_out()
     @cherrypy.tools.json_in()
     @require()
     def nodeListRequest(self, **kwargs):
-        """Return list of all available nodes"""
+        """
+        Return list of all available nodes
+
+        If 'limit' is specified, at most 'limit' nodes following the node
+        named 'after' are returned. The response includes 'next', the
+        cursor for the following page, if more nodes may be available.
+
+        If 'fields' is specified, only the named fields (and 'id' and
+        'name') of each node are returned.
+        """
 
         tagspec = []
 
@@ -164,11 +186,19 @@ class NodeController(TortugaController):
             tagspec.extend(parse_tag_query_string(kwargs['tag']))
 
         try:
-            nodeList = app.node_api.getNodeList(tags=tagspec)
+            limit, after = parse_page_query_string(kwargs)
+
+            fields = parse_fields_query_string(kwargs)
+
+            nodeList = app.node_api.getNodeList(
+                tags=tagspec, limit=limit, after=after, fields=fields)
 
             response = {
                 'nodes': nodeList.getCleanDict(),
             }
+
+            if limit is not None and len(nodeList) == limit:
+                response['next'] = nodeList[-1].getName()
         except Exception as ex:
             self.getLogger().exception('node WS API nodeListRequest() failed')
             self.handleException(ex)
@@ -176,6 +206,69 @@ class NodeController(TortugaController):
 
         return self.formatResponse(response)
 
+    @cherrypy.config(**{'response.stream': True})
+    @require()
+    def nodeListStreamRequest(self, **kwargs):
+        """
+        Stream list of all available nodes as newline-delimited JSON
+        (one node per line).
+
+        Nodes are retrieved from the database in pages of 'limit' nodes,
+        starting after the node named 'after' (if specified). 'fields'
+        restricts the returned node fields as for nodeListRequest().
+        """
+
+        tagspec = []
+
+        if 'tag' in kwargs and kwargs['tag']:
+            tagspec.extend(parse_tag_query_string(kwargs['tag']))
+
+        try:
+            limit, after = parse_page_query_string(kwargs)
+
+            limit = limit or self.NODE_STREAM_PAGE_SIZE
+
+            fields = parse_fields_query_string(kwargs)
+
+            # Retrieve first page before starting response to allow
+            # errors to be reported with the appropriate status
+            nodeList = app.node_api.getNodeList(
+                tags=tagspec, limit=limit, after=after, fields=fields)
+        except Exception as ex:
+            self.getLogger().exception(
+                'node WS API nodeListStreamRequest() failed')
+            self.handleException(ex)
+
+            cherrypy.response.headers['Content-Type'] = 'application/json'
+
+            return json.dumps(self.errorResponse(str(ex))).encode()
+
+        cherrypy.response.headers['Content-Type'] = 'application/x-ndjson'
+
+        return self.__stream_node_list(nodeList, tagspec, limit, fields)
+
+    def __stream_node_list(self, nodeList, tagspec, limit, fields):
+        while nodeList:
+            for nodeDict in nodeList.getCleanDict():
+                yield (json.dumps(nodeDict) + '\n').encode()
+
+            if len(nodeList) < limit:
+                break
+
+            try:
+                nodeList = app.node_api.getNodeList(
+                    tags=tagspec, limit=limit, after=nodeList[-1].getName(),
+                    fields=fields)
+            except Exception as ex:
+                # Response status has already been sent
+                self.getLogger().exception(
+                    'node WS API nodeListStreamRequest() failed')
+
+                yield (json.dumps(
+                    self.errorResponse(str(ex))) + '\n').encode()
+
+                break
+
     @cherrypy.tools.json_out()
     @cherrypy.tools.json_in()
     @require()
@@ -269,23 +362,6 @@ class NodeController(TortugaController):
             response = {
                 'changed': result,
             }
-
-            # node = app.node_api.getNode(name)
-
-            # Send data to event log
-
-            # d = {
-            #     'type': 'MODIFIED',
-            #     'object': {
-            #         # 'node': node.getCleanDict(),
-            #         'node': {
-            #             'name': node.getName(),
-            #         }
-            #     }
-            # }
-
-            # Workqueue().socket.send_multipart(['node',
-            #                                                json.dumps(d)])
         except Exception as ex:
             self.getLogger().exception(
                 'node WS API updateNodeRequest() failed')
@@ -653,6 +729,10 @@ class NodeController(TortugaController):
             self.handleException(ex)
             code = self.getTortugaStatusCode(ex)
             response = self.notFoundErrorResponse(str(ex), code)
+        except ServiceBusy as ex:
+            self.handleException(ex)
+            code = self.getTortugaStatusCode(ex)
+            response = self.serviceBusyErrorResponse(str(ex), code)
         except Exception as ex:
             self.getLogger().exception('node WS API deleteNode() failed')
             self.handleException(ex)
@@ -664,17 +744,7 @@ class NodeController(TortugaController):
 def enqueue_delete_hosts_request(session, nodespec):
     request = init_node_request_record(nodespec)
 
-    session.add(request)
-
-    session.commit()
-
-    threadManager.queue.put({
-        'action': 'DELETE',
-        'data': {
-            'transaction_id': request.addHostSession,
-            'nodespec': nodespec,
-        },
-    })
+    requestQueue.submit(session, request)
 
     return request.addHostSession
 
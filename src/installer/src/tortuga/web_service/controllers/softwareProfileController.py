@@ -23,7 +23,7 @@ from tortuga.softwareprofile.softwareProfileApi import SoftwareProfileApi
 from tortuga.exceptions.softwareProfileNotFound \
     import SoftwareProfileNotFound
 from tortuga.exceptions.invalidArgument import InvalidArgument
-from .common import parse_tag_query_string
+from .common import parse_tag_query_string, parse_fields_query_string
 from .tortugaController import TortugaController
 from .authController import AuthController, require
 
@@ -167,8 +167,10 @@ class SoftwareProfileController(TortugaController):
         if 'tag' in kwargs and kwargs['tag']:
             tagspec.extend(parse_tag_query_string(kwargs['tag']))
 
+        fields = parse_fields_query_string(kwargs)
+
         softwareProfiles = self._softwareProfileManager.\
-            getSoftwareProfileList(tags=tagspec)
+            getSoftwareProfileList(tags=tagspec, fields=fields)
 
         response = {
             'softwareprofiles': softwareProfiles.getCleanDict(),
@@ -65,17 +65,8 @@ class TortugaController(object):
 
     @classmethod
     def getTortugaStatusCode(cls, ex):
-        exClass = ex.__class__.__name__.split('.')[-1]
-
-        for code in tortugaStatus.exceptionMap.keys():
-            exStr = tortugaStatus.exceptionMap.get(code).split('.')[-1]
-            if exStr == exClass:
-                status = code
-                break
-        else:
-            status = tortugaStatus.TORTUGA_ERROR
-
-        return status
+        return tortugaStatus.exceptionCodeMap.get(
+            ex.__class__.__name__, tortugaStatus.TORTUGA_ERROR)
 
     @classmethod
     def handleException(cls, ex):
@@ -112,3 +103,11 @@ class TortugaController(object):
 
         return self.errorResponse(msg, code=code,
                                   http_status=http.client.NOT_FOUND)
+
+    def serviceBusyErrorResponse(self, msg, code=None, retry_after=5):
+        """Return HTTP status 429 when requests are rejected due to load"""
+
+        cherrypy.response.headers['Retry-After'] = str(retry_after)
+
+        return self.errorResponse(msg, code=code,
+                                  http_status=http.client.TOO_MANY_REQUESTS)
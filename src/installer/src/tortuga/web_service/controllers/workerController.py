@@ -0,0 +1,45 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# pylint: disable=no-member
+
+import cherrypy
+
+from ..threadManager import threadManager
+from .tortugaController import TortugaController
+from .authController import require
+
+
+class WorkerController(TortugaController):
+    """
+    Asynchronous request worker pool controller class.
+
+    """
+    actions = [
+        {
+            'name': 'workerMetrics',
+            'path': '/v1/workers/metrics',
+            'action': 'getMetrics',
+            'method': ['GET'],
+        },
+    ]
+
+    @require()
+    @cherrypy.tools.json_out()
+    def getMetrics(self):
+        """
+        Return worker pool queue depth and latency metrics
+        """
+
+        return self.formatResponse(threadManager.getMetrics())
@@ -0,0 +1,311 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import itertools
+import json
+import logging
+import threading
+import time
+import uuid
+
+import zmq
+
+from tortuga.exceptions.serviceBusy import ServiceBusy
+
+
+class EventSequencer(object):
+    """
+    Assign sequence numbers to workqueue events.
+
+    Events are numbered by the single process serving the workqueue
+    socket, so all subscribers see the same sequence. 'epoch' identifies
+    the sequence; numbering restarts in a new epoch when the workqueue
+    is restarted.
+    """
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:12]
+
+        self._sequence = itertools.count(1)
+
+        self._lock = threading.Lock()
+
+    def stamp(self, topic, data):
+        """
+        Returns multipart message [topic, JSON event] for event 'data'
+        (JSON), adding 'id', 'seq', 'epoch', 'topic' and 'time'
+        """
+
+        event = json.loads(data.decode('utf-8'))
+
+        with self._lock:
+            seq = next(self._sequence)
+
+        event.update({
+            'id': '%s-%d' % (self.epoch, seq),
+            'seq': seq,
+            'epoch': self.epoch,
+            'topic': topic.decode('utf-8'),
+            'time': time.time(),
+        })
+
+        return [topic, json.dumps(event).encode('utf-8')]
+
+
+def parse_event_id(event_id):
+    """
+    Returns tuple (epoch, sequence number) for event id 'epoch-seq'
+
+    Raises:
+        ValueError
+    """
+
+    epoch, sep, seq = event_id.rpartition('-')
+
+    if not sep or not epoch:
+        raise ValueError('Malformed event id [%s]' % (event_id))
+
+    return epoch, int(seq)
+
+
+class EventBuffer(object):
+    """
+    Most recent events received from the workqueue, used to resume
+    streams from a given event
+    """
+
+    DEFAULT_SIZE = 10000
+
+    def __init__(self, size=DEFAULT_SIZE):
+        self._events = collections.deque(maxlen=size)
+
+        self._cond = threading.Condition()
+
+        self._epoch = None
+
+        self._closed = False
+
+    def append(self, event):
+        with self._cond:
+            if event['epoch'] != self._epoch:
+                # Workqueue restarted; earlier events cannot be resumed
+                self._events.clear()
+
+                self._epoch = event['epoch']
+
+            self._events.append(event)
+
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def get_last_id(self):
+        with self._cond:
+            return self._events[-1]['id'] if self._events else None
+
+    def __get_events_after(self, epoch, seq):
+        # Called with self._cond held. Returns tuple (events, reset).
+        if epoch is None:
+            return [], False
+
+        if epoch != self._epoch:
+            return list(self._events), self._epoch is not None
+
+        if self._events and self._events[0]['seq'] > seq + 1:
+            # Events after 'seq' are no longer buffered
+            return list(self._events), True
+
+        return [event for event in self._events if event['seq'] > seq], \
+            False
+
+    def wait(self, since, timeout):
+        """
+        Wait up to 'timeout' seconds for events after event id 'since'.
+        Returns tuple (events, reset); 'reset' is set if events following
+        'since' are not available and clients must resynchronize.
+
+        'since' of None returns all buffered events.
+
+        Raises:
+            ValueError
+        """
+
+        epoch, seq = parse_event_id(since) if since else (None, 0)
+
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            while not self._closed:
+                if epoch is None and self._epoch is not None:
+                    epoch = self._epoch
+
+                events, reset = self.__get_events_after(epoch, seq)
+
+                if events or reset:
+                    return events, reset
+
+                remaining = deadline - time.monotonic()
+
+                if remaining <= 0:
+                    break
+
+                self._cond.wait(remaining)
+
+        return [], False
+
+
+class EventBroker(object):
+    """
+    Receives events published on the workqueue and hands them to event
+    streams served by this process
+    """
+
+    # Maximum number of concurrent event streams. Each stream occupies a
+    # web server thread (added to the server thread pool by tortugawsd),
+    # mostly blocked waiting for events.
+    DEFAULT_MAX_STREAMS = 16
+
+    def __init__(self, buffer_size=EventBuffer.DEFAULT_SIZE):
+        self._logger = logging.getLogger(
+            'tortuga.web_service.{0}'.format(self.__class__.__name__))
+        self._logger.addHandler(logging.NullHandler())
+
+        self.buffer = EventBuffer(buffer_size)
+
+        self.max_streams = self.DEFAULT_MAX_STREAMS
+
+        self._streams = 0
+
+        self._lock = threading.Lock()
+
+        self._thread = None
+
+        self._stopping = False
+
+    def getLogger(self):
+        return self._logger
+
+    def configure(self, max_streams=None):
+        if max_streams is not None:
+            self.max_streams = max_streams
+
+    def start(self, address):
+        """
+        Subscribe to all events on workqueue socket 'address'
+        """
+
+        self._stopping = False
+
+        self._thread = threading.Thread(
+            target=self.__run, args=(address,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping = True
+
+        if self._thread is not None:
+            self._thread.join()
+
+            self._thread = None
+
+        self.buffer.close()
+
+    def __run(self, address):
+        context = zmq.Context()
+
+        socket = context.socket(zmq.SUB)
+        socket.setsockopt(zmq.SUBSCRIBE, b'')
+        socket.connect(address)
+
+        try:
+            while not self._stopping:
+                # Time out periodically to check for shutdown
+                if not socket.poll(1000):
+                    continue
+
+                frames = socket.recv_multipart()
+
+                try:
+                    event = json.loads(frames[-1].decode('utf-8'))
+                except ValueError:
+                    self.getLogger().warning('Malformed workqueue event')
+
+                    continue
+
+                if 'seq' not in event:
+                    # Not published through the sequencer
+                    continue
+
+                self.buffer.append(event)
+        finally:
+            socket.close()
+            context.term()
+
+    def open_stream(self):
+        """
+        Register a new event stream. Use as a context manager or call
+        close(); the stream is released once.
+
+        Raises:
+            ServiceBusy
+        """
+
+        with self._lock:
+            if self._streams >= self.max_streams:
+                raise ServiceBusy(
+                    'Maximum number of event streams ({0}) reached;'
+                    ' retry later'.format(self.max_streams))
+
+            self._streams += 1
+
+        return _Stream(self)
+
+    def _close_stream(self):
+        with self._lock:
+            self._streams -= 1
+
+
+class _Stream(object):
+    def __init__(self, broker):
+        self._broker = broker
+
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+
+            self._closed = True
+
+        self._broker._close_stream()  # pylint: disable=protected-access
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+eventBroker = EventBroker()
@@ -25,9 +25,14 @@ import cherrypy
 from cherrypy.process import plugins
 from sqlalchemy.orm import scoped_session, sessionmaker
 from tortuga.web_service import adminRouteMapper
-from tortuga.web_service.workQueuePlugin import WorkQueuePlugin
+from tortuga.web_service.eventBroker import eventBroker
+from tortuga.web_service.prefork import PreforkServer
+from tortuga.web_service.workQueuePlugin import WorkQueuePlugin, \
+    run_workqueue_forwarder
 from tortuga.web_service.controllers.tortugaController \
     import TortugaController
+from tortuga.web_service.requestQueue import requestQueue
+from tortuga.web_service.threadManager import threadManager
 from tortuga.web_service.threadManagerPlugin import ThreadManagerPlugin
 from . import app, dbm
 
@@ -54,6 +59,10 @@ root_logger.addHandler(ch)
 
 logger = logging.getLogger('tortuga.web_service')
 
+# Default number of web server threads serving requests other than
+# event streams (CherryPy default thread pool size)
+DEFAULT_SERVER_THREADS = 10
+
 
 def prepareServer():
     """ Prepare server. """
@@ -72,7 +81,12 @@ def prepareServer():
     return cherrypy.tree.mount(root=None, config=config)
 
 
-def runServer(daemonize=False, pidfile=None):
+def runServer(daemonize=False, pidfile=None, worker=False):
+    """
+    Run the web service in this process. 'worker' is set when running
+    as one of several processes started by runPreforkServer().
+    """
+
     logger.debug('Starting service')
 
     # Set up daemonization
@@ -81,7 +95,7 @@ def runServer(daemonize=False, pidfile=None):
         plugins.Daemonizer(cherrypy.engine).subscribe()
 
     # Add workqueue plugin
-    WorkQueuePlugin(cherrypy.engine).subscribe()
+    WorkQueuePlugin(cherrypy.engine, forwarded=worker).subscribe()
 
     # Add-nodes workflow
     ThreadManagerPlugin(cherrypy.engine).subscribe()
@@ -89,10 +103,32 @@ def runServer(daemonize=False, pidfile=None):
     if pidfile:
         plugins.PIDFile(cherrypy.engine, pidfile).subscribe()
 
+    if worker:
+        # Share the listening port with the other web service processes
+        httpserver, _ = cherrypy.server.httpserver_from_self()
+
+        if not hasattr(httpserver, 'reuse_port'):
+            logger.error(
+                'Multiple web service processes require cheroot 8.6.0'
+                ' or later')
+
+            return 1
+
+        httpserver.reuse_port = True
+
+        cherrypy.server.httpserver = httpserver
+
+        # SIGHUP would re-execute the process; the supervisor restarts
+        # processes instead
+        cherrypy.engine.signal_handler.handlers['SIGHUP'] = \
+            cherrypy.engine.exit
+
     # Setup the signal handler to stop the application while running.
     cherrypy.engine.signals.subscribe()
 
-    DatabaseEnginePlugin(cherrypy.engine).subscribe()
+    # The database is upgraded by the supervisor before starting worker
+    # processes
+    DatabaseEnginePlugin(cherrypy.engine, upgrade=not worker).subscribe()
     cherrypy.tools.db = DatabaseTool()
 
     # Start the engine.
@@ -107,6 +143,40 @@ def runServer(daemonize=False, pidfile=None):
     return 0
 
 
+def runPreforkServer(processes, daemonize=False, pidfile=None):
+    """
+    Run the web service in 'processes' processes sharing the listening
+    port, supervised by this process
+    """
+
+    if daemonize:
+        plugins.Daemonizer(cherrypy.engine).start()
+
+    pidfile_plugin = plugins.PIDFile(cherrypy.engine, pidfile) \
+        if pidfile else None
+
+    if pidfile_plugin:
+        pidfile_plugin.start()
+
+    try:
+        # Upgrade once rather than concurrently in each process. No
+        # database connections may be open when forking.
+        dbm.upgrade_database()
+        dbm.engine.dispose()
+
+        return PreforkServer(
+            processes,
+            lambda: runServer(worker=True),
+            helpers=[run_workqueue_forwarder]).run()
+    except Exception:
+        logger.exception('Service exiting')
+
+        return 1
+    finally:
+        if pidfile_plugin:
+            pidfile_plugin.exit()
+
+
 def error_page_400(status, message, traceback, version): \
         # pylint: disable=unused-argument
     cherrypy.response.headers['Content-Type'] = 'application/json'
@@ -121,16 +191,21 @@ def handle_error():
 
 
 class DatabaseEnginePlugin(plugins.SimplePlugin):
-    def __init__(self, bus):
+    def __init__(self, bus, upgrade=True):
         super(DatabaseEnginePlugin, self).__init__(bus)
 
         self.sa_engine = None
 
+        self.upgrade = upgrade
+
         self.bus.subscribe('bind', self.bind)
 
     def start(self):
         self.sa_engine = dbm.engine
 
+        if self.upgrade:
+            dbm.upgrade_database()
+
     def stop(self):
         if self.sa_engine:
             self.sa_engine.dispose()
@@ -198,9 +273,88 @@ def main():
                  help='IP address to listen on (default: %default)')
     p.add_option('-p', '--port', type='int', default=wsPort,
                  help="Port to listen on (default: %default)")
+    p.add_option('--min-workers', type='int',
+                 default=threadManager.DEFAULT_MIN_WORKERS,
+                 help='Minimum number of worker threads for asynchronous'
+                      ' requests (default: %default)')
+    p.add_option('--max-workers', type='int',
+                 default=threadManager.DEFAULT_MAX_WORKERS,
+                 help='Maximum number of worker threads for asynchronous'
+                      ' requests (default: %default)')
+    p.add_option('--max-queue-size', type='int',
+                 default=threadManager.DEFAULT_MAX_QUEUE_SIZE,
+                 help='Maximum number of queued asynchronous requests;'
+                      ' further requests are rejected with HTTP status 429'
+                      ' (default: %default)')
+    p.add_option('--action-limit', action='append', default=[],
+                 metavar='ACTION=COUNT',
+                 help='Maximum number of concurrent requests for worker'
+                      ' action (ie. ADD, DELETE). May be repeated.')
+    p.add_option('--queue-poll-interval', type='int',
+                 default=requestQueue.DEFAULT_POLL_INTERVAL,
+                 help='Seconds between checks for queued requests'
+                      ' submitted to other tortugawsd processes or left'
+                      ' unfinished (default: %default)')
+    p.add_option('--lease-duration', type='int',
+                 default=requestQueue.DEFAULT_LEASE_DURATION,
+                 help='Seconds after which a request held by a'
+                      ' tortugawsd process that stopped responding is'
+                      ' processed by another (default: %default)')
+    p.add_option('--max-attempts', type='int',
+                 default=requestQueue.DEFAULT_MAX_ATTEMPTS,
+                 help='Maximum number of attempts to process a failing'
+                      ' request (default: %default)')
+
+    p.add_option('--server-threads', type='int',
+                 default=DEFAULT_SERVER_THREADS,
+                 help='Number of web server threads per process for'
+                      ' requests other than event streams'
+                      ' (default: %default)')
+    p.add_option('--max-event-streams', type='int',
+                 default=eventBroker.DEFAULT_MAX_STREAMS,
+                 help='Maximum number of concurrent event streams'
+                      ' (/v1/events) per process; further streams are'
+                      ' rejected with HTTP status 429. A web server thread'
+                      ' is added for each stream (default: %default)')
+
+    p.add_option('--processes', type='int', default=1,
+                 help='Number of web service processes sharing the'
+                      ' listening port (default: %default)')
 
     options, args = p.parse_args()
 
+    if options.processes < 1:
+        p.error('--processes must be at least 1')
+
+    if options.server_threads < 1:
+        p.error('--server-threads must be at least 1')
+
+    if options.max_event_streams < 0:
+        p.error('--max-event-streams must not be negative')
+
+    action_limits = {}
+
+    for action_limit in options.action_limit:
+        action, _, count = action_limit.partition('=')
+
+        if not count.isdigit():
+            p.error('Malformed --action-limit argument: %s' % (action_limit))
+
+        action_limits[action] = int(count)
+
+    threadManager.configure(
+        min_workers=options.min_workers,
+        max_workers=options.max_workers,
+        max_queue_size=options.max_queue_size,
+        action_limits=action_limits)
+
+    requestQueue.configure(
+        poll_interval=options.queue_poll_interval,
+        lease_duration=options.lease_duration,
+        max_attempts=options.max_attempts)
+
+    eventBroker.configure(max_streams=options.max_event_streams)
+
     if os.path.exists(options.pidfile):
         with open(options.pidfile) as fp:
             pid = fp.read().rstrip()
@@ -216,6 +370,9 @@ def main():
     cfgdict = {
         'server.socket_host': options.listen,
         'server.socket_port': options.port,
+        # Event streams occupy a server thread each for their duration
+        'server.thread_pool':
+            options.server_threads + options.max_event_streams,
         'log.access_file': '/var/log/tortugaws_access_log',
         'log.error_file': '/var/log/tortugaws_error_log',
         'request.error_response': handle_error,
@@ -239,6 +396,21 @@ def main():
             'server.ssl_private_key': options.sslKey,
         })
 
-    ret = runServer(options.daemonize, options.pidfile)
+    if options.processes > 1:
+        # Each process would otherwise rotate the log at midnight;
+        # rotation is left to logrotate
+        root_logger.removeHandler(ch)
+
+        watched_handler = logging.handlers.WatchedFileHandler(
+            '/var/log/tortugawsd')
+        watched_handler.setLevel(logging.DEBUG)
+        watched_handler.setFormatter(formatter)
+
+        root_logger.addHandler(watched_handler)
+
+        ret = runPreforkServer(
+            options.processes, options.daemonize, options.pidfile)
+    else:
+        ret = runServer(options.daemonize, options.pidfile)
 
     sys.exit(ret)
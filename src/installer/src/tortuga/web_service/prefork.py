@@ -0,0 +1,154 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+import signal
+import time
+
+
+logger = logging.getLogger('tortuga.web_service.prefork')
+logger.addHandler(logging.NullHandler())
+
+
+class PreforkServer(object):
+    """
+    Supervisor running the web service in several processes.
+
+    'target' is called in each of 'processes' forked server processes;
+    the servers share the listening port (SO_REUSEPORT), so the kernel
+    distributes connections among them. Each function in 'helpers' is
+    called in one additional process (ie. the workqueue forwarder).
+
+    Processes exiting unexpectedly are restarted. SIGTERM and SIGINT
+    stop all processes; SIGHUP restarts the server processes.
+    """
+
+    # Processes exiting within this number of seconds of being started
+    # are restarted after RESTART_DELAY seconds
+    MIN_UPTIME = 10
+    RESTART_DELAY = 5
+
+    def __init__(self, processes, target, helpers=None):
+        self.processes = processes
+
+        self._target = target
+        self._helpers = list(helpers or [])
+
+        # Child processes keyed on pid; values are tuple (function,
+        # start time)
+        self._children = {}
+
+        self._stopping = False
+
+    def __spawn(self, func):
+        pid = os.fork()
+
+        if pid == 0:
+            # Child process; exit without returning to the caller
+            status = 1
+
+            try:
+                for signum in (signal.SIGTERM, signal.SIGINT,
+                               signal.SIGHUP):
+                    signal.signal(signum, signal.SIG_DFL)
+
+                result = func()
+
+                status = result if isinstance(result, int) else 0
+            except SystemExit as exc:
+                status = exc.code if isinstance(exc.code, int) else 1
+            except BaseException:  # pylint: disable=broad-except
+                logger.exception('Process exiting')
+            finally:
+                logging.shutdown()
+
+                os._exit(status)  # pylint: disable=protected-access
+
+        self._children[pid] = (func, time.monotonic())
+
+        return pid
+
+    def __signal_children(self, signum, server_only=False):
+        for pid, (func, _) in list(self._children.items()):
+            if server_only and func is not self._target:
+                continue
+
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def __handle_stop(self, signum, frame): \
+            # pylint: disable=unused-argument
+        logger.info('Stopping web service processes')
+
+        self._stopping = True
+
+        self.__signal_children(signal.SIGTERM)
+
+    def __handle_reload(self, signum, frame): \
+            # pylint: disable=unused-argument
+        logger.info('Restarting web service processes')
+
+        # Server processes are restarted as they exit
+        self.__signal_children(signal.SIGTERM, server_only=True)
+
+    def run(self):
+        """
+        Start processes and supervise them until stopped. Returns exit
+        status.
+        """
+
+        signal.signal(signal.SIGTERM, self.__handle_stop)
+        signal.signal(signal.SIGINT, self.__handle_stop)
+        signal.signal(signal.SIGHUP, self.__handle_reload)
+
+        for helper in self._helpers:
+            self.__spawn(helper)
+
+        for _ in range(self.processes):
+            self.__spawn(self._target)
+
+        logger.info(
+            'Started {0} web service processes (supervisor pid: {1})'.format(
+                self.processes, os.getpid()))
+
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+
+            child = self._children.pop(pid, None)
+
+            if child is None or self._stopping:
+                continue
+
+            func, started = child
+
+            logger.warning(
+                'Process {0} exited (status: {1}); restarting'.format(
+                    pid, status))
+
+            if time.monotonic() - started < self.MIN_UPTIME:
+                # Avoid restarting a failing process in a tight loop
+                time.sleep(self.RESTART_DELAY)
+
+                if self._stopping:
+                    continue
+
+            self.__spawn(func)
+
+        return 0
@@ -0,0 +1,396 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import logging
+import os
+import socket
+import threading
+import uuid
+
+from tortuga.db.dbManager import DbManager
+from tortuga.db.nodeRequestsDbHandler import NodeRequestsDbHandler
+from tortuga.exceptions.serviceBusy import ServiceBusy
+from .threadManager import threadManager
+from .worker import get_ws_worker_action_map
+
+
+class RequestQueue(object):
+    """
+    Durable queue of asynchronous node requests (add/delete nodes).
+
+    Requests are stored in the NodeRequests table. A web service process
+    processing a request holds a lease on it, which is renewed while the
+    request is queued or running. Requests whose lease has expired (ie.
+    the process exited or crashed) are claimed by the next process
+    polling the table, so any number of web service processes may share
+    the database. Pending requests are claimed highest priority first,
+    then oldest first.
+
+    Requests are handed to the local ThreadManager for processing.
+    Requests submitted to this process are claimed immediately; other
+    requests are claimed by polling when worker threads are available.
+
+    A request whose worker action raises an exception is retried with
+    exponential backoff until 'max_attempts' attempts have been made,
+    after which it is marked as failed. Actions that are not safe to
+    retry (ie. adding hosts) record their own failures and are not
+    retried; an interrupted request of such an action is only resumed
+    if the action reports that the previous attempt made no changes.
+    """
+
+    # Seconds between polls for claimable requests
+    DEFAULT_POLL_INTERVAL = 5
+
+    # Seconds a request remains claimed by a process without renewal
+    DEFAULT_LEASE_DURATION = 120
+
+    DEFAULT_MAX_ATTEMPTS = 3
+
+    # Delay (in seconds) before the first retry; doubled for each
+    # subsequent attempt up to BACKOFF_MAX
+    BACKOFF_BASE = 30
+    BACKOFF_MAX = 900
+
+    def __init__(self, thrdmgr=None, dbm=None, clock=None):
+        self._logger = logging.getLogger(
+            'tortuga.web_service.{0}'.format(self.__class__.__name__))
+        self._logger.addHandler(logging.NullHandler())
+
+        self._thrdmgr = thrdmgr or threadManager
+        self._dbm = dbm
+        self._clock = clock or datetime.datetime.utcnow
+
+        self._handler = NodeRequestsDbHandler()
+
+        self.poll_interval = self.DEFAULT_POLL_INTERVAL
+        self.lease_duration = self.DEFAULT_LEASE_DURATION
+        self.max_attempts = self.DEFAULT_MAX_ATTEMPTS
+
+        # Unique identifier of this process used as lease owner
+        self.owner = '{0}:{1}:{2}'.format(
+            socket.gethostname(), os.getpid(), uuid.uuid4().hex[:8])
+
+        self._lock = threading.Lock()
+
+        # Ids of requests leased by this process
+        self._held = set()
+
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+        self._next_renewal = None
+
+    def getLogger(self):
+        return self._logger
+
+    def configure(self, poll_interval=None, lease_duration=None,
+                  max_attempts=None):
+        if poll_interval is not None:
+            self.poll_interval = poll_interval
+
+        if lease_duration is not None:
+            self.lease_duration = lease_duration
+
+        if max_attempts is not None:
+            self.max_attempts = max_attempts
+
+    def __get_dbm(self):
+        return self._dbm or DbManager()
+
+    def __get_lease_expiry(self, now):
+        return now + datetime.timedelta(seconds=self.lease_duration)
+
+    @staticmethod
+    def __get_action_class(node_request):
+        return get_ws_worker_action_map().get(node_request.action)
+
+    def __get_worker_request(self, node_request):
+        action_class = self.__get_action_class(node_request)
+
+        return {
+            'action': node_request.action,
+            'node_request_id': node_request.id,
+            'data': action_class.get_request_data(node_request)
+                    if action_class else None,
+        }
+
+    def submit(self, session, node_request):
+        """
+        Store new request and queue it for processing by this process
+
+        Raises:
+            ServiceBusy
+        """
+
+        # Reject the request before creating its record if the queue is
+        # full
+        with self._thrdmgr.reserve_slot() as slot:
+            now = self._clock()
+
+            node_request.state = 'processing'
+            node_request.lease_owner = self.owner
+            node_request.lease_expires = self.__get_lease_expiry(now)
+            node_request.attempts = 1
+
+            session.add(node_request)
+
+            session.commit()
+
+            with self._lock:
+                self._held.add(node_request.id)
+
+            slot.enqueue(self.__get_worker_request(node_request))
+
+    def start(self):
+        """
+        Start thread claiming requests from the database and renewing
+        leases
+        """
+
+        self._thrdmgr.add_done_callback(self.complete)
+
+        self._stopping = False
+
+        self._thread = threading.Thread(target=self.__run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop polling and release leases so other processes may claim
+        unfinished requests immediately
+        """
+
+        self._stopping = True
+
+        self._wakeup.set()
+
+        if self._thread is not None:
+            self._thread.join()
+
+            self._thread = None
+
+        with self._lock:
+            held, self._held = self._held, set()
+
+        if not held:
+            return
+
+        with self.__get_dbm().session() as session:
+            self._handler.release_leases(session, self.owner, held)
+
+            session.commit()
+
+    def __run(self):
+        while not self._stopping:
+            try:
+                self.renew_leases()
+
+                self.poll()
+            except Exception:
+                self.getLogger().exception('Error polling request queue')
+
+            self._wakeup.wait(self.poll_interval)
+
+            self._wakeup.clear()
+
+    def renew_leases(self, force=False):
+        """
+        Extend leases on requests held by this process once a third of
+        the lease duration has passed
+        """
+
+        now = self._clock()
+
+        if not force and self._next_renewal is not None and \
+                now < self._next_renewal:
+            return
+
+        self._next_renewal = now + datetime.timedelta(
+            seconds=self.lease_duration / 3.0)
+
+        with self._lock:
+            held = list(self._held)
+
+        if not held:
+            return
+
+        with self.__get_dbm().session() as session:
+            count = self._handler.renew_leases(
+                session, self.owner, held, self.__get_lease_expiry(now))
+
+            session.commit()
+
+        if count != len(held):
+            self.getLogger().warning(
+                'Renewed {0} of {1} request leases'.format(count, len(held)))
+
+    def poll(self):
+        """
+        Claim pending requests and requests with expired leases, up to
+        the number of idle worker threads. Returns number of requests
+        claimed.
+        """
+
+        capacity = self._thrdmgr.get_idle_capacity()
+
+        if capacity <= 0:
+            return 0
+
+        claimed = 0
+
+        with self.__get_dbm().session() as session:
+            now = self._clock()
+
+            node_request_ids = [
+                node_request.id
+                for node_request in self._handler.get_claimable(
+                    session, now, capacity)
+            ]
+
+            for node_request_id in node_request_ids:
+                if not self._handler.claim(
+                        session, node_request_id, self.owner,
+                        self.__get_lease_expiry(now), now):
+                    # Claimed by another process
+                    continue
+
+                session.commit()
+
+                node_request = self._handler.get_by_id(
+                    session, node_request_id)
+
+                if node_request.attempts > self.max_attempts:
+                    # Lease expired on the final attempt
+                    self.__fail(
+                        session, node_request,
+                        'Request abandoned after {0} attempts'.format(
+                            self.max_attempts))
+
+                    continue
+
+                action_class = self.__get_action_class(node_request)
+
+                if node_request.attempts > 1 and action_class and \
+                        not action_class.can_resume(session, node_request):
+                    # Previous attempt was interrupted part way through
+                    self.__fail(
+                        session, node_request,
+                        'Request interrupted and cannot be resumed')
+
+                    continue
+
+                self.getLogger().debug(
+                    'Claimed request [{0}] (attempt {1})'.format(
+                        node_request.addHostSession, node_request.attempts))
+
+                with self._lock:
+                    self._held.add(node_request.id)
+
+                try:
+                    self._thrdmgr.enqueue(
+                        self.__get_worker_request(node_request))
+                except ServiceBusy:
+                    self.__release(session, node_request)
+
+                    break
+
+                claimed += 1
+
+        return claimed
+
+    def __release(self, session, node_request):
+        with self._lock:
+            self._held.discard(node_request.id)
+
+        self._handler.release_leases(session, self.owner, [node_request.id])
+
+        session.commit()
+
+    def __fail(self, session, node_request, message):
+        if node_request.message:
+            # Keep the error recorded by the worker action
+            message = '{0}: {1}'.format(message, node_request.message)
+
+        node_request.state = 'error'
+        node_request.message = message
+        node_request.lease_owner = None
+        node_request.lease_expires = None
+        node_request.last_update = self._clock()
+
+        session.commit()
+
+    def complete(self, request, failed=False):
+        """
+        Called when processing of 'request' has finished. Requests
+        completed by their worker action have already been removed or
+        marked as failed; a request whose action raised an exception is
+        rescheduled or marked as failed.
+        """
+
+        node_request_id = request.get('node_request_id')
+
+        if node_request_id is None:
+            return
+
+        with self._lock:
+            self._held.discard(node_request_id)
+
+        with self.__get_dbm().session() as session:
+            node_request = self._handler.get_by_id(session, node_request_id)
+
+            if node_request is None or \
+                    node_request.state != 'processing' or \
+                    node_request.lease_owner != self.owner:
+                return
+
+            action_class = self.__get_action_class(node_request)
+
+            if not failed:
+                session.delete(node_request)
+
+                session.commit()
+            elif action_class and not action_class.retry_on_error:
+                self.__fail(session, node_request, 'Request failed')
+            elif node_request.attempts >= self.max_attempts:
+                self.__fail(
+                    session, node_request,
+                    'Request failed after {0} attempts'.format(
+                        node_request.attempts))
+            else:
+                now = self._clock()
+
+                delay = min(
+                    self.BACKOFF_BASE * 2 ** (node_request.attempts - 1),
+                    self.BACKOFF_MAX)
+
+                self.getLogger().info(
+                    'Retrying request [{0}] in {1} seconds'.format(
+                        node_request.addHostSession, delay))
+
+                node_request.state = 'pending'
+                node_request.lease_owner = None
+                node_request.lease_expires = None
+                node_request.next_attempt = \
+                    now + datetime.timedelta(seconds=delay)
+                node_request.last_update = now
+
+                session.commit()
+
+        # Worker thread is available for another request
+        self._wakeup.set()
+
+
+requestQueue = RequestQueue()
@@ -12,12 +12,96 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import itertools
 import logging
 import threading
-import queue
+import time
+
+from tortuga.exceptions.serviceBusy import ServiceBusy
+
+
+class _ActionMetrics(object):
+    def __init__(self):
+        self.processed = 0
+        self.failed = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.run_time_total = 0.0
+        self.run_time_max = 0.0
+
+    def record(self, wait_time, run_time, failed):
+        self.processed += 1
+
+        if failed:
+            self.failed += 1
+
+        self.wait_time_total += wait_time
+        self.wait_time_max = max(self.wait_time_max, wait_time)
+
+        self.run_time_total += run_time
+        self.run_time_max = max(self.run_time_max, run_time)
+
+    def to_dict(self):
+        return {
+            'processed': self.processed,
+            'failed': self.failed,
+            'wait_time_avg': self.wait_time_total / self.processed
+                             if self.processed else 0.0,
+            'wait_time_max': self.wait_time_max,
+            'run_time_avg': self.run_time_total / self.processed
+                            if self.processed else 0.0,
+            'run_time_max': self.run_time_max,
+        }
+
+
+class _Reservation(object):
+    """
+    Queue slot reserved by ThreadManager.reserve_slot(). The slot is
+    released on exit if no request was enqueued.
+    """
+
+    def __init__(self, thrdmgr):
+        self._thrdmgr = thrdmgr
+        self._used = False
+
+    def enqueue(self, request):
+        self._used = True
+
+        self._thrdmgr._put(request)  # pylint: disable=protected-access
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        if not self._used:
+            self._thrdmgr._release()  # pylint: disable=protected-access
 
 
 class ThreadManager(object):
+    """
+    Pool of worker threads processing asynchronous web service requests
+    (add/delete nodes, etc.).
+
+    The pool starts 'min_workers' threads and grows to 'max_workers' as
+    requests are queued; threads idle for IDLE_TIMEOUT seconds exit
+    while more than 'min_workers' are running. At most 'max_queue_size'
+    requests may be queued; further requests raise ServiceBusy.
+
+    Requests are dispatched to the registered worker action by name.
+    The number of concurrently processed requests of each action is
+    limited by 'action_limits' (or the action's 'max_concurrency'), so
+    one action cannot occupy all workers. Queued requests are otherwise
+    processed in order of arrival.
+    """
+
+    DEFAULT_MIN_WORKERS = 2
+    DEFAULT_MAX_WORKERS = 8
+    DEFAULT_MAX_QUEUE_SIZE = 1000
+
+    # Seconds an idle worker thread waits before exiting
+    IDLE_TIMEOUT = 60
+
     def __init__(self):
         super(ThreadManager, self).__init__()
 
@@ -25,19 +109,288 @@ class ThreadManager(object):
             'tortuga.web_service.{0}'.format(self.__class__.__name__))
         self._logger.addHandler(logging.NullHandler())
 
-        self._queue = queue.Queue()
         self._lock = threading.RLock()
 
+        self._cond = threading.Condition(threading.Lock())
+
+        self.min_workers = self.DEFAULT_MIN_WORKERS
+        self.max_workers = self.DEFAULT_MAX_WORKERS
+        self.max_queue_size = self.DEFAULT_MAX_QUEUE_SIZE
+        self.action_limits = {}
+
+        # Worker action instances keyed on action name
+        self._actions = {}
+
+        # Queued requests keyed on action name; each entry is a tuple
+        # (sequence number, time queued, request)
+        self._pending = collections.OrderedDict()
+
+        self._sequence = itertools.count()
+
+        self._queued = 0
+        self._reserved = 0
+        self._rejected = 0
+
+        # Number of requests being processed keyed on action name
+        self._active = collections.Counter()
+
+        self._metrics = collections.defaultdict(_ActionMetrics)
+
+        self._workers = 0
+        self._idle_workers = 0
+        self._thread_ids = itertools.count()
+
+        self._worker_target = None
+
+        # Functions called with (request, failed) when a request has
+        # been processed
+        self._done_callbacks = []
+
     def getLogger(self):
         return self._logger
 
-    @property
-    def queue(self):
-        return self._queue
-
     @property
     def transaction_lock(self):
         return self._lock
 
+    def configure(self, min_workers=None, max_workers=None,
+                  max_queue_size=None, action_limits=None):
+        with self._cond:
+            if min_workers is not None:
+                self.min_workers = min_workers
+
+            if max_workers is not None:
+                self.max_workers = max_workers
+
+            if max_queue_size is not None:
+                self.max_queue_size = max_queue_size
+
+            if action_limits is not None:
+                self.action_limits = dict(action_limits)
+
+            self.max_workers = max(self.max_workers, self.min_workers, 1)
+
+    def start(self, action_classes, worker_target):
+        """
+        Instantiate worker actions and start 'min_workers' threads
+        running 'worker_target(thread_id, thread_manager)'
+
+        :param action_classes: dict of worker action classes keyed on
+                               action name
+        """
+
+        with self._cond:
+            self._actions = {
+                name: action_class()
+                for name, action_class in action_classes.items()
+            }
+
+            self._worker_target = worker_target
+
+            for _ in range(self.min_workers - self._workers):
+                self.__start_worker()
+
+    def __start_worker(self):
+        # Called with self._cond held
+        self._workers += 1
+
+        t = threading.Thread(
+            target=self._worker_target,
+            args=(next(self._thread_ids), self),
+            daemon=True)
+        t.start()
+
+    def add_done_callback(self, callback):
+        """
+        Register function called as 'callback(request, failed)' by the
+        worker thread after processing each request
+        """
+
+        with self._cond:
+            if callback not in self._done_callbacks:
+                self._done_callbacks.append(callback)
+
+    def get_action_limit(self, name):
+        """
+        Return maximum number of concurrent requests for action 'name'
+        """
+
+        limit = self.action_limits.get(name)
+
+        if limit is None:
+            action = self._actions.get(name)
+
+            limit = getattr(action, 'max_concurrency', None)
+
+        return min(limit, self.max_workers) if limit else self.max_workers
+
+    def reserve_slot(self):
+        """
+        Reserve a queue slot. Use as a context manager; call enqueue()
+        on the returned object once the request may be processed (ie.
+        after committing the request record).
+
+        Raises:
+            ServiceBusy
+        """
+
+        with self._cond:
+            if self._queued + self._reserved >= self.max_queue_size:
+                self._rejected += 1
+
+                raise ServiceBusy(
+                    'Request queue is full ({0} requests); retry'
+                    ' later'.format(self.max_queue_size))
+
+            self._reserved += 1
+
+        return _Reservation(self)
+
+    def enqueue(self, request):
+        """
+        Raises:
+            ServiceBusy
+        """
+
+        with self.reserve_slot() as slot:
+            slot.enqueue(request)
+
+    def _release(self):
+        with self._cond:
+            self._reserved -= 1
+
+    def _put(self, request):
+        with self._cond:
+            self._reserved -= 1
+
+            self._pending.setdefault(request['action'], collections.deque())\
+                .append((next(self._sequence), time.monotonic(), request))
+
+            self._queued += 1
+
+            if self._worker_target is not None and \
+                    self._idle_workers < self._queued and \
+                    self._workers < self.max_workers:
+                self.__start_worker()
+
+            self._cond.notify_all()
+
+    def __pop_eligible(self):
+        # Called with self._cond held. Returns oldest queued request of
+        # an action below its concurrency limit.
+        selected = None
+
+        for name, requests in self._pending.items():
+            if not requests or \
+                    self._active[name] >= self.get_action_limit(name):
+                continue
+
+            if selected is None or requests[0][0] < \
+                    self._pending[selected][0][0]:
+                selected = name
+
+        if selected is None:
+            return None
+
+        _, queued, request = self._pending[selected].popleft()
+
+        self._queued -= 1
+
+        self._active[selected] += 1
+
+        return request, time.monotonic() - queued
+
+    def get_request(self):
+        """
+        Block until a request may be processed. Returns tuple (request,
+        action, wait time) or None if the calling worker should exit.
+        """
+
+        with self._cond:
+            while True:
+                result = self.__pop_eligible()
+
+                if result is not None:
+                    request, wait_time = result
+
+                    return request, self._actions.get(request['action']), \
+                        wait_time
+
+                if self._workers > self.max_workers:
+                    # Pool was reconfigured
+                    self._workers -= 1
+
+                    return None
+
+                self._idle_workers += 1
+
+                try:
+                    notified = self._cond.wait(self.IDLE_TIMEOUT)
+                finally:
+                    self._idle_workers -= 1
+
+                if not notified and self._workers > self.min_workers:
+                    self._workers -= 1
+
+                    return None
+
+    def task_done(self, request, wait_time, run_time, failed=False):
+        with self._cond:
+            self._active[request['action']] -= 1
+
+            self._metrics[request['action']].record(
+                wait_time, run_time, failed)
+
+            # Requests held back by the concurrency limit may now run
+            self._cond.notify_all()
+
+            callbacks = list(self._done_callbacks)
+
+        for callback in callbacks:
+            try:
+                callback(request, failed)
+            except Exception:
+                self._logger.exception(
+                    'Error in request completion callback')
+
+    def get_idle_capacity(self):
+        """
+        Return number of additional requests that could be processed
+        immediately
+        """
+
+        with self._cond:
+            return max(0, min(
+                self.max_workers - sum(self._active.values()) -
+                self._queued,
+                self.max_queue_size - self._queued - self._reserved))
+
+    def getMetrics(self):
+        """
+        Return queue depth, worker and latency metrics (times in seconds)
+        """
+
+        with self._cond:
+            names = set(self._pending) | set(self._active) | \
+                set(self._metrics)
+
+            return {
+                'workers': self._workers,
+                'idle_workers': self._idle_workers,
+                'min_workers': self.min_workers,
+                'max_workers': self.max_workers,
+                'queue_depth': self._queued,
+                'max_queue_size': self.max_queue_size,
+                'rejected': self._rejected,
+                'actions': {
+                    name: dict(
+                        queue_depth=len(self._pending.get(name, ())),
+                        active=self._active[name],
+                        limit=self.get_action_limit(name),
+                        **self._metrics[name].to_dict())
+                    for name in names
+                },
+            }
+
 
 threadManager = ThreadManager()
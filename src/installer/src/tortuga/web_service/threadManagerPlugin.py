@@ -12,10 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import threading
 from cherrypy.process import plugins
+from .requestQueue import requestQueue
 from .threadManager import threadManager
-from .worker import worker_thread
+from .worker import get_ws_worker_action_map, worker_thread
 from tortuga.kit.loader import load_kits
 from tortuga.kit.registry import get_all_kit_installers
 
@@ -34,17 +34,23 @@ class ThreadManagerPlugin(plugins.SimplePlugin):
             kit_installer = kit_installer_class()
             kit_installer.register_web_service_worker_actions()
 
-        # Create 8 worker threads
-        num_worker_threads = 8
-
         self.bus.log(
-            '[{0}] Initializing {1} worker threads'.format(
-                self.__class__.__name__, num_worker_threads))
+            '[{0}] Initializing {1}-{2} worker threads'
+            ' (queue size: {3})'.format(
+                self.__class__.__name__, threadManager.min_workers,
+                threadManager.max_workers, threadManager.max_queue_size))
+
+        threadManager.start(get_ws_worker_action_map(), worker_thread)
 
-        for thread_id in range(num_worker_threads):
-            t = threading.Thread(target=worker_thread,
-                                 args=(thread_id, threadManager))
-            t.setDaemon(True)
-            t.start()
+        # Resume requests left unfinished by previous (or other) web
+        # service processes
+        requestQueue.start()
 
     start.priority = 85
+
+    def stop(self):
+        self.bus.log(
+            '[{0}] Releasing unfinished requests'.format(
+                self.__class__.__name__))
+
+        requestQueue.stop()
@@ -14,21 +14,66 @@
 
 # pylint: disable=no-member
 
+import json
+import logging
 import os.path
+import threading
 from cherrypy.process import plugins
 import zmq
+from tortuga.db.changeEvents import register_event_publisher
 from tortuga.types import Singleton
 from . import app
+from .eventBroker import EventSequencer, eventBroker
+
+
+# Subscribers connect to this socket
+WORKQUEUE_SOCKET = 'var/tmp/tortugawsd.sock'
+
+# Web service processes publish to this socket when several processes
+# are running; messages are forwarded to WORKQUEUE_SOCKET
+WORKQUEUE_FORWARDER_SOCKET = 'var/tmp/tortugawsd-pub.sock'
+
+
+def _get_socket_address(path):
+    return 'ipc://%s' % (os.path.join(app.cm.getRoot(), path))
+
+
+logger = logging.getLogger('tortuga.web_service.workqueue')
+logger.addHandler(logging.NullHandler())
 
 
 class Workqueue(Singleton):
-    def __init__(self):
+    def __init__(self, forwarded=False):
         self.__context = zmq.Context()
         self.__socket = self.__context.socket(zmq.PUB)
 
-        sockfn = os.path.join(app.cm.getRoot(), 'var/tmp/tortugawsd.sock')
+        # zmq sockets must not be used concurrently
+        self.__lock = threading.Lock()
+
+        if forwarded:
+            # Events are numbered by the forwarder
+            self.__sequencer = None
 
-        self.__socket.bind('ipc://%s' % (sockfn))
+            self.__socket.connect(
+                _get_socket_address(WORKQUEUE_FORWARDER_SOCKET))
+        else:
+            self.__sequencer = EventSequencer()
+
+            self.__socket.bind(_get_socket_address(WORKQUEUE_SOCKET))
+
+    def publish(self, topic, event):
+        """
+        Publish event (dict) on 'topic'
+        """
+
+        msg = [topic.encode('utf-8'),
+               json.dumps(event, default=str).encode('utf-8')]
+
+        if self.__sequencer is not None:
+            msg = self.__sequencer.stamp(*msg)
+
+        with self.__lock:
+            self.__socket.send_multipart(msg)
 
     @property
     def socket(self):
@@ -39,17 +84,75 @@ class Workqueue(Singleton):
         return self.__context
 
 
+def run_workqueue_forwarder():
+    """
+    Forward messages published by all web service processes to
+    workqueue subscribers. Runs until terminated.
+    """
+
+    context = zmq.Context()
+
+    frontend = context.socket(zmq.XSUB)
+    frontend.bind(_get_socket_address(WORKQUEUE_FORWARDER_SOCKET))
+
+    backend = context.socket(zmq.XPUB)
+    backend.bind(_get_socket_address(WORKQUEUE_SOCKET))
+
+    sequencer = EventSequencer()
+
+    poller = zmq.Poller()
+    poller.register(frontend, zmq.POLLIN)
+    poller.register(backend, zmq.POLLIN)
+
+    try:
+        while True:
+            ready = dict(poller.poll())
+
+            if frontend in ready:
+                msg = frontend.recv_multipart()
+
+                if len(msg) == 2:
+                    try:
+                        msg = sequencer.stamp(*msg)
+                    except ValueError:
+                        logger.warning('Forwarding malformed event')
+
+                backend.send_multipart(msg)
+
+            if backend in ready:
+                # Subscription messages
+                frontend.send_multipart(backend.recv_multipart())
+    finally:
+        frontend.close()
+        backend.close()
+        context.term()
+
+
 class WorkQueuePlugin(plugins.SimplePlugin):
+    def __init__(self, bus, forwarded=False):
+        super(WorkQueuePlugin, self).__init__(bus)
+
+        # Publish through the forwarder process (multi-process mode)
+        self.forwarded = forwarded
+
     def start(self):
         self.bus.log('WorkQueuePlugin start() called')
 
-        Workqueue()
+        wq = Workqueue(forwarded=self.forwarded)
+
+        eventBroker.start(_get_socket_address(WORKQUEUE_SOCKET))
+
+        register_event_publisher(wq.publish)
 
     start.priority = 80
 
     def stop(self):
         self.bus.log('WorkQueuePlugin stop() called')
 
+        register_event_publisher(None)
+
+        eventBroker.stop()
+
         wq = Workqueue()
         wq.socket.close()
         wq.context.term()
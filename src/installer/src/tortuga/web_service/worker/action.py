@@ -1,5 +1,30 @@
 class WorkerAction:
     name = None
 
+    # Maximum number of requests for this action processed at once
+    # (None for no limit other than the number of worker threads)
+    max_concurrency = None
+
+    # Whether a request whose processing raised an exception is retried
+    # (with backoff) by the request queue
+    retry_on_error = True
+
+    @classmethod
+    def can_resume(cls, session, node_request):
+        """
+        Return False if the stored NodeRequests record 'node_request',
+        whose previous attempt was interrupted (ie. the process crashed
+        or its lease expired), must not be processed again
+        """
+        return True
+
+    @classmethod
+    def get_request_data(cls, node_request):
+        """
+        Return request data for processing of the stored NodeRequests
+        record 'node_request'
+        """
+        return None
+
     def process_request(self, request):
         pass
\ No newline at end of file
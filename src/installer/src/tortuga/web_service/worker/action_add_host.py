@@ -1,9 +1,28 @@
 from .action import WorkerAction
 from tortuga.addhost.addHostRequest import process_addhost_request
+from tortuga.db.nodes import Nodes
 
 
 class AddHostWorkerAction(WorkerAction):
     name = 'ADD'
 
+    # Adding hosts is not idempotent; failures are recorded in the
+    # request by process_addhost_request()
+    retry_on_error = False
+
+    @classmethod
+    def can_resume(cls, session, node_request):
+        # Nodes (and instances) created by the interrupted attempt would
+        # be added again
+        return session.query(Nodes.id).filter(
+            Nodes.addHostSession == node_request.addHostSession
+        ).first() is None
+
+    @classmethod
+    def get_request_data(cls, node_request):
+        return {
+            'addHostSession': node_request.addHostSession,
+        }
+
     def process_request(self, request):
         process_addhost_request(request['data']['addHostSession'])
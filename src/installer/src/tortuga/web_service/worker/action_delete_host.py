@@ -5,5 +5,15 @@ from tortuga.addhost.deleteHostRequest import process_delete_host_request
 class DeleteHostWorkerAction(WorkerAction):
     name = 'DELETE'
 
+    # Leave workers available for add host requests
+    max_concurrency = 4
+
+    @classmethod
+    def get_request_data(cls, node_request):
+        return {
+            'transaction_id': node_request.addHostSession,
+            'nodespec': node_request.request,
+        }
+
     def process_request(self, request):
         process_delete_host_request(request['data'])
@@ -43,3 +43,14 @@ def get_all_ws_worker_actions():
 
     """
     return [wc for wc in WS_WORKER_ACTION_REGISTRY]
+
+
+def get_ws_worker_action_map():
+    """
+    Gets a dict of all web service worker action classes keyed on
+    action name
+
+    :return: a dict of worker action classes
+
+    """
+    return {wc.name: wc for wc in WS_WORKER_ACTION_REGISTRY}
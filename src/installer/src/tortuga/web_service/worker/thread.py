@@ -12,10 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
 from logging import getLogger
 
-from .registry import get_all_ws_worker_actions
-
 
 logger = getLogger(__name__)
 
@@ -29,20 +28,36 @@ def worker_thread(thread_id, thrdmgr):
         logger.debug('Starting worker thread: {}'.format(thread_id))
 
     while True:
-        request = thrdmgr.queue.get()
+        item = thrdmgr.get_request()
+
+        if item is None:
+            logger.debug('Stopping idle worker thread: {}'.format(thread_id))
+
+            break
+
+        request, action, wait_time = item
+
+        failed = False
+
+        start = time.monotonic()
 
         try:
             logger.debug('Thread_id {} processing item: {}'.format(
                 thread_id, request['action']))
 
-            for action_class in get_all_ws_worker_actions():
-                if request['action'] == action_class.name:
-                    action = action_class()
-                    action.process_request(request)
+            if action is None:
+                logger.warning(
+                    'No worker action registered for: {}'.format(
+                        request['action']))
+            else:
+                action.process_request(request)
 
         except Exception:
+            failed = True
+
             with thrdmgr.transaction_lock:
                 logger.exception('Error processing worker thread')
 
         finally:
-            thrdmgr.queue.task_done()
+            thrdmgr.task_done(
+                request, wait_time, time.monotonic() - start, failed=failed)
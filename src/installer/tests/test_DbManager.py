@@ -14,10 +14,81 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
 import unittest
 import pytest
+from tortuga.db.dbManager import DbManagerBase
 
 
 def test_instantiation(dbm):
     with dbm.session() as session:
         pass
+
+
+def test_nested_sessions(dbm):
+    session = dbm.openSession()
+
+    try:
+        # Nested calls get their own session, so committing or rolling
+        # back does not affect the caller's transaction
+        nested_session = dbm.openSession()
+
+        assert nested_session is not session
+
+        dbm.closeSession()
+
+        assert dbm.Session.registry.has()
+        assert dbm.Session() is session
+    finally:
+        dbm.closeSession()
+
+    assert not dbm.Session.registry.has()
+
+    # Session factory is reused
+    Session = dbm.Session
+
+    with dbm.session():
+        pass
+
+    assert dbm.Session is Session
+
+
+def test_concurrent_first_sessions(dbm):
+    manager = DbManagerBase(engine=dbm.engine)
+
+    # Tables were mapped by 'dbm'
+    manager._tables_mapped = True  # pylint: disable=protected-access
+
+    barrier = threading.Barrier(8)
+
+    factories = []
+
+    def open_session():
+        barrier.wait()
+
+        manager.openSession()
+
+        factories.append(manager.Session)
+
+        manager.closeSession()
+
+    threads = [threading.Thread(target=open_session) for _ in range(8)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    # Single session factory shared by all threads
+    assert len(factories) == 8
+    assert all(factory is manager.Session for factory in factories)
+
+
+def test_getPoolStatus(dbm):
+    status = dbm.getPoolStatus()
+
+    assert status['pool'] == dbm.engine.pool.__class__.__name__
+
+    assert set(status.keys()) == \
+        {'pool', 'size', 'checkedin', 'checkedout', 'overflow'}
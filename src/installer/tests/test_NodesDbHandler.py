@@ -16,9 +16,18 @@
 
 import unittest
 import pytest
+from sqlalchemy import event, inspect
+from tortuga.db.hardwareProfiles import HardwareProfiles
+from tortuga.db.nics import Nics
 from tortuga.db.nodes import Nodes
+from tortuga.db.operatingSystems import OperatingSystems
+from tortuga.db.resourceAdapters import ResourceAdapters
+from tortuga.db.softwareProfiles import SoftwareProfiles
 from tortuga.db.tags import Tags
 from tortuga.db.nodesDbHandler import NodesDbHandler
+from tortuga.exceptions.nodeNotFound import NodeNotFound
+from tortuga.db.tortugaDbApi import TortugaDbApi
+from tortuga.objects.node import Node
 
 
 @pytest.mark.usefixtures('dbm_class')
@@ -143,6 +152,189 @@ class TestNodesDbHandler(unittest.TestCase):
         assert nodes[3] in result
 
 
+    def test_getNodeList_paged(self):
+        tags = get_tags()
+        nodes = get_nodes()
+
+        populate(self.session, tags, nodes)
+
+        result = NodesDbHandler().getNodeList(
+            self.session, limit=3, after='compute-02')
+
+        assert [node.name for node in result] == \
+            ['compute-03', 'compute-04', 'compute-05']
+
+    def test_getNodeList_software_profile_paged(self):
+        softwareprofile = SoftwareProfiles('swprofile')
+        softwareprofile.os = OperatingSystems('centos', '7', 'x86_64')
+        softwareprofile.type = 'compute'
+
+        for name in ('compute-04', 'compute-01', 'compute-03',
+                     'compute-02'):
+            node = Nodes(name)
+            node.softwareprofile = softwareprofile
+
+            self.session.add(node)
+
+        self.session.add(Nodes('compute-00'))
+
+        self.session.flush()
+
+        result = NodesDbHandler().getNodeList(
+            self.session, softwareProfile='swprofile', limit=2,
+            after='compute-01')
+
+        assert [node.name for node in result] == \
+            ['compute-02', 'compute-03']
+
+    def test_getNodeList_relations(self):
+        tags = get_tags()
+        nodes = get_nodes()
+
+        populate(self.session, tags, nodes)
+
+        self.session.flush()
+        self.session.expire_all()
+
+        result = NodesDbHandler().getNodeList(
+            self.session, relations=['nics'])
+
+        unloaded = inspect(result[0]).unloaded
+
+        assert 'nics' not in unloaded
+
+        assert {'tags', 'hardwareprofile', 'softwareprofile'} <= unloaded
+
+    def test_getNode_case_insensitive(self):
+        node = Nodes('Compute-01.Example.com')
+
+        self.session.add(node)
+
+        assert NodesDbHandler().getNode(
+            self.session, 'compute-01.example.COM') == node
+
+        # Short host name matches fully-qualified name
+        assert NodesDbHandler().getNode(self.session, 'COMPUTE-01') == node
+
+        with pytest.raises(NodeNotFound):
+            NodesDbHandler().getNode(self.session, 'compute-0')
+
+        # Renamed node is found by new name only
+        node.name = 'Compute-02'
+
+        assert NodesDbHandler().getNode(self.session, 'compute-02') == node
+
+        with pytest.raises(NodeNotFound):
+            NodesDbHandler().getNode(self.session, 'compute-01')
+
+    def test_getNodesByAddHostSession_after(self):
+        nodes = [Nodes('addhost-%02d' % (index)) for index in range(3)]
+
+        for node in nodes:
+            node.addHostSession = 'session1'
+
+        self.session.add_all(nodes)
+        self.session.flush()
+
+        assert NodesDbHandler().getNodesByAddHostSession(
+            self.session, 'session1') == nodes
+
+        assert NodesDbHandler().getNodesByAddHostSession(
+            self.session, 'session1', after=nodes[0].id) == nodes[1:]
+
+        assert NodesDbHandler().getNodesByAddHostSession(
+            self.session, 'session1', after=nodes[-1].id) == []
+
+    def test_getNodesByIps(self):
+        nodes = get_nodes()
+
+        for index, node in enumerate(nodes):
+            node.nics.append(Nics(ip='10.1.0.%d' % (index + 1)))
+
+        # Node with multiple NICs
+        nodes[0].nics.append(Nics(ip='10.2.0.1'))
+
+        self.session.add_all(nodes)
+
+        result = NodesDbHandler().getNodesByIps(
+            self.session, ['10.1.0.1', '10.2.0.1', '10.1.0.3', '10.9.0.1'])
+
+        assert result == {
+            '10.1.0.1': nodes[0],
+            '10.2.0.1': nodes[0],
+            '10.1.0.3': nodes[2],
+        }
+
+    def test_getNodeList_query_count(self):
+        # The number of statements issued to list nodes (including
+        # conversion to Node objects) must not depend on the node count
+        os_info = OperatingSystems('centos', '7', 'x86_64')
+        resourceadapter = ResourceAdapters('default')
+
+        assert count_node_list_queries(
+            self.dbm, self.session, os_info, resourceadapter, 5) == \
+            count_node_list_queries(
+                self.dbm, self.session, os_info, resourceadapter, 50)
+
+
+def count_node_list_queries(dbm, session, os_info, resourceadapter,
+                            count):
+    hardwareprofile = HardwareProfiles('hwprofile-%d' % (count))
+    hardwareprofile.resourceadapter = resourceadapter
+
+    softwareprofile = SoftwareProfiles('swprofile-%d' % (count))
+    softwareprofile.os = os_info
+    softwareprofile.type = 'compute'
+
+    tag = Tags('tag-%d' % (count), 'value')
+
+    for index in range(count):
+        node = Nodes('node-%d-%04d' % (count, index))
+        node.hardwareprofile = hardwareprofile
+        node.softwareprofile = softwareprofile
+        node.nics.append(Nics(ip='10.%d.0.%d' % (count, index)))
+        node.tags.append(tag)
+
+        session.add(node)
+
+    session.flush()
+
+    # Ensure nothing is served from the identity map
+    session.expunge_all()
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(dbm.engine, 'before_cursor_execute', before_cursor_execute)
+
+    try:
+        dbNodes = NodesDbHandler().getNodeList(
+            session, tags=[('tag-%d' % (count),)])
+
+        assert len(dbNodes) == count
+
+        # Mimic NodeDbApi conversion of database objects to Node objects
+        for dbNode in dbNodes:
+            TortugaDbApi().loadRelations(dbNode, {
+                'softwareprofile': True,
+                'hardwareprofile': True,
+                'tags': True,
+            })
+
+            node = Node.getFromDbDict(dbNode.__dict__)
+
+            assert node.getResourceAdapter() == 'default'
+            assert node.getSoftwareProfile().getName() == \
+                softwareprofile.name
+            assert node.getTags() == {tag.name: 'value'}
+    finally:
+        event.remove(
+            dbm.engine, 'before_cursor_execute', before_cursor_execute)
+
+    return len(statements)
+
 
 def get_tags():
     tag1 = Tags('tag1', 'value1')
@@ -0,0 +1,112 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+import pytest
+from tortuga.addhost.addHostServerLocal import AddHostServerLocal
+from tortuga.addhost.ipAllocator import ip_allocators
+from tortuga.db.hardwareProfileNetworks import HardwareProfileNetworks
+from tortuga.db.hardwareProfiles import HardwareProfiles
+from tortuga.db.networkDevices import NetworkDevices
+from tortuga.db.networks import Networks
+from tortuga.db.nodes import Nodes
+from tortuga.exceptions.invalidArgument import InvalidArgument
+
+
+@pytest.mark.usefixtures('dbm_class')
+class TestAddHostServerLocal(unittest.TestCase):
+    def setUp(self):
+        super(TestAddHostServerLocal, self).setUp()
+
+        self.session = self.dbm.openSession()
+
+        self.session.add_all([
+            Nodes('compute-01.example.com'),
+            Nodes('compute-03.example.com'),
+        ])
+
+    def tearDown(self):
+        self.dbm.closeSession()
+        self.session = None
+
+        super(TestAddHostServerLocal, self).tearDown()
+
+    def test_generate_node_names(self):
+        names = AddHostServerLocal().generate_node_names(
+            self.session, 'compute-#NN', 3, dns_zone='example.com')
+
+        try:
+            assert names == [
+                'compute-02.example.com',
+                'compute-04.example.com',
+                'compute-05.example.com',
+            ]
+
+            # Names reserved in the add host session are not reused
+            assert AddHostServerLocal().generate_node_name(
+                self.session, 'compute-#NN') == 'compute-06'
+        finally:
+            AddHostServerLocal.clear_session_node_names(
+                names + ['compute-06'])
+
+    def test_generate_node_names_exhausted(self):
+        with pytest.raises(InvalidArgument):
+            AddHostServerLocal().generate_node_names(
+                self.session, 'compute-#N', 10)
+
+        with pytest.raises(InvalidArgument):
+            AddHostServerLocal().generate_node_names(
+                self.session, 'compute-01', 1)
+
+
+def test_allocate_nic_ip_addresses():
+    network = Networks('10.2.0.0', '255.255.255.0')
+    network.type = 'provision'
+    network.usingDhcp = False
+
+    public_network = Networks('10.3.0.0', '255.255.255.0')
+    public_network.type = 'public'
+
+    hwprofile = HardwareProfiles('compute')
+
+    for name, dbNetwork in (('eth0', network), ('eth1', public_network)):
+        hwprofilenetwork = HardwareProfileNetworks()
+        hwprofilenetwork.network = dbNetwork
+        hwprofilenetwork.networkdevice = NetworkDevices(name)
+
+        hwprofile.hardwareprofilenetworks.append(hwprofilenetwork)
+
+    nic_defs_list = [[], [{'ip': '10.2.0.9'}], [None, {'ip': '10.3.0.2'}]]
+
+    try:
+        allocations = AddHostServerLocal().allocate_nic_ip_addresses(
+            hwprofile, nic_defs_list)
+
+        assert allocations == [(network, ['10.2.0.1', '10.2.0.2'])]
+
+        assert nic_defs_list == [
+            [{'ip': '10.2.0.1'}],
+            [{'ip': '10.2.0.9'}],
+            [{'ip': '10.2.0.2'}, {'ip': '10.3.0.2'}],
+        ]
+
+        AddHostServerLocal.release_provisioning_ip_addresses(allocations)
+
+        assert AddHostServerLocal().generate_provisioning_ip_address(
+            network) == '10.2.0.1'
+    finally:
+        AddHostServerLocal.release_provisioning_ip_addresses(
+            [(network, ['10.2.0.1'])])
+
+        ip_allocators.clear()
@@ -0,0 +1,92 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import time
+import pytest
+from tortuga.addhost.sessionStore import AddHostSessionStore
+
+
+def test_session(tmpdir):
+    store = AddHostSessionStore(str(tmpdir))
+
+    session_id = store.create()
+
+    # Sessions are visible to other processes using the same directory
+    other = AddHostSessionStore(str(tmpdir))
+
+    assert other.exists(session_id)
+    assert not other.is_running(session_id)
+
+    store.set_running(session_id, True)
+
+    assert store.append_message(session_id, 'first')
+    assert store.append_message(session_id, 'multi\nline')
+
+    assert other.is_running(session_id)
+    assert other.get_messages(session_id) == ['first', 'multi\nline']
+    assert other.get_messages(session_id, 1) == ['multi\nline']
+
+    assert not other.is_completed(session_id)
+
+    store.set_running(session_id, False)
+
+    assert not other.is_running(session_id)
+    assert other.is_completed(session_id)
+
+    other.delete([session_id])
+
+    assert not store.exists(session_id)
+    assert not store.append_message(session_id, 'dropped')
+
+    with pytest.raises(KeyError):
+        store.get_messages(session_id)
+
+
+def test_invalid_session_id(tmpdir):
+    store = AddHostSessionStore(str(tmpdir))
+
+    assert not store.exists('../../etc/passwd')
+    assert not store.append_message('../../etc/passwd', 'message')
+
+    with pytest.raises(KeyError):
+        store.get_messages('../../etc/passwd')
+
+    with pytest.raises(KeyError):
+        store.set_running('unknown', True)
+
+
+def test_evict(tmpdir):
+    store = AddHostSessionStore(str(tmpdir))
+
+    completed_id = store.create()
+    store.set_running(completed_id, True)
+    store.set_running(completed_id, False)
+
+    running_id = store.create()
+    store.set_running(running_id, True)
+
+    # Recently completed sessions are kept
+    assert store.evict(60) == []
+
+    completed = time.time() - 120
+
+    os.utime(str(tmpdir.join('%s.completed' % (completed_id))),
+             (completed, completed))
+
+    assert store.evict(60) == [completed_id]
+
+    assert not store.exists(completed_id)
+    assert store.exists(running_id)
+    assert not tmpdir.join('%s.completed' % (completed_id)).exists()
@@ -0,0 +1,107 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pytest
+from tortuga.exceptions.configurationError import ConfigurationError
+from tortuga.web_service.authToken import AuthToken, _load_secret
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_issue_verify():
+    clock = FakeClock()
+
+    auth_token = AuthToken(b'secret', ttl=60, clock=clock)
+
+    token, expires = auth_token.issue('admin', 1)
+
+    assert expires == 1000060
+
+    assert auth_token.verify(token) == {
+        'username': 'admin', 'admin_id': 1, 'credential': None}
+
+    clock.now = expires
+
+    assert auth_token.verify(token) is None
+
+
+def test_check_credential():
+    auth_token = AuthToken(b'secret')
+
+    token, _ = auth_token.issue('admin', 1, '$1$crypted')
+
+    claims = auth_token.verify(token)
+
+    assert '$1$crypted' not in claims['credential']
+
+    assert auth_token.check_credential(claims, '$1$crypted')
+
+    # Password changed since the token was issued
+    assert not auth_token.check_credential(claims, '$1$changed')
+
+    # Token issued without credential
+    token, _ = auth_token.issue('admin', 1)
+
+    assert not auth_token.check_credential(
+        auth_token.verify(token), '$1$crypted')
+
+
+def test_verify_invalid():
+    token, _ = AuthToken(b'secret').issue('admin')
+
+    # Token signed with different key
+    assert AuthToken(b'other').verify(token) is None
+
+    payload, signature = token.split('.')
+
+    assert AuthToken(b'secret').verify(payload) is None
+    assert AuthToken(b'secret').verify('x' + token) is None
+    assert AuthToken(b'secret').verify(payload + '.' + signature[:-2]) \
+        is None
+    assert AuthToken(b'secret').verify('') is None
+
+
+def test_load_secret(tmpdir):
+    path = os.path.join(str(tmpdir), 'tortugawsd.secret')
+
+    secret = _load_secret(path)
+
+    assert len(secret) == 64
+
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+    # Existing key is reused
+    assert _load_secret(path) == secret
+
+    # Temporary file used to create the key is removed
+    assert os.listdir(str(tmpdir)) == ['tortugawsd.secret']
+
+
+def test_load_secret_invalid(tmpdir):
+    path = os.path.join(str(tmpdir), 'tortugawsd.secret')
+
+    # Empty or short keys are never used
+    for secret in ('', 'abcd'):
+        with open(path, 'w') as fp:
+            fp.write(secret)
+
+        with pytest.raises(ConfigurationError):
+            _load_secret(path)
@@ -0,0 +1,149 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import pytest
+from tortuga.db.changeEvents import register_event_publisher
+from tortuga.db.hardwareProfiles import HardwareProfiles
+from tortuga.exceptions.serviceBusy import ServiceBusy
+from tortuga.web_service.eventBroker import EventBroker, EventBuffer, \
+    EventSequencer
+
+
+@pytest.fixture
+def events():
+    published = []
+
+    register_event_publisher(
+        lambda topic, event: published.append((topic, event)))
+
+    yield published
+
+    register_event_publisher(None)
+
+
+def test_change_events(dbm, events):
+    with dbm.session() as session:
+        hwprofile = HardwareProfiles('events1')
+
+        session.add(hwprofile)
+        session.flush()
+
+        # Added and modified in the same transaction
+        hwprofile.description = 'description'
+
+        session.commit()
+
+        assert [(topic, event['type'], event['object']['name'])
+                for topic, event in events] == \
+            [('hardwareprofile', 'ADDED', 'events1')]
+
+        del events[:]
+
+        hwprofile.name = 'events2'
+
+        session.commit()
+
+        assert [(topic, event['type'], event['object']['name'])
+                for topic, event in events] == \
+            [('hardwareprofile', 'MODIFIED', 'events2')]
+
+        del events[:]
+
+        # Rolled back changes are not published
+        hwprofile.name = 'events3'
+
+        session.flush()
+
+        session.rollback()
+
+        session.commit()
+
+        assert not events
+
+        session.delete(hwprofile)
+
+        session.commit()
+
+        assert [(topic, event['type']) for topic, event in events] == \
+            [('hardwareprofile', 'DELETED')]
+
+
+def new_event(sequencer, n):
+    _, data = sequencer.stamp(
+        b'node', json.dumps({'type': 'MODIFIED', 'object': {'id': n}}).encode())
+
+    return json.loads(data.decode())
+
+
+def test_event_buffer():
+    sequencer = EventSequencer()
+
+    buffer = EventBuffer(size=3)
+
+    assert buffer.wait(None, 0) == ([], False)
+
+    for n in range(1, 3):
+        buffer.append(new_event(sequencer, n))
+
+    events, reset = buffer.wait(None, 0)
+
+    assert [event['object']['id'] for event in events] == [1, 2]
+    assert not reset
+
+    events, reset = buffer.wait(events[0]['id'], 0)
+
+    assert [event['seq'] for event in events] == [2]
+    assert not reset
+
+    assert buffer.wait(buffer.get_last_id(), 0) == ([], False)
+
+    for n in range(3, 6):
+        buffer.append(new_event(sequencer, n))
+
+    # Event 2 is no longer buffered
+    events, reset = buffer.wait('%s-1' % (sequencer.epoch), 0)
+
+    assert reset
+
+    # Workqueue restarted
+    events, reset = buffer.wait('%s-5' % ('0' * 12), 0)
+
+    assert reset
+
+
+def test_event_buffer_invalid_id():
+    with pytest.raises(ValueError):
+        EventBuffer().wait('invalid', 0)
+
+
+def test_event_stream_limit():
+    broker = EventBroker()
+    broker.max_streams = 2
+
+    streams = [broker.open_stream() for _ in range(2)]
+
+    with pytest.raises(ServiceBusy):
+        broker.open_stream()
+
+    # Stream closed by both the request hook and the generator
+    with streams[0]:
+        pass
+
+    streams[0].close()
+
+    streams.append(broker.open_stream())
+
+    with pytest.raises(ServiceBusy):
+        broker.open_stream()
@@ -0,0 +1,102 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from tortuga.addhost.ipAllocator import IpAllocator, allocate_ip_addresses, \
+    ip_allocators, release_ip_addresses
+from tortuga.db.networks import Networks
+from tortuga.db.nics import Nics
+from tortuga.db.nodes import Nodes
+from tortuga.exceptions.invalidArgument import InvalidArgument
+
+
+def test_allocate():
+    allocator = IpAllocator('10.0.0.0', '255.255.255.0')
+
+    allocator.mark_used(['10.0.0.1', '10.0.0.3', '192.168.0.1'])
+
+    assert allocator.allocate(3) == ['10.0.0.2', '10.0.0.4', '10.0.0.5']
+
+    allocator.release(['10.0.0.3'])
+
+    assert not allocator.is_used('10.0.0.3')
+
+    assert allocator.allocate() == ['10.0.0.3']
+
+    assert allocator.allocate() == ['10.0.0.6']
+
+
+def test_allocate_start_ip_increment():
+    allocator = IpAllocator('10.0.0.0', '255.255.255.0',
+                            start_ip='10.0.0.100', increment=2)
+
+    allocator.mark_used(['10.0.0.102'])
+
+    assert allocator.allocate(2) == ['10.0.0.100', '10.0.0.104']
+
+
+def test_allocate_exhausted():
+    allocator = IpAllocator('10.0.0.0', '255.255.255.248')
+
+    # Broadcast address (10.0.0.7) is never allocated
+    assert len(allocator.allocate(6)) == 6
+
+    with pytest.raises(InvalidArgument):
+        allocator.allocate()
+
+    allocator.release(['10.0.0.5'])
+
+    assert allocator.allocate() == ['10.0.0.5']
+
+
+def test_allocate_large_network():
+    allocator = IpAllocator('10.0.0.0', '255.255.0.0')
+
+    allocator.mark_used(
+        ['10.0.%d.%d' % (index // 256, index % 256)
+         for index in range(1, 40000)])
+
+    assert allocator.allocate(2) == ['10.0.156.64', '10.0.156.65']
+
+
+@pytest.mark.usefixtures('dbm')
+def test_allocate_ip_addresses(dbm):
+    session = dbm.openSession()
+
+    try:
+        network = Networks('10.1.0.0', '255.255.255.0')
+        network.type = 'provision'
+
+        node = Nodes('compute-01')
+        node.nics = [Nics(ip='10.1.0.1')]
+        node.nics[0].network = network
+
+        session.add_all([network, node])
+        session.flush()
+
+        assert allocate_ip_addresses(network, 2) == ['10.1.0.2', '10.1.0.3']
+
+        # Address assigned outside of the allocator is skipped
+        node.nics.append(Nics(ip='10.1.0.4'))
+        session.flush()
+
+        assert allocate_ip_addresses(network) == ['10.1.0.5']
+
+        release_ip_addresses(network.id, ['10.1.0.2'])
+
+        assert allocate_ip_addresses(network) == ['10.1.0.2']
+    finally:
+        ip_allocators.clear()
+
+        dbm.closeSession()
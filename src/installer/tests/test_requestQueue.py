@@ -0,0 +1,255 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import pytest
+from tortuga.db.nodeRequests import NodeRequests
+from tortuga.db.nodes import Nodes
+from tortuga.web_service.requestQueue import RequestQueue
+from tortuga.web_service.threadManager import ThreadManager
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = datetime.datetime(2018, 1, 1)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += datetime.timedelta(seconds=seconds)
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def node_requests(dbm):
+    yield
+
+    with dbm.session() as session:
+        session.query(NodeRequests).delete()
+
+        session.commit()
+
+
+def new_queue(dbm, clock, max_workers=8):
+    thrdmgr = ThreadManager()
+    thrdmgr.configure(min_workers=1, max_workers=max_workers)
+
+    return RequestQueue(thrdmgr=thrdmgr, dbm=dbm, clock=clock)
+
+
+def new_request(session, name, priority=0, action='ADD'):
+    request = NodeRequests('{}')
+    request.action = action
+    request.addHostSession = name
+    request.priority = priority
+
+    session.add(request)
+    session.commit()
+
+    return request.id
+
+
+def get_queued(queue, action='ADD'):
+    # Requests queued in the (not started) thread manager
+    thrdmgr = queue._thrdmgr  # pylint: disable=protected-access
+
+    return [request for _, _, request in
+            thrdmgr._pending.get(action, [])]  # pylint: disable=protected-access
+
+
+@pytest.mark.usefixtures('node_requests')
+def test_submit(dbm, clock):
+    queue = new_queue(dbm, clock)
+
+    with dbm.session() as session:
+        request = NodeRequests('{}')
+        request.action = 'ADD'
+        request.addHostSession = 'submitted'
+
+        queue.submit(session, request)
+
+        assert request.state == 'processing'
+        assert request.lease_owner == queue.owner
+
+        queued = get_queued(queue)
+
+        assert queued == [{
+            'action': 'ADD',
+            'node_request_id': request.id,
+            'data': {'addHostSession': 'submitted'},
+        }]
+
+        request_id = request.id
+
+        queue.complete(queued[0])
+
+        # Request was deleted using a separate session
+        session.expire_all()
+
+        assert session.query(NodeRequests).get(request_id) is None
+
+
+@pytest.mark.usefixtures('node_requests')
+def test_expired_lease(dbm, clock):
+    queue1 = new_queue(dbm, clock)
+    queue2 = new_queue(dbm, clock)
+
+    with dbm.session() as session:
+        request = NodeRequests('{}')
+        request.action = 'ADD'
+        request.addHostSession = 'abandoned'
+
+        queue1.submit(session, request)
+
+        # Lease is held by the first process
+        assert queue2.poll() == 0
+
+        clock.advance(queue1.lease_duration / 2)
+
+        queue1.renew_leases(force=True)
+
+        clock.advance(queue1.lease_duration / 2 + 1)
+
+        assert queue2.poll() == 0
+
+        # First process stopped renewing its lease
+        clock.advance(queue1.lease_duration)
+
+        assert queue2.poll() == 1
+
+        assert get_queued(queue2)[0]['node_request_id'] == request.id
+
+        session.expire_all()
+
+        assert request.lease_owner == queue2.owner
+        assert request.attempts == 2
+
+        # Completion by the first process is ignored
+        queue1.complete(get_queued(queue1)[0])
+
+        session.expire_all()
+
+        assert request.state == 'processing'
+
+
+@pytest.mark.usefixtures('node_requests')
+def test_retry_backoff(dbm, clock):
+    queue = new_queue(dbm, clock)
+
+    with dbm.session() as session:
+        node_request_id = new_request(session, 'failing', action='DELETE')
+
+        for attempt in range(1, queue.max_attempts + 1):
+            assert queue.poll() == 1
+
+            request = get_queued(queue, action='DELETE')[-1]
+
+            queue.complete(request, failed=True)
+
+            request = session.query(NodeRequests).get(node_request_id)
+
+            session.refresh(request)
+
+            assert request.attempts == attempt
+
+            if attempt == queue.max_attempts:
+                break
+
+            assert request.state == 'pending'
+
+            delay = queue.BACKOFF_BASE * 2 ** (attempt - 1)
+
+            assert request.next_attempt == \
+                clock.now + datetime.timedelta(seconds=delay)
+
+            # Not retried before the backoff delay has passed
+            assert queue.poll() == 0
+
+            clock.advance(delay)
+
+        assert request.state == 'error'
+        assert queue.poll() == 0
+
+
+@pytest.mark.usefixtures('node_requests')
+def test_add_host_not_retried(dbm, clock):
+    queue = new_queue(dbm, clock)
+
+    with dbm.session() as session:
+        node_request_id = new_request(session, 'failing')
+
+        assert queue.poll() == 1
+
+        queue.complete(get_queued(queue)[-1], failed=True)
+
+        request = session.query(NodeRequests).get(node_request_id)
+
+        session.refresh(request)
+
+        assert request.state == 'error'
+        assert request.attempts == 1
+
+
+@pytest.mark.usefixtures('node_requests')
+def test_add_host_interrupted(dbm, clock):
+    queue1 = new_queue(dbm, clock)
+    queue2 = new_queue(dbm, clock)
+
+    with dbm.session() as session:
+        node_request_id = new_request(session, 'interrupted')
+
+        assert queue1.poll() == 1
+
+        # Node added before the first process crashed
+        node = Nodes('interrupted-01')
+        node.addHostSession = 'interrupted'
+
+        session.add(node)
+        session.commit()
+
+        clock.advance(queue1.lease_duration + 1)
+
+        try:
+            assert queue2.poll() == 0
+
+            request = session.query(NodeRequests).get(node_request_id)
+
+            session.refresh(request)
+
+            assert request.state == 'error'
+            assert request.attempts == 2
+        finally:
+            session.delete(node)
+            session.commit()
+
+
+@pytest.mark.usefixtures('node_requests')
+def test_priority(dbm, clock):
+    queue = new_queue(dbm, clock, max_workers=1)
+
+    with dbm.session() as session:
+        new_request(session, 'low')
+        new_request(session, 'high', priority=5)
+
+    assert queue.poll() == 1
+
+    assert get_queued(queue)[0]['data']['addHostSession'] == 'high'
+
+    # No idle worker threads
+    assert queue.poll() == 0
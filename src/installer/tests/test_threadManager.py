@@ -0,0 +1,131 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+import pytest
+from tortuga.exceptions.serviceBusy import ServiceBusy
+from tortuga.web_service.threadManager import ThreadManager
+from tortuga.web_service.worker.action import WorkerAction
+from tortuga.web_service.worker.thread import worker_thread
+
+
+class BlockingAction(WorkerAction):
+    """Records processed requests; blocks until released"""
+
+    def __init__(self):
+        self.processed = []
+        self.active = 0
+        self.max_active = 0
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+
+    def process_request(self, request):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+        self.release.wait(5)
+
+        with self.lock:
+            self.active -= 1
+            self.processed.append(request['data'])
+
+
+class AddAction(BlockingAction):
+    name = 'ADD'
+
+
+class DeleteAction(BlockingAction):
+    name = 'DELETE'
+
+    max_concurrency = 2
+
+
+def wait_for(condition, timeout=5):
+    end = time.monotonic() + timeout
+
+    while not condition():
+        assert time.monotonic() < end
+
+        time.sleep(0.01)
+
+
+def test_queue_full():
+    thrdmgr = ThreadManager()
+    thrdmgr.configure(max_queue_size=2)
+
+    thrdmgr.enqueue({'action': 'ADD', 'data': 1})
+
+    with thrdmgr.reserve_slot():
+        # Reserved slot counts towards the queue size
+        with pytest.raises(ServiceBusy):
+            thrdmgr.enqueue({'action': 'ADD', 'data': 2})
+
+    # Unused reservation is released
+    thrdmgr.enqueue({'action': 'ADD', 'data': 3})
+
+    metrics = thrdmgr.getMetrics()
+
+    assert metrics['queue_depth'] == 2
+    assert metrics['rejected'] == 1
+
+
+def test_action_limits():
+    thrdmgr = ThreadManager()
+    thrdmgr.configure(min_workers=1, max_workers=4)
+
+    thrdmgr.start({'ADD': AddAction, 'DELETE': DeleteAction}, worker_thread)
+
+    add_action = thrdmgr._actions['ADD']  # pylint: disable=protected-access
+    delete_action = \
+        thrdmgr._actions['DELETE']  # pylint: disable=protected-access
+
+    for index in range(6):
+        thrdmgr.enqueue({'action': 'DELETE', 'data': index})
+
+    thrdmgr.enqueue({'action': 'ADD', 'data': 'add'})
+
+    # ADD request is not held up behind queued DELETE requests
+    wait_for(lambda: add_action.active == 1)
+
+    assert delete_action.active == 2
+
+    assert thrdmgr.getMetrics()['workers'] == 4
+
+    add_action.release.set()
+    delete_action.release.set()
+
+    wait_for(lambda: len(delete_action.processed) == 6)
+
+    assert delete_action.max_active == 2
+
+    metrics = thrdmgr.getMetrics()
+
+    assert metrics['queue_depth'] == 0
+    assert metrics['actions']['DELETE']['processed'] == 6
+    assert metrics['actions']['DELETE']['limit'] == 2
+    assert metrics['actions']['ADD']['limit'] == 4
+
+
+def test_unknown_action():
+    thrdmgr = ThreadManager()
+    thrdmgr.configure(min_workers=1, max_workers=1)
+
+    thrdmgr.start({}, worker_thread)
+
+    thrdmgr.enqueue({'action': 'UNKNOWN', 'data': None})
+
+    wait_for(
+        lambda: thrdmgr.getMetrics()['actions']['UNKNOWN']['processed'] == 1)
@@ -145,6 +145,8 @@ class ComponentInstaller(ComponentInstallerBase):
     ]
     installer_only = True
 
+    parallel_safe = True
+
     def __init__(self, kit):
         """
         Initialise parent class.
@@ -154,7 +156,6 @@ class ComponentInstaller(ComponentInstallerBase):
         self._provider = DhcpdDhcpProvider(self)
         self._manager = self._get_os_dhcpd_manager('dhcpd')
         self._config = ConfigManager()
-        self._installer_node = nodeApiFactory.getNodeApi().getMyNode()
 
     def _get_os_dhcpd_manager(self, name):
         """
@@ -228,32 +229,32 @@ class ComponentInstaller(ComponentInstallerBase):
             if nic.boot and nic.mac:
                 yield nic
 
-    def _get_installer_ip(self, network_id):
+    def _get_installer_ip(self, installer_node, network_id):
         """
         Return IP address of provisioning interface on installer
 
         :raises NicNotFound:
 
         """
-        prov_nics = self._get_provisioning_nics(self._installer_node)
+        prov_nics = self._get_provisioning_nics(installer_node)
         for prov_nic in prov_nics:
             if prov_nic.getNetwork().getId() == network_id:
                 return ipaddress.IPv4Address(prov_nic.getIp())
         raise NicNotFound(
             'Network has no corresponding provisioning NIC on installer')
 
-    @property
-    def _dhcp_subnets(self):
+    def _get_dhcp_subnets(self, installer_node):
         """
         DHCP subnet dictionary.
 
+        :param installer_node: Node object
         :returns: Dictionary IPv4Network network address IPv4Network subnet
         """
         subnets = {}
 
         for network in self._get_provisioning_networks():
             subnet = {'nodes': []}
-            installer_ip = self._get_installer_ip(network.id)
+            installer_ip = self._get_installer_ip(installer_node, network.id)
             subnet['installerIp'] = installer_ip
 
             if not network.gateway:
@@ -338,13 +339,16 @@ class ComponentInstaller(ComponentInstallerBase):
         :param **kwargs: Unused
         :returns: None
         """
+        # Loaded for every configuration since the component installer
+        # is cached across actions; installer NICs and networks change
+        installer_node = nodeApiFactory.getNodeApi().getMyNode()
 
         self._manager.configure(
             self.kit_installer.get_db_parameter_value('DHCPLeaseTime', 2400),
             self.kit_installer.get_db_parameter_value('DNSZone'),
-            self._get_provisioning_nics_ip(self._installer_node),
-            self._dhcp_subnets,
-            installerNode=self._installer_node,
+            self._get_provisioning_nics_ip(installer_node),
+            self._get_dhcp_subnets(installer_node),
+            installerNode=installer_node,
             bUpdateSysconfig=kwargs.get('bUpdateSysconfig', True),
             kit_settings=self._get_kit_settings_dictionary
         )
@@ -360,6 +364,15 @@ class ComponentInstaller(ComponentInstallerBase):
         self._provider.write()
         self.action_configure(None, args, kwargs, bUpdateSysconfig=True)
 
+    def regenerate(self):
+        """
+        Regenerate the DHCP configuration after hosts are added or
+        deleted.
+
+        :returns: None
+        """
+        self.action_configure(None, bUpdateSysconfig=False)
+
     def action_add_host(self, hardware_profile_name, software_profile_name,
                         nodes, *args, **kwargs):
         """
@@ -367,13 +380,7 @@ class ComponentInstaller(ComponentInstallerBase):
 
         :returns: None
         """
-        self.action_configure(
-            software_profile_name,
-            None,
-            args,
-            kwargs,
-            bUpdateSysconfig=False
-        )
+        self.mark_dirty()
 
     def action_delete_host(self, hardware_profile_name, software_profile_name,
                            nodes, *args, **kwargs):
@@ -382,10 +389,4 @@ class ComponentInstaller(ComponentInstallerBase):
 
         :returns: None
         """
-        self.action_configure(
-            software_profile_name,
-            None,
-            args,
-            kwargs,
-            bUpdateSysconfig=False
-        )
+        self.mark_dirty()
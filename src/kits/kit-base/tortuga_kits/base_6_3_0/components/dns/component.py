@@ -12,7 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from contextlib import contextmanager
+import fcntl
 from logging import getLogger
+import os
+import tempfile
+import threading
+import zlib
 
 from jinja2 import Template
 
@@ -21,6 +27,7 @@ from tortuga.db.nodesDbHandler import NodesDbHandler
 from tortuga.db.hardwareProfiles import HardwareProfiles
 from tortuga.os_utility.osUtility import getOsObjectFactory
 from tortuga.db.globalParameterDbApi import GlobalParameterDbApi
+from tortuga.exceptions.tortugaException import TortugaException
 from tortuga.kit.installer import ComponentInstallerBase
 from tortuga.exceptions.parameterNotFound import ParameterNotFound
 
@@ -28,14 +35,28 @@ from tortuga.exceptions.parameterNotFound import ParameterNotFound
 logger = getLogger(__name__)
 
 
+DNSMASQ_CONFIG_FILE = '/etc/dnsmasq.d/tortuga-dns.conf'
+
+# Host records are written to hosts files, which dnsmasq rereads on
+# SIGHUP, rather than to the config file, which requires a restart.
+# Records are spread over several files, so adding or removing a host
+# only rewrites a small file.
+DNSMASQ_HOSTS_DIR = '/etc/tortuga-dns'
+
+DNSMASQ_HOSTS_FILES = 16
+
+# Serializes updates of the hosts files by concurrent processes (ie.
+# pre-add-host and web service workers)
+DNSMASQ_HOSTS_LOCK_FILE = os.path.join(DNSMASQ_HOSTS_DIR, '.lock')
+
 DNSMASQ_CONFIG_TEMPLATE = """
 # Tortuga DNS Config
 
 domain={{ domain }}
 local=/{{ domain }}/
 
-{% for host_record in host_records %}
-host-record={{ host_record.hostname }},{{ host_record.ip }}
+{% for hosts_file in hosts_files %}
+addn-hosts={{ hosts_file }}
 {% endfor %}
 """
 
@@ -52,6 +73,14 @@ class DnsProvider(object):
         self.private_dns_zone = private_dns_zone
         self.host_records = []
 
+    def clear(self):
+        """
+        Remove all records.
+
+        :returns: None
+        """
+        self.host_records = []
+
     def add_record(self, name, ip, record_type='A'):
         """
         Overwrite in inheriting class.
@@ -71,6 +100,15 @@ class DnsProvider(object):
         """
         raise NotImplementedError
 
+    def update_records(self, added, removed):
+        """
+        Overwrite in inheriting class.
+        Update the records of individual hosts.
+
+        :returns: None
+        """
+        raise NotImplementedError
+
 
 class DnsmasqDnsProvider(DnsProvider):
     """
@@ -132,6 +170,22 @@ class DnsmasqDnsProvider(DnsProvider):
         """
         self._service_handle.restart(self._service_name)
 
+    def reload_service(self):
+        """
+        Make the DNSMASQ service reread the hosts files, restarting the
+        service if it cannot be signalled.
+
+        :returns: None
+        """
+        try:
+            self._service_handle.sendSignal(self._service_name, 'HUP')
+        except TortugaException:
+            logger.warning(
+                'Unable to signal [{}], restarting service'.format(
+                    self._service_name))
+
+            self.restart_service()
+
     def add_record(self, name, ip, record_type='A'):
         """
         Write individual records into the
@@ -151,23 +205,186 @@ class DnsmasqDnsProvider(DnsProvider):
                 'Record type {} is not implemented'.format(record_type)
             )
 
+    @staticmethod
+    def _get_hosts_file(index):
+        """
+        :param index: Integer hosts file index
+        :returns: String path
+        """
+        return os.path.join(DNSMASQ_HOSTS_DIR, 'hosts-{:02d}'.format(index))
+
+    @staticmethod
+    def _get_hosts_file_index(name):
+        """
+        Get index of hosts file containing the records of a host.
+
+        :param name: String hostname
+        :returns: Integer
+        """
+        return zlib.crc32(name.lower().encode()) % DNSMASQ_HOSTS_FILES
+
+    @staticmethod
+    @contextmanager
+    def _lock_hosts_files():
+        """
+        Hold an exclusive lock on the hosts files.
+
+        :returns: None
+        """
+        os.makedirs(DNSMASQ_HOSTS_DIR, exist_ok=True)
+
+        with open(DNSMASQ_HOSTS_LOCK_FILE, 'a') as fp:
+            fcntl.flock(fp, fcntl.LOCK_EX)
+
+            try:
+                yield
+            finally:
+                fcntl.flock(fp, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _read_hosts_file(path):
+        """
+        :param path: String path
+        :returns: List of records
+        """
+        records = []
+
+        try:
+            with open(path) as fp:
+                for line in fp:
+                    fields = line.split('#', 1)[0].split()
+
+                    if len(fields) < 2:
+                        continue
+
+                    records.append({
+                        'hostname': fields[1],
+                        'ip': fields[0],
+                    })
+        except FileNotFoundError:
+            pass
+
+        return records
+
+    @staticmethod
+    def _write_hosts_file(path, records):
+        """
+        Atomically replace hosts file.
+
+        :param path: String path
+        :param records: List of records
+        :returns: None
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+
+        try:
+            with os.fdopen(fd, 'w') as fp:
+                fp.write('# Tortuga DNS hosts (generated, do not edit)\n')
+
+                for record in records:
+                    fp.write('{} {}\n'.format(
+                        record['ip'], record['hostname']))
+
+            # dnsmasq rereads hosts files after dropping privileges
+            os.chmod(tmp_path, 0o644)
+
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+
+            raise
+
+    def has_hosts_files(self):
+        """
+        Check whether the config file references the hosts files and
+        the current zone, so records can be updated using
+        update_records().
+
+        :returns: Boolean
+        """
+        try:
+            with open(DNSMASQ_CONFIG_FILE) as fp:
+                config = fp.read()
+        except FileNotFoundError:
+            return False
+
+        if 'domain={}\n'.format(self.private_dns_zone) not in config:
+            return False
+
+        return all(
+            'addn-hosts={}'.format(self._get_hosts_file(index)) in config
+            for index in range(DNSMASQ_HOSTS_FILES)
+        )
+
     def write(self):
         """
-        Write the complete config file out.
+        Write the complete config file and hosts files out.
 
         :returns: None
         """
+        hosts_files = [[] for _ in range(DNSMASQ_HOSTS_FILES)]
+
+        for host_record in self.host_records:
+            hosts_files[self._get_hosts_file_index(
+                host_record['hostname'])].append(host_record)
+
+        with self._lock_hosts_files():
+            for index, records in enumerate(hosts_files):
+                self._write_hosts_file(self._get_hosts_file(index), records)
+
         template = Template(DNSMASQ_CONFIG_TEMPLATE)
 
         context = {
             'domain': self.private_dns_zone,
-            'host_records': self.host_records
+            'hosts_files': [
+                self._get_hosts_file(index)
+                for index in range(DNSMASQ_HOSTS_FILES)
+            ],
         }
 
         rendered = template.render(context)
-        with open('/etc/dnsmasq.d/tortuga-dns.conf', 'w') as fp:
+        with open(DNSMASQ_CONFIG_FILE, 'w') as fp:
             fp.write(rendered)
 
+    def update_records(self, added, removed):
+        """
+        Update the records of individual hosts in the hosts files written
+        by write(). Only hosts files containing changed records are
+        rewritten.
+
+        :param added: Dictionary hostname to ip address; existing records
+                      of these hosts are replaced
+        :param removed: Iterable hostnames
+        :returns: None
+        """
+        # Changed records, keyed on hosts file index and hostname
+        changes = {}
+
+        for name in removed:
+            changes.setdefault(
+                self._get_hosts_file_index(name), {})[name.lower()] = None
+
+        for name, ip in added.items():
+            changes.setdefault(
+                self._get_hosts_file_index(name), {})[name.lower()] = {
+                    'hostname': name,
+                    'ip': ip,
+                }
+
+        with self._lock_hosts_files():
+            for index, changed_records in changes.items():
+                path = self._get_hosts_file(index)
+
+                records = [
+                    record for record in self._read_hosts_file(path)
+                    if record['hostname'].lower() not in changed_records
+                ]
+
+                records.extend(
+                    record for record in changed_records.values() if record)
+
+                self._write_hosts_file(path, records)
+
 
 class ComponentInstaller(ComponentInstallerBase):
     """
@@ -181,6 +398,8 @@ class ComponentInstaller(ComponentInstallerBase):
         {'family': 'rhel', 'version': '7', 'arch': 'x86_64'},
     ]
 
+    parallel_safe = True
+
     def __init__(self, kit):
         """
         Initialise parent class.
@@ -188,6 +407,11 @@ class ComponentInstaller(ComponentInstallerBase):
         super().__init__(kit)
         self.provider = DnsmasqDnsProvider(self._private_dns_zone)
 
+        # Records of hosts added and deleted since last regeneration
+        self._added_records = {}
+        self._removed_records = set()
+        self._records_lock = threading.Lock()
+
     @staticmethod
     def _get_global_parameter(key, default=None):
         """
@@ -305,6 +529,11 @@ class ComponentInstaller(ComponentInstallerBase):
         :param **kwargs: Unused
         :returns: None
         """
+        self.provider.clear()
+
+        # The component installer is cached across actions
+        self.provider.private_dns_zone = self._private_dns_zone
+
         with DbManager().session() as session:
             installer_node = NodesDbHandler().getNode(
                 session,
@@ -316,6 +545,71 @@ class ComponentInstaller(ComponentInstallerBase):
 
             self._node_nics(session)
 
+    def regenerate(self):
+        """
+        Apply records of hosts added or deleted and reload the service.
+
+        :returns: None
+        """
+        with self._records_lock:
+            added = self._added_records
+            removed = self._removed_records
+
+            self._added_records = {}
+            self._removed_records = set()
+
+        try:
+            self._apply_records(added, removed)
+        except Exception:
+            self._restore_records(added, removed)
+
+            raise
+
+    def _apply_records(self, added, removed):
+        """
+        :param added: Dictionary hostname to ip address
+        :param removed: Set hostnames
+        :returns: None
+        """
+        self.provider.private_dns_zone = self._private_dns_zone
+
+        if self.provider.has_hosts_files():
+            self.provider.update_records(added, removed)
+            self.provider.reload_service()
+
+            return
+
+        # Config file not written yet or zone changed; write all records
+        self.action_configure(None)
+
+        for hostname, ip in added.items():
+            self.provider.add_record(hostname, ip)
+
+        self.provider.write()
+        self.provider.restart_service()
+
+    def _restore_records(self, added, removed):
+        """
+        Return records that failed to be applied to the pending records
+        and request regeneration, so they are retried. Records of hosts
+        added or deleted since take precedence.
+
+        :param added: Dictionary hostname to ip address
+        :param removed: Set hostnames
+        :returns: None
+        """
+        with self._records_lock:
+            for hostname, ip in added.items():
+                if hostname not in self._added_records and \
+                        hostname not in self._removed_records:
+                    self._added_records[hostname] = ip
+
+            for hostname in removed:
+                if hostname not in self._added_records:
+                    self._removed_records.add(hostname)
+
+        self.mark_dirty()
+
     def action_pre_add_host(self, hardware_profile, software_profile,
                             hostname, ip, *args, **kwargs):
         """
@@ -328,10 +622,14 @@ class ComponentInstaller(ComponentInstallerBase):
 
         :returns: None
         """
-        self.action_configure(None)
-        self.provider.add_record(hostname, ip)
-        self.provider.write()
-        self.provider.restart_service()
+        if not ip:
+            return
+
+        with self._records_lock:
+            self._removed_records.discard(hostname)
+            self._added_records[hostname] = ip
+
+        self.mark_dirty()
 
     def action_delete_host(self, hardware_profile_name,
                            software_profile_name, nodes, *args, **kwargs):
@@ -344,6 +642,11 @@ class ComponentInstaller(ComponentInstallerBase):
 
         :returns: None
         """
-        self.action_configure(None)
-        self.provider.write()
-        self.provider.restart_service()
+        with self._records_lock:
+            for node in nodes:
+                name = node if isinstance(node, str) else node.name
+
+                self._added_records.pop(name, None)
+                self._removed_records.add(name)
+
+        self.mark_dirty()
@@ -18,6 +18,7 @@ import os
 import tempfile
 
 from .actions.get_puppet_args import GetPuppetArgsAction
+from tortuga.kit.actions.configRegenerator import configRegenerator
 from tortuga.kit.installer import ComponentInstallerBase
 from tortuga.os_utility import tortugaSubprocess
 
@@ -34,6 +35,10 @@ class ComponentInstaller(ComponentInstallerBase):
 
     installer_only = True
 
+    # Site hooks run once the other base components are configured
+    parallel_safe = True
+    run_after = ['dhcpd', 'dns', 'pdsh', 'ssh']
+
     def run_script(self, action, software_profiles, nodes=None):
         script_path = self._get_host_action_hook_script()
 
@@ -109,6 +114,9 @@ class ComponentInstaller(ComponentInstallerBase):
 
     def action_add_host(self, hardware_profile_name, software_profile_name,
                         nodes, *args, **kwargs):
+        # Nodes being added are configured before calling site hooks
+        configRegenerator.flush()
+
         node_name_list = [n.getName() for n in nodes]
         self.run_script(
             'add', software_profiles=[software_profile_name],
@@ -29,6 +29,8 @@ class ComponentInstaller(ComponentInstallerBase):
         {'family': 'rhel', 'version': '7', 'arch': 'x86_64'},
     ]
 
+    parallel_safe = True
+
     def configure(self):
         #
         # Write config file
@@ -88,16 +90,19 @@ class ComponentInstaller(ComponentInstallerBase):
             dbm.closeSession()
             fp.close()
 
+    def regenerate(self):
+        self.configure()
+
     def action_add_host(self, hardware_profile_name, software_profile_name,
                         nodes, *args, **kwargs):
-        self.configure()
+        self.mark_dirty()
 
     def action_configure(self, software_profile_name, *args, **kwargs):
         self.configure()
 
     def action_delete_host(self, hardware_profile_name, software_profile_name,
                            nodes, *args, **kwargs):
-        self.configure()
+        self.mark_dirty()
 
     def action_post_install(self, *args, **kwargs):
         self.configure()
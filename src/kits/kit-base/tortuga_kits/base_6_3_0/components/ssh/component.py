@@ -35,6 +35,8 @@ class ComponentInstaller(ComponentInstallerBase):
         {'family': 'rhel', 'version': '6', 'arch': 'x86_64'},
     ]
 
+    parallel_safe = True
+
     def configure(self):
         fp = open(CONFIG_FILE, 'w')
         dbm = DbManager()
@@ -81,9 +83,12 @@ class ComponentInstaller(ComponentInstallerBase):
             fp.close()
             dbm.closeSession()
 
+    def regenerate(self):
+        self.configure()
+
     def action_add_host(self, hardware_profile_name, software_profile_name,
                         nodes, *args, **kwargs):
-        self.configure()
+        self.mark_dirty()
 
     def action_configure(self, software_profile_name, *args, **kwargs):
         self.configure()
@@ -117,7 +122,7 @@ class ComponentInstaller(ComponentInstallerBase):
                 tortugaSubprocess.executeCommand(
                     'ssh-keygen -R {} >/dev/null 2>&1 ||:'.format(nic.getIp()))
 
-        self.configure()
+        self.mark_dirty()
 
     def action_post_install(self, *args, **kwargs):
         self.configure()